@@ -0,0 +1,131 @@
+// Components that fetch their data as Arrow IPC straight from the backend
+// API instead of receiving it through the JSON-encoded Reflex state.
+import { createElement as h, useEffect, useState } from "react";
+import { tableFromIPC } from "apache-arrow";
+import { Bar, BarChart, Line, LineChart, ResponsiveContainer, Tooltip, XAxis, YAxis } from "recharts";
+import env from "$/env.json";
+import { getBackendURL } from "$/utils/state";
+
+export function apiURL(path) {
+  // Relative to the backend, which may be served from another origin.
+  return new URL(path, getBackendURL(env.UPLOAD)).toString();
+}
+
+function useArrowTable(src) {
+  const [table, setTable] = useState(null);
+  useEffect(() => {
+    if (!src) {
+      return;
+    }
+    let live = true;
+    fetch(apiURL(src))
+      .then((res) => (res.ok ? res.arrayBuffer() : Promise.reject(res.statusText)))
+      .then((buf) => live && setTable(tableFromIPC(new Uint8Array(buf))))
+      .catch(() => live && setTable(null));
+    return () => {
+      live = false;
+    };
+  }, [src]);
+  return table;
+}
+
+function points(table) {
+  if (!table) {
+    return [];
+  }
+  const x = table.getChild("x");
+  // Float64 columns map onto a typed array over the received buffer.
+  const y = table.getChild("y").toArray();
+  return Array.from({ length: table.numRows }, (_, i) => ({ x: x.get(i), y: y[i] }));
+}
+
+export function ArrowChart({ src, kind, color, height = 220 }) {
+  const data = points(useArrowTable(src));
+  const chart =
+    kind === "line"
+      ? h(LineChart, { data }, h(Line, { dataKey: "y", stroke: color, dot: false }), h(XAxis, { dataKey: "x" }), h(YAxis), h(Tooltip))
+      : h(BarChart, { data }, h(Bar, { dataKey: "y", fill: color, radius: 4 }), h(XAxis, { dataKey: "x" }), h(YAxis), h(Tooltip));
+  return h(ResponsiveContainer, { width: "100%", height }, chart);
+}
+
+function cell(value) {
+  return value === null || value === undefined ? "" : String(value);
+}
+
+export function ArrowTable({ src }) {
+  const table = useArrowTable(src);
+  if (!table) {
+    return null;
+  }
+  const columns = table.schema.fields.map((field) => field.name);
+  const vectors = columns.map((name) => table.getChild(name));
+  const rows = Array.from({ length: table.numRows }, (_, i) =>
+    h("tr", { key: i }, vectors.map((vector, j) => h("td", { key: j }, cell(vector.get(i)))))
+  );
+  return h(
+    "div",
+    { className: "arrow-table" },
+    h("table", null, h("thead", null, h("tr", null, columns.map((name) => h("th", { key: name }, name)))), h("tbody", null, rows))
+  );
+}
+
+// Chart colours by kind, as in databoard/components/charts.py.
+const COLORS = { line: "#3B82F6", histogram: "#8B5CF6" };
+
+function Insight({ insight }) {
+  return h("li", null, h("strong", null, insight.title), h("span", null, insight.detail));
+}
+
+export function ArrowDashboard({ src }) {
+  // The spec is a small immutable JSON file; only chart points are Arrow.
+  const [spec, setSpec] = useState(null);
+  const [missing, setMissing] = useState(false);
+  useEffect(() => {
+    if (!src) {
+      return;
+    }
+    let live = true;
+    fetch(apiURL(src))
+      .then((res) => (res.ok ? res.json() : Promise.reject(res.statusText)))
+      .then((data) => live && setSpec(data))
+      .catch(() => live && setMissing(true));
+    return () => {
+      live = false;
+    };
+  }, [src]);
+  if (missing) {
+    return h("p", { className: "dashboard-missing" }, "This dashboard does not exist.");
+  }
+  if (!spec) {
+    return null;
+  }
+  const meta = `${spec.rows.toLocaleString()} rows · ${spec.columns} columns · created ${spec.created.slice(0, 10)}`;
+  return h(
+    "div",
+    { className: "dashboard" },
+    h("h1", { className: "gradient-text" }, spec.title),
+    h("p", { className: "dashboard-meta" }, meta),
+    spec.insights.length > 0 &&
+      h("ul", { className: "dashboard-insights card-sm" }, spec.insights.map((insight, i) => h(Insight, { key: i, insight }))),
+    h(
+      "div",
+      { className: "dashboard-grid" },
+      spec.charts.map((chart, i) =>
+        h(
+          "div",
+          { key: i, className: "card-sm dashboard-chart" },
+          h("h3", null, chart.title),
+          h(ArrowChart, { src: chart.src, kind: chart.kind, color: COLORS[chart.kind] || "#22c55e" })
+        )
+      )
+    )
+  );
+}
+
+export function ApiLink({ href, children, ...props }) {
+  return h("a", { ...props, href: apiURL(href) }, children);
+}
+
+export function ApiImage({ src, ...props }) {
+  return h("img", { ...props, src: apiURL(src) });
+}
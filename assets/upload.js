@@ -0,0 +1,176 @@
+// Resumable uploads: the file goes to the backend API in checksummed
+// chunks, several at a time, and an interrupted upload of the same file
+// picks up with the chunks the server does not have yet.
+import { createElement as h, useRef, useState } from "react";
+import { getToken } from "$/utils/state";
+import { apiURL } from "./arrow.js";
+
+const PARALLEL = 4;
+const RETRIES = 6;
+// Statuses of a server that may answer once it recovers. Anything else,
+// such as 507 for a full quota, is the server's final word.
+const TRANSIENT = new Set([500, 502, 503, 504]);
+
+let crcTable = null;
+
+function crc32(bytes) {
+  if (!crcTable) {
+    crcTable = new Uint32Array(256);
+    for (let n = 0; n < 256; n++) {
+      let c = n;
+      for (let k = 0; k < 8; k++) {
+        c = c & 1 ? 0xedb88320 ^ (c >>> 1) : c >>> 1;
+      }
+      crcTable[n] = c;
+    }
+  }
+  let crc = 0xffffffff;
+  for (let i = 0; i < bytes.length; i++) {
+    crc = crcTable[(crc ^ bytes[i]) & 0xff] ^ (crc >>> 8);
+  }
+  return ((crc ^ 0xffffffff) >>> 0).toString(16).padStart(8, "0");
+}
+
+function sleep(ms) {
+  return new Promise((resolve) => setTimeout(resolve, ms));
+}
+
+class UploadFailed extends Error {}
+
+async function request(path, options = {}) {
+  // Network errors and transient server errors are retried with backoff;
+  // a request the server refuses is not.
+  for (let attempt = 0; ; attempt++) {
+    let res = null;
+    try {
+      res = await fetch(apiURL(path), options);
+    } catch (e) {
+      if (attempt >= RETRIES) {
+        throw new UploadFailed("The connection dropped; choose the file again to resume the upload");
+      }
+    }
+    if (res && res.ok) {
+      return res.json();
+    }
+    if (res && !TRANSIENT.has(res.status)) {
+      const body = await res.json().catch(() => ({}));
+      throw new UploadFailed(body.detail || res.statusText);
+    }
+    if (res && attempt >= RETRIES) {
+      throw new UploadFailed("The server did not accept the upload; choose the file again to resume it");
+    }
+    await sleep(Math.min(500 * 2 ** attempt, 8000));
+  }
+}
+
+async function openUpload(file) {
+  // Remember the upload by file, so picking the same file resumes it.
+  const key = `databoard-upload:${file.name}:${file.size}:${file.lastModified}`;
+  const saved = localStorage.getItem(key);
+  if (saved) {
+    const upload = await request(`/api/uploads/${saved}`).catch(() => null);
+    if (upload) {
+      return { key, upload };
+    }
+  }
+  const upload = await request("/api/uploads", {
+    method: "POST",
+    headers: { "Content-Type": "application/json", "Reflex-Client-Token": getToken() },
+    body: JSON.stringify({ name: file.name, size: file.size }),
+  });
+  localStorage.setItem(key, upload.id);
+  return { key, upload };
+}
+
+async function sendFile(file, onProgress) {
+  const { key, upload } = await openUpload(file);
+  const size = upload.chunk_size;
+  const received = new Set(upload.received);
+  const pending = [];
+  for (let i = 0; i < upload.chunks && !upload.complete; i++) {
+    if (!received.has(i)) {
+      pending.push(i);
+    }
+  }
+  let sent = file.size - pending.reduce((total, i) => total + Math.min(size, file.size - i * size), 0);
+  onProgress(sent);
+
+  async function worker() {
+    while (pending.length > 0) {
+      const index = pending.shift();
+      const data = new Uint8Array(await file.slice(index * size, (index + 1) * size).arrayBuffer());
+      await request(`/api/uploads/${upload.id}/chunks/${index}`, {
+        method: "PUT",
+        headers: { "Content-Type": "application/octet-stream", "X-Chunk-CRC32": crc32(data) },
+        body: data,
+      });
+      sent += data.length;
+      onProgress(sent);
+    }
+  }
+  if (!upload.complete) {
+    await Promise.all(Array.from({ length: PARALLEL }, worker));
+    await request(`/api/uploads/${upload.id}/complete`, { method: "POST" });
+  }
+  localStorage.removeItem(key);
+  return upload.id;
+}
+
+export function ChunkedUpload({ onUpload, onError, label = "Process Upload", children }) {
+  const [file, setFile] = useState(null);
+  const [sent, setSent] = useState(null);
+  const [dragging, setDragging] = useState(false);
+  const input = useRef(null);
+
+  function start() {
+    setSent(0);
+    sendFile(file, setSent)
+      .then((id) => onUpload && onUpload(id))
+      .catch((e) => onError && onError(e instanceof UploadFailed ? e.message : String(e)))
+      .finally(() => setSent(null));
+  }
+
+  function drop(e) {
+    e.preventDefault();
+    setDragging(false);
+    if (e.dataTransfer.files.length > 0) {
+      setFile(e.dataTransfer.files[0]);
+    }
+  }
+
+  if (sent !== null) {
+    const percent = file.size ? Math.floor((sent * 100) / file.size) : 100;
+    return h(
+      "div",
+      { className: "chunked-upload" },
+      h("p", { className: "chunked-status" }, `Uploading ${file.name}... ${percent}%`),
+      h("div", { className: "chunked-progress" }, h("div", { style: { width: `${percent}%` } }))
+    );
+  }
+  return h(
+    "div",
+    { className: "chunked-upload" },
+    h(
+      "div",
+      {
+        className: dragging ? "dropzone chunked-dropzone dragging" : "dropzone chunked-dropzone",
+        onClick: () => input.current && input.current.click(),
+        onDragOver: (e) => {
+          e.preventDefault();
+          setDragging(true);
+        },
+        onDragLeave: () => setDragging(false),
+        onDrop: drop,
+      },
+      h("input", {
+        ref: input,
+        type: "file",
+        hidden: true,
+        onChange: (e) => e.target.files.length > 0 && setFile(e.target.files[0]),
+      }),
+      children,
+      file && h("p", { className: "chunked-file" }, file.name)
+    ),
+    h("button", { className: "btn-gradient chunked-button", disabled: !file, onClick: start }, label)
+  );
+}
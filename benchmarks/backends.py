@@ -0,0 +1,122 @@
+"""Dashboard build time on each compute backend.
+
+Ingests a CSV file (or a generated one) into a scratch upload directory,
+then builds its dashboard on every backend in turn and reports the median
+time of each. The chart data of every backend is checked against the
+first one, so a faster engine that computes different numbers fails:
+
+    python benchmarks/backends.py --rows 1000000
+    python benchmarks/backends.py --csv sales.csv --runs 5
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# Tolerance on chart values between backends, relative to the larger value.
+TOLERANCE = 1e-6
+
+
+def generate(path: Path, rows: int, seed: int = 0):
+    """Write a sales-like CSV with dates, categories and skewed measures."""
+    import numpy as np
+    import polars as pl
+
+    rng = np.random.default_rng(seed)
+    days = rng.integers(0, 3 * 365, rows)
+    pl.DataFrame({
+        "date": pl.Series(np.datetime64("2022-01-01") + days.astype("timedelta64[D]")),
+        "region": rng.choice(["North", "South", "East", "West"], rows),
+        "product": rng.choice([f"P{i:02d}" for i in range(30)], rows),
+        "units": rng.poisson(5, rows),
+        "revenue": rng.lognormal(4, 1, rows).round(2),
+    }).write_csv(path)
+
+
+def chart_values(dataset_id: str, count: int) -> list:
+    """The stored points of each chart as row lists; None if served from a rollup."""
+    import polars as pl
+
+    from databoard.data.store import chart_path
+
+    charts = []
+    for i in range(count):
+        path = chart_path(dataset_id, i)
+        charts.append(pl.read_ipc(path, memory_map=False).rows() if path.is_file() else None)
+    return charts
+
+
+def _same(a: list | None, b: list | None) -> bool:
+    if a is None or b is None:
+        return a is b
+    if len(a) != len(b):
+        return False
+    for row_a, row_b in zip(a, b):
+        for x, y in zip(row_a, row_b):
+            if isinstance(x, float) and isinstance(y, float):
+                if abs(x - y) > TOLERANCE * max(abs(x), abs(y), 1.0):
+                    return False
+            elif x != y:
+                return False
+    return True
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--csv", type=Path, help="file to ingest instead of generated data")
+    parser.add_argument("--rows", type=int, default=500_000, help="rows of generated data")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--sample-rows", type=int, help="build approximate dashboards from a sample")
+    args = parser.parse_args()
+
+    scratch = tempfile.TemporaryDirectory()
+    os.environ["REFLEX_UPLOADED_FILES_DIR"] = scratch.name
+
+    from databoard.analysis.backend import BACKENDS, get_backend
+    from databoard.analysis.dashboard import build_dashboard
+    from databoard.data.ingest import ingest_upload
+
+    path = args.csv
+    if path is None:
+        path = Path(scratch.name) / "generated.csv"
+        generate(path, args.rows)
+    start = time.perf_counter()
+    dataset_id, profile = ingest_upload(path)
+    print(f"ingested {profile.rows:,} rows in {time.perf_counter() - start:.2f}s")
+
+    medians = {}
+    results = {}
+    for name in BACKENDS:
+        backend = get_backend(name)
+        times = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            dashboard = build_dashboard(dataset_id, args.sample_rows, backend=backend)
+            times.append(time.perf_counter() - start)
+        medians[name] = statistics.median(times)
+        results[name] = chart_values(dataset_id, len(dashboard.charts))
+
+    baseline = next(iter(medians))
+    for name, value in medians.items():
+        print(f"{name:>8}: {value * 1000:8.1f} ms  {medians[baseline] / value:5.2f}x")
+
+    failures = []
+    for name, charts in results.items():
+        for i, (a, b) in enumerate(zip(results[baseline], charts)):
+            if not _same(a, b):
+                failures.append(f"chart {i} differs between {baseline} and {name}")
+    for failure in failures:
+        print(f"FAIL {failure}")
+    scratch.cleanup()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""Size of the JavaScript compiled for each page.
+
+Compiles every page of the app to its React module, the way ``reflex
+export`` does before bundling, and reports raw and gzipped sizes along
+with the size of the global stylesheets. Save a report and compare a
+later run against it to see what a change did to the page bundles:
+
+    python benchmarks/bundle_size.py --save before.json
+    python benchmarks/bundle_size.py --compare before.json
+"""
+
+import argparse
+import gzip
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def measure() -> dict[str, dict[str, int]]:
+    """Raw and gzipped byte counts of every compiled page and stylesheet."""
+    from reflex.compiler.compiler import _compile_page, compile_unevaluated_page
+
+    from databoard.databoard import app
+
+    app._apply_decorated_pages()
+    sizes = {}
+    for route, page in sorted(app._unevaluated_pages.items()):
+        component = compile_unevaluated_page(route, page, app.style, app.theme)
+        code = _compile_page(component).encode()
+        sizes[f"/{route}"] = {"raw": len(code), "gzip": len(gzip.compress(code))}
+    for sheet in app.stylesheets:
+        path = ROOT / "assets" / sheet.lstrip("/")
+        if path.is_file():
+            data = path.read_bytes()
+            sizes[sheet] = {"raw": len(data), "gzip": len(gzip.compress(data))}
+    return sizes
+
+
+def _kb(n: int) -> str:
+    return f"{n / 1024:8.1f} KB"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--save", type=Path, help="write the report to this JSON file")
+    parser.add_argument("--compare", type=Path, help="show the change against a saved report")
+    args = parser.parse_args()
+
+    sizes = measure()
+    before = json.loads(args.compare.read_text()) if args.compare else {}
+    total = {"raw": 0, "gzip": 0}
+    total_before = {"raw": 0, "gzip": 0}
+    for name in sorted(sizes.keys() | before.keys()):
+        now = sizes.get(name, {"raw": 0, "gzip": 0})
+        line = f"{name:<20} {_kb(now['raw'])} {_kb(now['gzip'])} gz"
+        if name in before or args.compare:
+            old = before.get(name, {"raw": 0, "gzip": 0})
+            line += f"   was {_kb(old['raw'])} {_kb(old['gzip'])} gz"
+            for key in total_before:
+                total_before[key] += old[key]
+        for key in total:
+            total[key] += now[key]
+        print(line)
+    line = f"{'total':<20} {_kb(total['raw'])} {_kb(total['gzip'])} gz"
+    if args.compare:
+        line += f"   was {_kb(total_before['raw'])} {_kb(total_before['gzip'])} gz"
+    print(line)
+
+    if args.save:
+        args.save.write_text(json.dumps(sizes, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,369 @@
+"""Load test of concurrent /trial sessions and landing-page visitors.
+
+Opens simulated Reflex clients against a running backend: each trial
+session uploads a generated CSV through the resumable upload API, as the
+browser does, and generates its dashboard, over and over, while landing-page visitors click through
+the gallery and header. Reports throughput, latency percentiles and
+error rates per event, and the server's memory over time:
+
+    reflex run --env prod --backend-only --backend-port 8000 &
+    python benchmarks/loadtest.py --sessions 8 --visitors 40 --duration 60 --pid $!
+
+Clients talk Socket.IO over a plain websocket, as the browser does, so
+nothing beyond the backend itself is needed.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import random
+import sys
+import time
+import uuid
+import zlib
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+import websockets
+
+try:
+    import psutil
+except ImportError:  # read /proc instead; Linux only
+    psutil = None
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+NAMESPACE = "/_event"
+# Seconds a flow step may take before it counts as an error.
+STEP_TIMEOUT = 300.0
+RSS_INTERVAL = 1.0
+# Chunks of one upload in flight at once, as in assets/upload.js.
+UPLOAD_PARALLEL = 4
+# Failed uploads, with none succeeding, after which the run is abandoned.
+MAX_FAILED_UPLOADS = 3
+
+
+class UploadsFailing(Exception):
+    """Raised when uploads keep failing, so nothing past them is measured."""
+
+
+def state_names() -> dict[str, str]:
+    """Full Reflex names of the states the simulated clients drive."""
+    import reflex as rx
+
+    from databoard.components.gallery import GalleryState
+    from databoard.components.header import HeaderState
+    from databoard.pages.trial import TrialState
+
+    return {
+        "root": rx.State.get_full_name(),
+        "trial": TrialState.get_full_name(),
+        "gallery": GalleryState.get_full_name(),
+        "header": HeaderState.get_full_name(),
+    }
+
+
+def synthetic_csv(rows: int, seed: int) -> bytes:
+    """A sales-like CSV with dates, categories and measures."""
+    import numpy as np
+    import polars as pl
+
+    rng = np.random.default_rng(seed)
+    days = rng.integers(0, 2 * 365, rows)
+    buf = io.BytesIO()
+    pl.DataFrame({
+        "date": pl.Series(np.datetime64("2023-01-01") + days.astype("timedelta64[D]")),
+        "region": rng.choice(["North", "South", "East", "West"], rows),
+        "product": rng.choice([f"P{i:02d}" for i in range(20)], rows),
+        "units": rng.poisson(5, rows),
+        "revenue": rng.lognormal(4, 1, rows).round(2),
+    }).write_csv(buf)
+    return buf.getvalue()
+
+
+class Stats:
+    """Latencies and errors per event name."""
+
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.aborted = False
+
+    def record(self, name: str, seconds: float):
+        self.latencies[name].append(seconds)
+
+    def fail(self, name: str):
+        self.errors[name] += 1
+
+    def report(self, elapsed: float):
+        names = sorted(self.latencies.keys() | self.errors.keys())
+        print(f"{'event':<28} {'count':>6} {'err%':>6} {'rate/s':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        for name in names:
+            values = sorted(self.latencies[name])
+            count = len(values) + self.errors[name]
+            line = f"{name:<28} {count:>6} {100 * self.errors[name] / count:>5.1f}% {len(values) / elapsed:>7.2f}"
+            if values:
+                line += "".join(f" {_percentile(values, q) * 1000:>9.1f}" for q in (50, 95, 99))
+            print(line)
+
+
+def _percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    return values[min(len(values) - 1, max(0, round(q / 100 * len(values)) - 1))]
+
+
+class ReflexClient:
+    """A browser tab: one websocket to the event namespace and its state.
+
+    Deltas from the server are merged into ``values`` by variable name, and
+    events the server asks the frontend to run are sent back, as the
+    browser would do.
+    """
+
+    def __init__(self, http_url: str, names: dict[str, str]):
+        self.http_url = http_url
+        self.names = names
+        self.token = str(uuid.uuid4())
+        self.values: dict[str, object] = {}
+        self.pathname = "/"
+        self.changed = asyncio.Condition()
+        self.finals = 0
+        self.ws = None
+        self.reader = None
+
+    async def connect(self, pathname: str):
+        self.pathname = pathname
+        url = self.http_url.replace("http", "ws", 1)
+        self.ws = await websockets.connect(f"{url}/_event/?EIO=4&transport=websocket&token={self.token}", max_size=None)
+        await self.ws.recv()  # Engine.IO open packet
+        await self.ws.send(f"40{NAMESPACE},")
+        await self.ws.recv()  # namespace connected
+        self.reader = asyncio.create_task(self._read())
+        await self.call("hydrate", f"{self.names['root']}.hydrate")
+
+    async def close(self):
+        if self.reader is not None:
+            self.reader.cancel()
+        if self.ws is not None:
+            await self.ws.close()
+
+    async def _read(self):
+        prefix = f"42{NAMESPACE},"
+        async for message in self.ws:
+            if message == "2":
+                await self.ws.send("3")
+            elif message.startswith(prefix):
+                name, data = json.loads(message[len(prefix):])
+                if name == "event":
+                    await self.apply(data)
+
+    async def apply(self, update: dict):
+        async with self.changed:
+            for delta in update.get("delta", {}).values():
+                for key, value in delta.items():
+                    self.values[key.removesuffix("_rx_state_")] = value
+            if update.get("final", True):
+                self.finals += 1
+            self.changed.notify_all()
+        for event in update.get("events", []):
+            # Names starting with an underscore are handled in the browser.
+            if not event["name"].startswith("_"):
+                await self.emit(event["name"], event.get("payload", {}))
+
+    async def emit(self, name: str, payload: dict | None = None):
+        event = {
+            "token": self.token,
+            "name": name,
+            "router_data": {"pathname": self.pathname, "query": {}, "asPath": self.pathname},
+            "payload": payload or {},
+        }
+        await self.ws.send(f"42{NAMESPACE}," + json.dumps(["event", event]))
+
+    async def wait_for(self, predicate, timeout: float = STEP_TIMEOUT):
+        async with self.changed:
+            await asyncio.wait_for(self.changed.wait_for(lambda: predicate(self.values)), timeout)
+
+    async def call(self, label: str, name: str, payload: dict | None = None, stats: Stats | None = None):
+        """Send an event and wait for its final update.
+
+        Events of one client are processed in order, so the next final
+        update after sending belongs to this event.
+        """
+        start = time.perf_counter()
+        async with self.changed:
+            finals = self.finals
+        await self.emit(name, payload)
+        async with self.changed:
+            await asyncio.wait_for(self.changed.wait_for(lambda: self.finals > finals), STEP_TIMEOUT)
+        if stats is not None:
+            stats.record(label, time.perf_counter() - start)
+
+    async def upload(self, name: str, data: bytes) -> str:
+        """Send a file through ``/api/uploads`` in checksummed chunks; returns the upload ID."""
+        async with httpx.AsyncClient(base_url=self.http_url, timeout=STEP_TIMEOUT) as http:
+            response = await http.post("/api/uploads", json={"name": name, "size": len(data)}, headers={"Reflex-Client-Token": self.token})
+            response.raise_for_status()
+            upload = response.json()
+            size = upload["chunk_size"]
+            pending = list(range(upload["chunks"]))
+
+            async def worker():
+                while pending:
+                    index = pending.pop()
+                    chunk = data[index * size:(index + 1) * size]
+                    headers = {"X-Chunk-CRC32": f"{zlib.crc32(chunk):08x}"}
+                    (await http.put(f"/api/uploads/{upload['id']}/chunks/{index}", content=chunk, headers=headers)).raise_for_status()
+
+            await asyncio.gather(*(worker() for _ in range(UPLOAD_PARALLEL)))
+            (await http.post(f"/api/uploads/{upload['id']}/complete")).raise_for_status()
+        return upload["id"]
+
+
+async def _timed(stats: Stats, label: str, step):
+    start = time.perf_counter()
+    try:
+        result = await step
+    except Exception:
+        stats.fail(label)
+        raise
+    stats.record(label, time.perf_counter() - start)
+    return result
+
+
+async def trial_session(http_url: str, names: dict[str, str], data: bytes, deadline: float, stats: Stats):
+    """Upload, analyse and generate dashboards until the deadline."""
+    trial = names["trial"]
+    client = ReflexClient(http_url, names)
+    try:
+        await _timed(stats, "connect /trial", client.connect("/trial"))
+        while time.monotonic() < deadline:
+            try:
+                try:
+                    upload_id = await _timed(stats, "upload", client.upload("loadtest.csv", data))
+                except httpx.HTTPError as e:
+                    if not stats.latencies["upload"] and stats.errors["upload"] >= MAX_FAILED_UPLOADS:
+                        raise UploadsFailing(f"every upload failed, the last with {e!r}") from e
+                    raise
+                await client.emit(f"{trial}.finish_chunked_upload", {"upload_id": upload_id})
+                await _timed(stats, "process_upload", client.wait_for(lambda v: v.get("file_analyzed") or v.get("upload_error")))
+                if client.values.get("upload_error"):
+                    stats.fail("process_upload")
+                    continue
+                # Both dashboard steps are timed from the click: the first
+                # (sampled) view, then the exact dashboard being published.
+                start = time.perf_counter()
+                await client.emit(f"{trial}.generate_dashboard")
+                await _timed(stats, "dashboard (first view)", client.wait_for(lambda v: v.get("dashboard_generated")))
+                await _timed(stats, "dashboard (published)", client.wait_for(lambda v: v.get("dashboard_url")))
+                stats.latencies["dashboard (published)"][-1] = time.perf_counter() - start
+                await client.call("reset_trial", f"{trial}.reset_trial", stats=stats)
+            except (asyncio.TimeoutError, httpx.HTTPError, websockets.ConnectionClosed):
+                await client.call("reset_trial", f"{trial}.reset_trial", stats=stats)
+    finally:
+        await client.close()
+
+
+async def landing_visitor(http_url: str, names: dict[str, str], deadline: float, stats: Stats, seed: int):
+    """Click through the gallery and header with some think time."""
+    rng = random.Random(seed)
+    gallery, header = names["gallery"], names["header"]
+    actions = [
+        ("gallery.next_slide", f"{gallery}.next_slide", {}),
+        ("gallery.prev_slide", f"{gallery}.prev_slide", {}),
+        ("gallery.toggle_autoplay", f"{gallery}.toggle_autoplay", {}),
+        ("header.cycle_description", f"{header}.cycle_description", {}),
+    ]
+    client = ReflexClient(http_url, names)
+    try:
+        await _timed(stats, "connect /", client.connect("/"))
+        while time.monotonic() < deadline:
+            await asyncio.sleep(rng.uniform(0.5, 2.0))
+            if rng.random() < 0.2:
+                label, name, payload = "gallery.go_to_slide", f"{gallery}.go_to_slide", {"index": rng.randrange(5)}
+            else:
+                label, name, payload = rng.choice(actions)
+            try:
+                await client.call(label, name, payload, stats)
+            except asyncio.TimeoutError:
+                stats.fail(label)
+    finally:
+        await client.close()
+
+
+def rss(pid: int) -> int:
+    """Resident memory of a process in bytes."""
+    if psutil is not None:
+        return psutil.Process(pid).memory_info().rss
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+async def sample_rss(pid: int, samples: list[tuple[float, int]], start: float):
+    while True:
+        samples.append((time.monotonic() - start, rss(pid)))
+        await asyncio.sleep(RSS_INTERVAL)
+
+
+async def run(args) -> Stats:
+    names = state_names()
+    data = synthetic_csv(args.rows, seed=0)
+    stats = Stats()
+    start = time.monotonic()
+    deadline = start + args.duration
+    samples: list[tuple[float, int]] = []
+    sampler = asyncio.create_task(sample_rss(args.pid, samples, start)) if args.pid else None
+
+    tasks = [trial_session(args.backend, names, data, deadline, stats) for _ in range(args.sessions)]
+    tasks += [landing_visitor(args.backend, names, deadline, stats, seed) for seed in range(args.visitors)]
+    futures = [asyncio.ensure_future(task) for task in tasks]
+    pending = set(futures)
+    while pending and not stats.aborted:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        stats.aborted = any(isinstance(task.exception(), UploadsFailing) for task in done)
+    # Without uploads only reset_trial would be measured; stop everyone.
+    for task in pending:
+        task.cancel()
+    results = await asyncio.gather(*futures, return_exceptions=True)
+    elapsed = time.monotonic() - start
+    if sampler is not None:
+        sampler.cancel()
+
+    print(f"{args.sessions} trial sessions, {args.visitors} visitors, {len(data) / 1e6:.1f} MB uploads, {elapsed:.1f}s")
+    failed = [r for r in results if isinstance(r, Exception)]
+    for error in failed[:5]:
+        print(f"client failed: {error!r}")
+    if stats.aborted:
+        print("aborted: no upload succeeded, so there is nothing to report")
+        return stats
+    stats.report(elapsed)
+    if samples:
+        print("\nserver RSS (MB):")
+        step = max(1, len(samples) // 20)
+        for t, value in samples[::step]:
+            print(f"  {t:6.1f}s {value / 2**20:8.1f}")
+        peak = max(value for _, value in samples)
+        print(f"  peak {peak / 2**20:.1f} MB, final {samples[-1][1] / 2**20:.1f} MB")
+    return stats
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", default="http://localhost:8000", help="URL of the running backend")
+    parser.add_argument("--sessions", type=int, default=4, help="concurrent /trial sessions")
+    parser.add_argument("--visitors", type=int, default=20, help="concurrent landing-page visitors")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to keep starting new work")
+    parser.add_argument("--rows", type=int, default=50_000, help="rows of each uploaded file")
+    parser.add_argument("--pid", type=int, help="backend process to sample memory of")
+    args = parser.parse_args()
+    stats = asyncio.run(run(args))
+    return 1 if stats.aborted or any(stats.errors.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""Cold-start benchmark for the backend.
+
+Measures, in fresh interpreters, how long it takes to import Reflex, to
+import the app's pages and API, and to build the ``rx.App`` in
+``databoard/databoard.py``. Exits non-zero when the median of any phase
+exceeds its budget or when a library that should load lazily is imported
+at startup.
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --runs 10 --app-budget 3.0
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Libraries the data pipeline loads on first use; none may be imported at startup.
+LAZY_MODULES = ("polars",)
+# Reported for information; Reflex itself imports some of these.
+HEAVY_MODULES = ("polars", "numpy", "pandas", "PIL", "fastapi", "requests")
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import reflex
+t1 = time.perf_counter()
+import databoard.api, databoard.pages.index, databoard.pages.trial
+t2 = time.perf_counter()
+import databoard.databoard
+t3 = time.perf_counter()
+print(json.dumps({
+    "reflex": t1 - t0,
+    "pages": t2 - t1,
+    "app": t3 - t2,
+    "total": t3 - t0,
+    "modules": [m for m in %r if m in sys.modules],
+}))
+"""
+
+
+def measure() -> dict:
+    """Time one cold start in a fresh interpreter."""
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE % (HEAVY_MODULES,)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--pages-budget", type=float, default=2.5, help="seconds to import pages and API")
+    parser.add_argument("--app-budget", type=float, default=0.5, help="seconds to build rx.App")
+    parser.add_argument("--total-budget", type=float, default=4.0, help="seconds for the whole cold start")
+    args = parser.parse_args()
+
+    runs = [measure() for _ in range(args.runs)]
+    medians = {phase: statistics.median(run[phase] for run in runs) for phase in ("reflex", "pages", "app", "total")}
+    loaded = runs[0]["modules"]
+
+    for phase, value in medians.items():
+        print(f"{phase:>8}: {value * 1000:8.1f} ms")
+    print(f"  loaded: {', '.join(loaded) or '-'}")
+
+    failures = []
+    for phase, budget in (("pages", args.pages_budget), ("app", args.app_budget), ("total", args.total_budget)):
+        if medians[phase] > budget:
+            failures.append(f"{phase} took {medians[phase]:.2f}s, budget {budget:.2f}s")
+    for module in LAZY_MODULES:
+        if module in loaded:
+            failures.append(f"{module} is imported at startup")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,333 @@
+from __future__ import annotations
+
+import os
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+from ..data.cancel import CancelToken, check, collect
+from ..lazy import lazy_import
+from .timeseries import RESOLUTIONS
+
+if TYPE_CHECKING:
+    from .charts import ChartSpec
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+pl = lazy_import("polars")
+
+# Environment variable naming the compute backend of a run.
+BACKEND_ENV = "DATABOARD_BACKEND"
+DEFAULT_BACKEND = "polars"
+
+# Robust statistics of a measure: median, median absolute deviation, Q1, Q3.
+RobustStats = tuple[float | None, float | None, float | None, float | None]
+# Outlier fences of a measure: lower, upper, and the median examples are ranked by.
+Fences = tuple[float, float, float]
+
+
+class Backend(ABC):
+    """Engine running the aggregations behind dashboards and insights.
+
+    Inputs are Polars lazy frames over a stored dataset or a sample of it,
+    since Polars reads the Parquet store. Results are small Polars frames
+    or plain values, so analysis code does not depend on the engine that
+    computed them.
+    """
+
+    name = ""
+
+    @abstractmethod
+    def chart_data(
+        self,
+        lf: pl.LazyFrame,
+        specs: list[ChartSpec],
+        weight: str | None = None,
+        cancel: CancelToken | None = None,
+    ) -> list[pl.DataFrame]:
+        """The ``x``/``y`` points of each chart, in the order of ``specs``.
+
+        Line charts are sorted by date, bar charts by value descending and
+        histograms by bin. With ``weight`` set, counts and sums are scaled
+        by that column.
+        """
+
+    @abstractmethod
+    def variance_explained(
+        self,
+        lf: pl.LazyFrame,
+        categories: list[str],
+        measures: list[str],
+        cancel: CancelToken | None = None,
+    ) -> dict[tuple[str, str], float]:
+        """Share of each measure's variance explained by each category (eta squared)."""
+
+    @abstractmethod
+    def trend_slopes(
+        self,
+        lf: pl.LazyFrame,
+        time_column: str,
+        measures: list[str],
+        cancel: CancelToken | None = None,
+    ) -> dict[str, float]:
+        """Least-squares slope of each measure per day over the time column."""
+
+    @abstractmethod
+    def robust_stats(self, lf: pl.LazyFrame, measures: list[str], cancel: CancelToken | None = None) -> dict[str, RobustStats]:
+        """Median, median absolute deviation and quartiles of each measure."""
+
+    @abstractmethod
+    def flag_outliers(
+        self,
+        lf: pl.LazyFrame,
+        fences: dict[str, Fences],
+        k: int,
+        cancel: CancelToken | None = None,
+    ) -> tuple[int, dict[str, tuple[int, list[float]]]]:
+        """Count values outside each measure's fences.
+
+        Returns the row count and, per measure, the number of flagged values
+        with the ``k`` furthest from the median.
+        """
+
+    @abstractmethod
+    def daily_totals(
+        self,
+        lf: pl.LazyFrame,
+        time_column: str,
+        measures: list[str],
+        cancel: CancelToken | None = None,
+    ) -> pl.DataFrame:
+        """Per-day sums of each measure, as a ``__day`` column sorted by day."""
+
+
+class PolarsBackend(Backend):
+    """Lazy Polars queries, run on the streaming engine where they can be."""
+
+    name = "polars"
+
+    @staticmethod
+    def _value(spec: ChartSpec, weight: str | None) -> pl.Expr:
+        if spec.agg == "count":
+            value = pl.col(weight).sum() if weight else pl.len()
+        else:
+            value = (pl.col(spec.y) * pl.col(weight)).sum() if weight else pl.col(spec.y).sum()
+        return value.alias("y")
+
+    def _chart_query(self, lf: pl.LazyFrame, spec: ChartSpec, weight: str | None) -> pl.LazyFrame:
+        if spec.kind == "line":
+            key = pl.col(spec.x).cast(pl.Date).dt.truncate(RESOLUTIONS[spec.every]).alias("x")
+            return lf.filter(pl.col(spec.x).is_not_null()).group_by(key).agg(self._value(spec, weight)).sort("x")
+        if spec.kind == "bar":
+            return lf.group_by(pl.col(spec.x).alias("x")).agg(self._value(spec, weight)).sort("y", descending=True)
+        width = (spec.high - spec.low) / spec.bins
+        bucket = ((pl.col(spec.x) - spec.low) / width).floor().clip(0, spec.bins - 1).cast(pl.Int32)
+        counts = lf.filter(pl.col(spec.x).is_not_null()).group_by(bucket.alias("bin")).agg(self._value(spec, weight))
+        # Every bin gets a bar, empty ones included, so gaps in the data show.
+        bins = pl.LazyFrame({"bin": pl.int_range(0, spec.bins, dtype=pl.Int32, eager=True)})
+        return bins.join(counts, on="bin", how="left").sort("bin").select(
+            (pl.col("bin") * width + spec.low).alias("x"), pl.col("y").fill_null(0)
+        )
+
+    def chart_data(self, lf, specs, weight=None, cancel=None):
+        # Collected together so Polars optimises the plans as one graph and
+        # scans the dataset once instead of once per chart.
+        check(cancel)
+        return pl.collect_all([self._chart_query(lf, spec, weight) for spec in specs], engine="streaming")
+
+    def variance_explained(self, lf, categories, measures, cancel=None):
+        # All group-bys and the overall totals are collected together so
+        # Polars can share the underlying scan.
+        check(cancel)
+        totals = lf.select(
+            pl.len().alias("__n"),
+            pl.col(measures).var(ddof=0).name.suffix("__var"),
+            pl.col(measures).mean().name.suffix("__mean"),
+        )
+        grouped = [
+            lf.group_by(category).agg([pl.len().alias("__n")] + [pl.col(m).mean() for m in measures])
+            for category in categories
+        ]
+        totals, *grouped = pl.collect_all([totals, *grouped], engine="streaming")
+        n = totals["__n"][0]
+        result = {}
+        for category, groups in zip(categories, grouped):
+            for m in measures:
+                total_ss = (totals[f"{m}__var"][0] or 0.0) * n
+                if not total_ss:
+                    continue
+                mean = totals[f"{m}__mean"][0]
+                between = groups.select((pl.col("__n") * (pl.col(m) - mean) ** 2).sum()).item()
+                result[(category, m)] = float(between or 0.0) / total_ss
+        return result
+
+    def trend_slopes(self, lf, time_column, measures, cancel=None):
+        t = pl.col(time_column).cast(pl.Date).cast(pl.Float64)
+        exprs = [(pl.cov(t, pl.col(m).cast(pl.Float64)) / t.var()).alias(m) for m in measures]
+        row = collect(lf.filter(pl.col(time_column).is_not_null()).select(exprs), cancel).row(0, named=True)
+        return {m: float(v) for m, v in row.items() if v is not None and np.isfinite(v)}
+
+    def robust_stats(self, lf, measures, cancel=None):
+        exprs = []
+        for m in measures:
+            col = pl.col(m).cast(pl.Float64)
+            exprs += [
+                col.median().alias(f"{m}:median"),
+                (col - col.median()).abs().median().alias(f"{m}:mad"),
+                col.quantile(0.25).alias(f"{m}:q1"),
+                col.quantile(0.75).alias(f"{m}:q3"),
+            ]
+        stats = collect(lf.select(exprs), cancel).row(0, named=True)
+        return {m: tuple(stats[f"{m}:{key}"] for key in ("median", "mad", "q1", "q3")) for m in measures}
+
+    def flag_outliers(self, lf, fences, k, cancel=None):
+        exprs = [pl.len().alias("__n")]
+        for m, (lower, upper, median) in fences.items():
+            col = pl.col(m).cast(pl.Float64)
+            flagged = (col < lower) | (col > upper)
+            exprs += [
+                flagged.sum().alias(f"{m}:count"),
+                col.filter(flagged).top_k_by((col.filter(flagged) - median).abs(), k).implode().alias(f"{m}:examples"),
+            ]
+        counts = collect(lf.select(exprs), cancel).row(0, named=True)
+        return counts["__n"], {m: (counts[f"{m}:count"] or 0, list(counts[f"{m}:examples"])) for m in fences}
+
+    def daily_totals(self, lf, time_column, measures, cancel=None):
+        daily = (
+            lf.filter(pl.col(time_column).is_not_null())
+            .group_by(pl.col(time_column).cast(pl.Date).alias("__day"))
+            .agg(pl.col(measures).cast(pl.Float64).sum())
+            .sort("__day")
+        )
+        return collect(daily, cancel)
+
+
+class PandasBackend(Backend):
+    """pandas implementation, for environments standardised on pandas.
+
+    The needed columns are read through Polars (the Parquet store does not
+    depend on pyarrow) and handed to pandas as NumPy arrays, then every
+    aggregation runs in pandas.
+    """
+
+    name = "pandas"
+
+    @staticmethod
+    def _frame(lf: pl.LazyFrame, columns: list[str], cancel: CancelToken | None) -> pd.DataFrame:
+        df = collect(lf.select(list(dict.fromkeys(columns))), cancel)
+        return pd.DataFrame({name: df[name].to_numpy() for name in df.columns})
+
+    @staticmethod
+    def _dates(values: pd.Series) -> pl.Series:
+        return pl.Series(values.to_numpy().astype("datetime64[D]"))
+
+    @staticmethod
+    def _period_start(dates: pd.Series, every: str) -> pd.Series:
+        """Truncate dates like ``dt.truncate``: weeks start on Monday."""
+        days = dates.dt.floor("D")
+        if every == "week":
+            return days - pd.to_timedelta(days.dt.weekday, unit="D")
+        if every in ("month", "quarter"):
+            return days.dt.to_period("M" if every == "month" else "Q").dt.start_time
+        return days
+
+    def _chart(self, frame: pd.DataFrame, spec: ChartSpec, weight: str | None) -> pl.DataFrame:
+        if spec.agg == "count":
+            values = frame[weight] if weight else pd.Series(1, index=frame.index)
+        else:
+            values = frame[spec.y].astype(float) * frame[weight] if weight else frame[spec.y]
+        if spec.kind == "line":
+            dates = pd.to_datetime(frame[spec.x])
+            keep = dates.notna()
+            sums = values[keep].groupby(self._period_start(dates[keep], spec.every)).sum().sort_index()
+            return pl.DataFrame({"x": self._dates(sums.index.to_series()), "y": sums.to_numpy()})
+        if spec.kind == "bar":
+            sums = values.groupby(frame[spec.x], dropna=False).sum().sort_values(ascending=False, kind="stable")
+            labels = [None if pd.isna(label) else label for label in sums.index]
+            return pl.DataFrame({"x": pl.Series(labels), "y": sums.to_numpy()})
+        width = (spec.high - spec.low) / spec.bins
+        x = frame[spec.x].astype(float)
+        keep = x.notna()
+        bucket = np.clip(np.floor((x[keep] - spec.low) / width), 0, spec.bins - 1).astype(int)
+        sums = values[keep].groupby(bucket.to_numpy()).sum().reindex(range(spec.bins), fill_value=0)
+        return pl.DataFrame({"x": sums.index.to_numpy() * width + spec.low, "y": sums.to_numpy()})
+
+    def chart_data(self, lf, specs, weight=None, cancel=None):
+        columns = [name for spec in specs for name in (spec.x, spec.y) if name]
+        frame = self._frame(lf, columns + ([weight] if weight else []), cancel)
+        frames = []
+        for spec in specs:
+            check(cancel)
+            frames.append(self._chart(frame, spec, weight))
+        return frames
+
+    def variance_explained(self, lf, categories, measures, cancel=None):
+        frame = self._frame(lf, categories + measures, cancel)
+        values = frame[measures].astype(float)
+        n = len(frame)
+        result = {}
+        for category in categories:
+            check(cancel)
+            groups = values.groupby(frame[category], dropna=False)
+            sizes, means = groups.size(), groups.mean()
+            for m in measures:
+                total_ss = values[m].var(ddof=0) * n
+                if not total_ss or np.isnan(total_ss):
+                    continue
+                between = (sizes * (means[m] - values[m].mean()) ** 2).sum()
+                result[(category, m)] = float(between) / total_ss
+        return result
+
+    def trend_slopes(self, lf, time_column, measures, cancel=None):
+        frame = self._frame(lf, [time_column] + measures, cancel)
+        dates = pd.to_datetime(frame[time_column])
+        keep = dates.notna()
+        t = pd.Series(dates[keep].to_numpy().astype("datetime64[D]").astype("int64"), dtype=float)
+        slopes = {}
+        for m in measures:
+            slope = t.cov(pd.Series(frame[m][keep].astype(float).to_numpy())) / t.var()
+            if np.isfinite(slope):
+                slopes[m] = float(slope)
+        return slopes
+
+    def robust_stats(self, lf, measures, cancel=None):
+        frame = self._frame(lf, measures, cancel)
+        stats = {}
+        for m in measures:
+            col = frame[m].astype(float)
+            median = col.median()
+            if np.isnan(median):
+                stats[m] = (None, None, None, None)
+                continue
+            # Polars' default quantile interpolation.
+            quartiles = col.quantile([0.25, 0.75], interpolation="nearest")
+            stats[m] = (median, (col - median).abs().median(), quartiles[0.25], quartiles[0.75])
+        return stats
+
+    def flag_outliers(self, lf, fences, k, cancel=None):
+        frame = self._frame(lf, list(fences), cancel)
+        flagged = {}
+        for m, (lower, upper, median) in fences.items():
+            col = frame[m].astype(float)
+            values = col[(col < lower) | (col > upper)]
+            top = values.loc[(values - median).abs().nlargest(k).index]
+            flagged[m] = (len(values), top.tolist())
+        return len(frame), flagged
+
+    def daily_totals(self, lf, time_column, measures, cancel=None):
+        frame = self._frame(lf, [time_column] + measures, cancel)
+        dates = pd.to_datetime(frame[time_column])
+        keep = dates.notna()
+        sums = frame.loc[keep, measures].astype(float).groupby(dates[keep].dt.floor("D")).sum().sort_index()
+        return pl.DataFrame({"__day": self._dates(sums.index.to_series())} | {m: sums[m].to_numpy() for m in measures})
+
+
+BACKENDS: dict[str, type[Backend]] = {"polars": PolarsBackend, "pandas": PandasBackend}
+
+
+def get_backend(name: str | None = None) -> Backend:
+    """The named compute backend, by default the one set in ``DATABOARD_BACKEND``."""
+    name = name or os.environ.get(BACKEND_ENV, DEFAULT_BACKEND)
+    try:
+        return BACKENDS[name.lower()]()
+    except KeyError:
+        raise ValueError(f"Unknown compute backend {name!r}; choose one of {', '.join(BACKENDS)}") from None
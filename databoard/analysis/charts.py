@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Literal
+
+from ..data.cancel import CancelToken
+from ..data.profile import DatasetProfile
+from ..lazy import lazy_import
+from .backend import Backend, get_backend
+from .insights import column_roles
+from .timeseries import TimeSeriesInfo, series
+
+pl = lazy_import("polars")
+
+MAX_CHARTS = 6
+MAX_BARS = 20
+HISTOGRAM_BINS = 20
+# Columns with more missing values than this are not charted.
+MAX_NULL_SHARE = 0.5
+
+
+@dataclass
+class ChartSpec:
+    """What to draw and which aggregate it needs."""
+
+    id: str
+    kind: Literal["line", "bar", "histogram"]
+    title: str
+    x: str
+    y: str | None = None
+    agg: Literal["sum", "count"] = "sum"
+    every: str | None = None
+    bins: int = HISTOGRAM_BINS
+    low: float | None = None
+    high: float | None = None
+
+
+def _resolution(span_days: int, levels: list[str] | None) -> str:
+    if span_days > 730:
+        level = "month"
+    elif span_days > 90:
+        level = "week"
+    else:
+        level = "day"
+    if levels and level not in levels:
+        level = levels[0]
+    return level
+
+
+def plan_charts(
+    schema: pl.Schema,
+    profile: DatasetProfile,
+    max_charts: int = MAX_CHARTS,
+    levels: list[str] | None = None,
+) -> list[ChartSpec]:
+    """Choose charts from column types, cardinality and null rates.
+
+    Date columns get a time series of the main measures, low-cardinality
+    categories get bar charts and measures get histograms. ``levels``
+    restricts time series to the rollup resolutions cached for the dataset.
+    """
+    stats = {col.name: col for col in profile.columns}
+
+    def usable(name: str) -> bool:
+        col = stats.get(name)
+        return col is not None and profile.rows > 0 and col.null_count / profile.rows <= MAX_NULL_SHARE
+
+    measures, categories, time_column = column_roles(schema, profile)
+    measures = [m for m in measures if usable(m)]
+    categories = sorted((c for c in categories if usable(c) and stats[c].distinct <= MAX_BARS), key=lambda c: stats[c].distinct)
+    charts: list[ChartSpec] = []
+
+    if time_column and usable(time_column):
+        col = stats[time_column]
+        span = (col.max - col.min).days if col.min is not None and col.max is not None else 0
+        every = _resolution(span, levels)
+        if measures:
+            for m in measures[:2]:
+                charts.append(ChartSpec(f"trend-{m}", "line", f"{m} over time", time_column, m, "sum", every))
+        else:
+            charts.append(ChartSpec(f"trend-{time_column}", "line", "Rows over time", time_column, None, "count", every))
+
+    for c in categories[:2]:
+        if measures:
+            charts.append(ChartSpec(f"bar-{c}", "bar", f"{measures[0]} by {c}", c, measures[0], "sum"))
+        else:
+            charts.append(ChartSpec(f"bar-{c}", "bar", f"Rows by {c}", c, None, "count"))
+
+    for m in measures:
+        col = stats[m]
+        if col.min is None or col.max is None or col.min == col.max:
+            continue
+        charts.append(ChartSpec(f"hist-{m}", "histogram", f"Distribution of {m}", m, None, "count", low=float(col.min), high=float(col.max)))
+
+    return charts[:max_charts]
+
+
+def from_rollup(spec: ChartSpec, info: TimeSeriesInfo | None, rollups: dict[str, pl.DataFrame]) -> bool:
+    """Whether a chart can be served from cached time rollups."""
+    return spec.kind == "line" and info is not None and spec.x == info.column and spec.every in rollups
+
+
+def compute_charts(
+    lf: pl.LazyFrame,
+    specs: list[ChartSpec],
+    info: TimeSeriesInfo | None = None,
+    rollups: dict[str, pl.DataFrame] | None = None,
+    weight: str | None = None,
+    backend: Backend | None = None,
+    cancel: CancelToken | None = None,
+) -> dict[str, pl.DataFrame]:
+    """Compute the aggregates of every chart.
+
+    Time series covered by the dataset's cached rollups are looked up
+    directly; the rest are computed together by the compute backend. With
+    ``weight`` set, ``lf`` is a sample and counts and sums are scaled by
+    that column.
+    """
+    rollups = rollups or {}
+    result = {spec.id: series(rollups[spec.every], spec.y) for spec in specs if from_rollup(spec, info, rollups)}
+    pending = [spec for spec in specs if spec.id not in result]
+    if pending:
+        frames = (backend or get_backend()).chart_data(lf, pending, weight, cancel)
+        for spec, frame in zip(pending, frames):
+            result[spec.id] = frame.head(MAX_BARS) if spec.kind == "bar" else frame
+    return result
+
+
+def chart_frame(kind: str, data: pl.DataFrame) -> pl.DataFrame:
+    """A chart's points as a text ``x`` and float ``y`` column.
+
+    This is the shape the browser decodes from Arrow: labels need no type
+    handling there and ``y`` maps onto a ``Float64Array``.
+    """
+    if kind == "histogram":
+        x = pl.Series("x", [f"{x:,.4g}" for x in data["x"]], dtype=pl.String)
+    else:
+        x = data["x"].cast(pl.String).fill_null("(missing)")
+    return pl.DataFrame([x, data["y"].cast(pl.Float64)])
+
+
+def chart_payload(spec: ChartSpec, src: str) -> dict:
+    """A chart spec and the API path serving its points."""
+    payload = asdict(spec)
+    payload["src"] = src
+    return payload
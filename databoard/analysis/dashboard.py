@@ -0,0 +1,157 @@
+import time
+import uuid
+from dataclasses import dataclass, field
+from urllib.parse import quote
+
+from ..data.cancel import CancelToken, check
+from ..data.store import (
+    chart_path,
+    load_profile,
+    load_rollup,
+    load_timeseries_info,
+    save_chart,
+    save_dashboard_artifact,
+    scan_dataset,
+    stratified_sample,
+)
+from ..lazy import lazy_import
+from .backend import Backend, get_backend
+from .charts import ChartSpec, chart_frame, chart_payload, compute_charts, from_rollup, plan_charts
+from .timeseries import series
+from .insights import generate_insights
+from .outliers import find_anomalies
+
+pl = lazy_import("polars")
+
+MAX_INSIGHTS = 6
+SAMPLE_WEIGHT = "__w"
+
+
+@dataclass
+class Dashboard:
+    """Charts and insights of a dataset, ready for the frontend."""
+
+    charts: list[dict] = field(default_factory=list)
+    insights: list[dict] = field(default_factory=list)
+    time_column: str = ""
+    resolutions: list[str] = field(default_factory=list)
+    time_resolution: str = ""
+    approximate: bool = False
+    sample_fraction: float = 1.0
+
+
+def chart_src(dataset_id: str, index: int, version: str) -> str:
+    """API path of a chart's stored points; ``version`` busts browser caches."""
+    return f"/api/datasets/{dataset_id}/charts/{index}?v={version}"
+
+
+def rollup_src(dataset_id: str, level: str, measure: str | None) -> str:
+    """API path of a time series served straight from a cached rollup."""
+    src = f"/api/datasets/{dataset_id}/rollups/{level}"
+    return src if measure is None else f"{src}?measure={quote(measure)}"
+
+
+def build_dashboard(
+    dataset_id: str,
+    sample_rows: int | None = None,
+    cancel: CancelToken | None = None,
+    backend: Backend | None = None,
+) -> Dashboard:
+    """Plan and compute a dashboard, exactly or from a stratified sample.
+
+    When ``sample_rows`` is smaller than the dataset, charts are computed
+    on a weighted sample and scaled up, and the result is marked
+    approximate. Time series served from cached rollups are always exact.
+
+    Chart points are not part of the result: each chart is stored as an
+    Arrow file (or read from its rollup) and referenced by API path.
+    Aggregations run on ``backend``, by default the one configured for
+    the run.
+    """
+    backend = backend or get_backend()
+    profile = load_profile(dataset_id)
+    info = load_timeseries_info(dataset_id)
+    levels = info.levels if info else []
+    rollups = {level: load_rollup(dataset_id, level) for level in levels}
+    lf = scan_dataset(dataset_id)
+    specs = plan_charts(lf.collect_schema(), profile, levels=levels)
+    check(cancel)
+
+    approximate = sample_rows is not None and sample_rows < profile.rows
+    if approximate:
+        sample = stratified_sample(dataset_id, sample_rows, weight=SAMPLE_WEIGHT)
+        data = compute_charts(sample.lazy(), specs, info, rollups, weight=SAMPLE_WEIGHT, backend=backend, cancel=cancel)
+        check(cancel)
+        # Outlier counts and anomalous days need every row; they wait for the exact pass.
+        insights = generate_insights(sample.drop(SAMPLE_WEIGHT).lazy(), profile, rows=sample.height, cancel=cancel, backend=backend)
+        fraction = sample.height / profile.rows
+    else:
+        data = compute_charts(lf, specs, info, rollups, backend=backend, cancel=cancel)
+        check(cancel)
+        insights = generate_insights(lf, profile, cancel=cancel, backend=backend) + find_anomalies(lf, profile, cancel, backend)
+        fraction = 1.0
+    insights.sort(key=lambda insight: -insight.score)
+
+    version = uuid.uuid4().hex[:8]
+    charts = []
+    for i, spec in enumerate(specs):
+        if from_rollup(spec, info, rollups):
+            src = rollup_src(dataset_id, spec.every, spec.y)
+        else:
+            save_chart(dataset_id, i, chart_frame(spec.kind, data[spec.id]))
+            src = chart_src(dataset_id, i, version)
+        charts.append(chart_payload(spec, src))
+
+    return Dashboard(
+        charts=charts,
+        insights=[insight.to_dict() for insight in insights[:MAX_INSIGHTS]],
+        time_column=info.column if info else "",
+        resolutions=levels,
+        time_resolution=next((spec.every for spec in specs if spec.kind == "line"), ""),
+        approximate=approximate,
+        sample_fraction=fraction,
+    )
+
+
+def dashboard_url(dashboard_id: str) -> str:
+    """Page showing a published dashboard to anyone with the link."""
+    return f"/dashboard/{dashboard_id}"
+
+
+def image_src(dashboard_id: str, size: str = "full", fmt: str = "png", download: bool = False) -> str:
+    """API path of a rendered image of a published dashboard."""
+    src = f"/api/dashboards/{dashboard_id}/image.{fmt}?size={size}"
+    return f"{src}&download=true" if download else src
+
+
+def publish_dashboard(dataset_id: str, dashboard: Dashboard, title: str = "") -> str:
+    """Freeze a dashboard into an immutable artifact and return its ID.
+
+    Chart points are copied out of the dataset, so viewers are served the
+    stored files with no recomputation, and the artifact outlives the
+    dataset it came from.
+    """
+    dashboard_id = uuid.uuid4().hex
+    frames = []
+    charts = []
+    for i, chart in enumerate(dashboard.charts):
+        spec = ChartSpec(**{key: value for key, value in chart.items() if key != "src"})
+        if chart["src"] == rollup_src(dataset_id, spec.every, spec.y):
+            frames.append(chart_frame("line", series(load_rollup(dataset_id, spec.every), spec.y)))
+        else:
+            frames.append(pl.read_ipc(chart_path(dataset_id, i), memory_map=False))
+        charts.append({**chart, "src": f"/api/dashboards/{dashboard_id}/charts/{i}"})
+
+    profile = load_profile(dataset_id)
+    spec = {
+        "id": dashboard_id,
+        "title": title or "Dashboard",
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "rows": profile.rows,
+        "columns": len(profile.columns),
+        "approximate": dashboard.approximate,
+        "charts": charts,
+        "insights": dashboard.insights,
+    }
+    save_dashboard_artifact(dashboard_id, spec, frames)
+    return dashboard_id
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Literal
+
+from ..data.cancel import CancelToken, check, collect
+from ..data.profile import DatasetProfile
+from ..lazy import lazy_import
+from .backend import Backend, get_backend
+
+np = lazy_import("numpy")
+pl = lazy_import("polars")
+
+# Rows sampled for correlation; wide tables use fewer rows so the cost of
+# the column-by-column products stays bounded.
+SAMPLE_ROWS = 50_000
+WIDE_SAMPLE_ROWS = 10_000
+WIDE_COLUMNS = 100
+BLOCK_SIZE = 128
+TOP_K = 5
+MAX_CATEGORIES = 50
+MIN_EFFECT = 0.1
+MIN_CORRELATION = 0.3
+
+
+@dataclass
+class Insight:
+    """A single finding to show on the dashboard."""
+
+    kind: str
+    title: str
+    detail: str
+    score: float
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class Correlations:
+    names: list[str]
+    top: list[tuple[str, str, float]]
+    matrix: np.ndarray | None = None
+
+
+def _sample(lf: pl.LazyFrame, rows: int, target: int) -> pl.LazyFrame:
+    """Systematically sample about ``target`` rows without a full collect."""
+    step = -(-rows // target)
+    return lf.gather_every(step) if step > 1 else lf
+
+
+def _standardize(values: np.ndarray) -> np.ndarray:
+    """Center and scale columns; missing values become the column mean."""
+    mean = np.nanmean(values, axis=0)
+    std = np.nanstd(values, axis=0)
+    z = (values - mean) / np.where(std > 0, std, 1)
+    return np.nan_to_num(z, copy=False)
+
+
+def correlate(
+    sample: pl.DataFrame,
+    method: Literal["pearson", "spearman"] = "pearson",
+    k: int = TOP_K,
+    block_size: int = BLOCK_SIZE,
+    keep_matrix: bool = True,
+) -> Correlations:
+    """Correlation of every numeric column pair in a sample.
+
+    Columns are processed in blocks so each product is a single BLAS call
+    over ``block_size`` columns and only the top-k pairs of each block are
+    kept. The full matrix is kept only when ``keep_matrix`` is set.
+    """
+    names = sample.columns
+    if method == "spearman":
+        sample = sample.select(pl.all().rank("average"))
+    z = _standardize(sample.cast(pl.Float32).to_numpy())
+    n, m = z.shape
+    matrix = np.eye(m, dtype=np.float32) if keep_matrix else None
+    pairs: list[tuple[float, int, int]] = []
+
+    for i in range(0, m, block_size):
+        zi = z[:, i : i + block_size]
+        for j in range(i, m, block_size):
+            block = zi.T @ z[:, j : j + block_size] / max(n, 1)
+            if matrix is not None:
+                matrix[i : i + block.shape[0], j : j + block.shape[1]] = block
+                matrix[j : j + block.shape[1], i : i + block.shape[0]] = block.T
+            if i == j:
+                block = np.triu(block, 1)
+            flat = np.abs(block).ravel()
+            take = min(k, flat.size)
+            for idx in np.argpartition(flat, -take)[-take:]:
+                r, c = divmod(int(idx), block.shape[1])
+                if flat[idx] > 0:
+                    pairs.append((float(block[r, c]), i + r, j + c))
+
+    pairs.sort(key=lambda p: -abs(p[0]))
+    top = [(names[a], names[b], round(value, 3)) for value, a, b in pairs[:k]]
+    return Correlations(names, top, matrix)
+
+
+def column_roles(schema: pl.Schema, profile: DatasetProfile) -> tuple[list[str], list[str], str | None]:
+    """Split columns into measures, low-cardinality categories and a time column."""
+    stats = {col.name: col for col in profile.columns}
+    measures, categories, time_column = [], [], None
+    for name, dtype in schema.items():
+        col = stats.get(name)
+        if dtype.is_numeric():
+            # Integer columns that are (almost) all distinct are identifiers.
+            if dtype.is_integer() and col and col.count and col.distinct > 0.95 * col.count:
+                continue
+            measures.append(name)
+        elif (dtype == pl.Date or isinstance(dtype, pl.Datetime)) and time_column is None:
+            # Times of day and durations have no calendar to bucket by.
+            time_column = name
+        elif dtype == pl.String and col and 2 <= col.distinct <= MAX_CATEGORIES:
+            categories.append(name)
+    return measures, categories, time_column
+
+
+def generate_insights(
+    lf: pl.LazyFrame,
+    profile: DatasetProfile,
+    method: Literal["pearson", "spearman"] = "pearson",
+    rows: int | None = None,
+    cancel: CancelToken | None = None,
+    backend: Backend | None = None,
+) -> list[Insight]:
+    """Find the strongest relationships in a dataset, best first.
+
+    ``rows`` is the height of ``lf`` when it is a sample rather than the
+    whole dataset described by ``profile``.
+    """
+    backend = backend or get_backend()
+    schema = lf.collect_schema()
+    measures, categories, time_column = column_roles(schema, profile)
+    insights: list[Insight] = []
+
+    if len(measures) >= 2:
+        wide = len(measures) > WIDE_COLUMNS
+        target = WIDE_SAMPLE_ROWS if wide else SAMPLE_ROWS
+        sample = collect(_sample(lf.select(measures), rows or profile.rows, target), cancel)
+        corr = correlate(sample, method=method, keep_matrix=not wide)
+        for a, b, r in corr.top:
+            if abs(r) < MIN_CORRELATION:
+                continue
+            direction = "rise" if r > 0 else "fall"
+            insights.append(Insight("correlation", f"{a} and {b}", f"When {a} rises, {b} tends to {direction} (r = {r:+.2f})", abs(r)))
+
+    check(cancel)
+    if categories and measures:
+        for (category, measure), eta in backend.variance_explained(lf, categories, measures, cancel).items():
+            if eta >= MIN_EFFECT:
+                insights.append(Insight("segment", f"{category} drives {measure}", f"{category} explains {eta:.0%} of the variance in {measure}", eta))
+
+    if time_column and measures:
+        for measure, slope in backend.trend_slopes(lf, time_column, measures, cancel).items():
+            col = next(c for c in profile.columns if c.name == measure)
+            if not col.std or not slope:
+                continue
+            # Slope per 30 days relative to the measure's spread.
+            effect = abs(slope) * 30 / col.std
+            if effect >= MIN_EFFECT:
+                direction = "up" if slope > 0 else "down"
+                insights.append(Insight("trend", f"{measure} trending {direction}", f"{measure} changes by {slope * 30:+,.2f} per month", min(effect, 1.0)))
+
+    insights.sort(key=lambda i: -i.score)
+    return insights
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from ..data.cancel import CancelToken
+from ..data.profile import DatasetProfile
+from ..lazy import lazy_import
+from .backend import Backend, get_backend
+from .insights import Insight, column_roles
+
+pl = lazy_import("polars")
+
+# 1.4826 * MAD estimates the standard deviation of normal data.
+MAD_SCALE = 1.4826
+Z_THRESHOLD = 3.5
+IQR_FACTOR = 1.5
+WINDOW_DAYS = 7
+EXAMPLES = 3
+# Flagged share above which a column is reported.
+MIN_SHARE = 0.001
+
+
+@dataclass
+class OutlierSummary:
+    """Outliers of one measure column over the whole dataset."""
+
+    column: str
+    count: int
+    share: float
+    lower: float
+    upper: float
+    examples: list[float]
+
+
+@dataclass
+class AnomalousPeriod:
+    """A day whose total departs from its rolling neighbourhood."""
+
+    column: str
+    period: str
+    value: float
+    expected: float
+    score: float
+
+
+def detect_outliers(
+    lf: pl.LazyFrame,
+    measures: list[str],
+    k: int = EXAMPLES,
+    cancel: CancelToken | None = None,
+    backend: Backend | None = None,
+) -> list[OutlierSummary]:
+    """Flag values outside the robust z-score or IQR fences of each measure.
+
+    Both passes run over all measures at once; the second one counts
+    flagged rows and picks the most extreme examples.
+    """
+    if not measures:
+        return []
+    backend = backend or get_backend()
+    stats = backend.robust_stats(lf, measures, cancel)
+
+    fences = {}
+    for m in measures:
+        median, mad, q1, q3 = stats[m]
+        if median is None:
+            continue
+        iqr = q3 - q1
+        lower, upper = q1 - IQR_FACTOR * iqr, q3 + IQR_FACTOR * iqr
+        if mad:
+            # A value is an outlier only if both rules agree, which keeps
+            # skewed but legitimate tails from being flagged wholesale.
+            spread = Z_THRESHOLD * MAD_SCALE * mad
+            lower, upper = min(lower, median - spread), max(upper, median + spread)
+        if lower == upper:
+            continue
+        fences[m] = (lower, upper, median)
+    if not fences:
+        return []
+    n, flagged = backend.flag_outliers(lf, fences, k, cancel)
+
+    n = n or 1
+    summaries = []
+    for m, (lower, upper, _) in fences.items():
+        count, examples = flagged[m]
+        if count and count / n >= MIN_SHARE:
+            summaries.append(OutlierSummary(m, count, count / n, lower, upper, examples))
+    return summaries
+
+
+def detect_anomalous_periods(
+    lf: pl.LazyFrame,
+    time_column: str,
+    measures: list[str],
+    window: int = WINDOW_DAYS,
+    k: int = EXAMPLES,
+    cancel: CancelToken | None = None,
+    backend: Backend | None = None,
+) -> list[AnomalousPeriod]:
+    """Find days whose totals break from a centered rolling median.
+
+    Residuals are scored with a robust z-score over the whole series, so a
+    single spike or collapse stands out against ordinary day-to-day noise.
+    """
+    if not measures:
+        return []
+    daily = (backend or get_backend()).daily_totals(lf, time_column, measures, cancel)
+    if daily.height < window * 2:
+        return []
+    scored = []
+    for m in measures:
+        expected = pl.col(m).rolling_median(window_size=window, center=True, min_samples=1)
+        residual = pl.col(m) - expected
+        spread = MAD_SCALE * (residual - residual.median()).abs().median()
+        score = pl.when(spread > 0).then(residual / spread)
+        scored += [expected.alias(f"{m}:expected"), score.alias(f"{m}:score")]
+    days = daily.with_columns(scored)
+
+    periods = []
+    for m in measures:
+        top = (
+            days.filter(pl.col(f"{m}:score").abs() > Z_THRESHOLD)
+            .sort(pl.col(f"{m}:score").abs(), descending=True)
+            .head(k)
+        )
+        for row in top.iter_rows(named=True):
+            periods.append(AnomalousPeriod(m, row["__day"].isoformat(), row[m], row[f"{m}:expected"], row[f"{m}:score"]))
+    return periods
+
+
+def outlier_insights(summaries: list[OutlierSummary], periods: list[AnomalousPeriod]) -> list[Insight]:
+    """Turn outlier results into dashboard insights."""
+    insights = []
+    for s in summaries:
+        examples = ", ".join(f"{value:,.2f}" for value in s.examples)
+        insights.append(Insight(
+            "outlier",
+            f"{s.count:,} outliers in {s.column}",
+            f"{s.share:.1%} of values fall outside {s.lower:,.2f} to {s.upper:,.2f}, e.g. {examples}",
+            min(s.share * 10, 1.0),
+        ))
+    for p in periods:
+        direction = "spike" if p.value > p.expected else "drop"
+        insights.append(Insight(
+            "anomaly",
+            f"{p.column} {direction} on {p.period}",
+            f"{p.value:,.2f} against an expected {p.expected:,.2f}",
+            min(abs(p.score) / 10, 1.0),
+        ))
+    return insights
+
+
+def find_anomalies(
+    lf: pl.LazyFrame,
+    profile: DatasetProfile,
+    cancel: CancelToken | None = None,
+    backend: Backend | None = None,
+) -> list[Insight]:
+    """Detect outliers and anomalous periods across every measure column."""
+    backend = backend or get_backend()
+    measures, _, time_column = column_roles(lf.collect_schema(), profile)
+    summaries = detect_outliers(lf, measures, cancel=cancel, backend=backend)
+    periods = detect_anomalous_periods(lf, time_column, measures, cancel=cancel, backend=backend) if time_column else []
+    return outlier_insights(summaries, periods)
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import functools
+import io
+import json
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Literal
+
+from ..data.store import dashboard_path, dashboard_render_path, save_dashboard_render
+from ..lazy import lazy_import
+
+Image = lazy_import("PIL.Image")
+ImageDraw = lazy_import("PIL.ImageDraw")
+ImageFont = lazy_import("PIL.ImageFont")
+pl = lazy_import("polars")
+
+Format = Literal["png", "webp"]
+Size = Literal["full", "thumb"]
+
+# Pillow format names and response media types of each output format.
+FORMATS = {"png": ("PNG", "image/png"), "webp": ("WEBP", "image/webp")}
+WIDTH = 1200
+THUMB_WIDTH = 400
+RENDER_WORKERS = 2
+
+MARGIN = 32
+GAP = 16
+TILE_HEIGHT = 84
+CHART_HEIGHT = 300
+CHART_COLUMNS = 2
+# Bar charts with more bars than this label only their first and last.
+MAX_BAR_LABELS = 12
+MAX_INSIGHTS = 3
+MAX_TILES = 4
+
+BACKGROUND = "#f8fafc"
+CARD = "#ffffff"
+BORDER = "#e5e7eb"
+TEXT = "#111827"
+MUTED = "#6b7280"
+GRID = "#f3f4f6"
+# As in the browser, see databoard/components/charts.py.
+COLORS = {"line": "#3B82F6", "histogram": "#8B5CF6"}
+BAR_COLOR = "#22c55e"
+
+
+@functools.lru_cache(maxsize=8)
+def _font(size: int) -> ImageFont.FreeTypeFont:
+    # Pillow's bundled font has no bullets or dashes; labels stick to ASCII punctuation.
+    return ImageFont.load_default(size)
+
+
+def _compact(value: float) -> str:
+    """Short label of a number, e.g. ``1.2M``."""
+    for limit, suffix in ((1e12, "T"), (1e9, "B"), (1e6, "M"), (1e3, "K")):
+        if abs(value) >= limit:
+            return f"{value / limit:.3g}{suffix}"
+    return f"{value:.3g}"
+
+
+def _fit(text: str, font: ImageFont.FreeTypeFont, width: float) -> str:
+    """Cut ``text`` with an ellipsis so it is at most ``width`` pixels wide."""
+    if font.getlength(text) <= width:
+        return text
+    while text and font.getlength(text + "...") > width:
+        text = text[:-1]
+    return text + "..."
+
+
+def _tiles(spec: dict, charts: list[pl.DataFrame]) -> list[tuple[str, str]]:
+    """KPI tiles: dataset size, then the total of each measure over time."""
+    tiles = [("Rows", f"{spec['rows']:,}"), ("Columns", f"{spec['columns']:,}")]
+    for chart, frame in zip(spec["charts"], charts):
+        if chart["kind"] == "line" and chart["y"] and len(tiles) < MAX_TILES:
+            tiles.append((f"Total {chart['y']}", _compact(frame["y"].sum())))
+    return tiles
+
+
+def _draw_chart(draw: ImageDraw.ImageDraw, box: tuple[int, int, int, int], chart: dict, frame: pl.DataFrame):
+    left, top, right, bottom = box
+    draw.rounded_rectangle(box, radius=16, fill=CARD, outline=BORDER)
+    title = _font(16)
+    small = _font(12)
+    draw.text((left + 20, top + 16), _fit(chart["title"], title, right - left - 40), font=title, fill=TEXT)
+
+    x0, y0, x1, y1 = left + 64, top + 52, right - 20, bottom - 36
+    values = [v if v is not None and math.isfinite(v) else 0.0 for v in frame["y"].to_list()]
+    labels = [str(x) for x in frame["x"].to_list()]
+    if not values:
+        return
+    low, high = min(0.0, min(values)), max(0.0, max(values))
+    span = (high - low) or 1.0
+
+    def y(value: float) -> float:
+        return y1 - (value - low) / span * (y1 - y0)
+
+    for tick in (low, (low + high) / 2, high):
+        draw.line((x0, y(tick), x1, y(tick)), fill=GRID, width=1)
+        text = _compact(tick)
+        draw.text((x0 - 8 - small.getlength(text), y(tick) - 7), text, font=small, fill=MUTED)
+
+    n = len(values)
+    color = COLORS.get(chart["kind"], BAR_COLOR)
+    if chart["kind"] == "line":
+        step = (x1 - x0) / max(n - 1, 1)
+        points = [(x0 + i * step, y(v)) for i, v in enumerate(values)]
+        if n == 1:
+            draw.ellipse((points[0][0] - 3, points[0][1] - 3, points[0][0] + 3, points[0][1] + 3), fill=color)
+        else:
+            draw.line(points, fill=color, width=3, joint="curve")
+        centers = [p[0] for p in points]
+    else:
+        slot = (x1 - x0) / n
+        pad = 1 if chart["kind"] == "histogram" else slot * 0.15
+        centers = []
+        for i, v in enumerate(values):
+            a, b = x0 + i * slot + pad, x0 + (i + 1) * slot - pad
+            top_y, base = sorted((y(v), y(0.0)))
+            draw.rectangle((a, top_y, max(a, b - 1), base), fill=color)
+            centers.append((a + b) / 2)
+    draw.line((x0, y(0.0), x1, y(0.0)), fill=BORDER, width=1)
+
+    shown = range(n) if chart["kind"] == "bar" and n <= MAX_BAR_LABELS else sorted({0, n - 1})
+    room = (x1 - x0) / (len(shown) if chart["kind"] == "bar" and n <= MAX_BAR_LABELS else 2)
+    for i in shown:
+        text = _fit(labels[i], small, room - 4)
+        width = small.getlength(text)
+        x = min(max(centers[i] - width / 2, x0), x1 - width)
+        draw.text((x, y1 + 10), text, font=small, fill=MUTED)
+
+
+def draw_dashboard(spec: dict, charts: list[pl.DataFrame], width: int = WIDTH) -> Image.Image:
+    """Draw a dashboard: title, KPI tiles, top insights and a chart grid."""
+    tiles = _tiles(spec, charts)
+    insights = spec["insights"][:MAX_INSIGHTS]
+    rows = math.ceil(len(charts) / CHART_COLUMNS)
+    insight_height = 28 + 22 * len(insights) if insights else 0
+    height = (
+        MARGIN + 64 + TILE_HEIGHT + GAP
+        + (insight_height + GAP if insights else 0)
+        + rows * (CHART_HEIGHT + GAP) - GAP + MARGIN
+    )
+    image = Image.new("RGB", (width, height), BACKGROUND)
+    draw = ImageDraw.Draw(image)
+    inner = width - 2 * MARGIN
+
+    draw.text((MARGIN, MARGIN), _fit(spec["title"], _font(28), inner), font=_font(28), fill=TEXT)
+    meta = f"{len(charts)} charts · created {spec['created'][:10]}"
+    if spec.get("approximate"):
+        meta += " · approximate"
+    draw.text((MARGIN, MARGIN + 38), meta, font=_font(14), fill=MUTED)
+    top = MARGIN + 64
+
+    tile_width = (inner - GAP * (len(tiles) - 1)) / len(tiles)
+    for i, (label, value) in enumerate(tiles):
+        left = MARGIN + i * (tile_width + GAP)
+        draw.rounded_rectangle((left, top, left + tile_width, top + TILE_HEIGHT), radius=16, fill=CARD, outline=BORDER)
+        draw.text((left + 20, top + 14), _fit(label, _font(13), tile_width - 40), font=_font(13), fill=MUTED)
+        draw.text((left + 20, top + 36), value, font=_font(28), fill=TEXT)
+    top += TILE_HEIGHT + GAP
+
+    if insights:
+        draw.rounded_rectangle((MARGIN, top, width - MARGIN, top + insight_height), radius=16, fill="#fffbeb", outline="#fde68a")
+        for i, insight in enumerate(insights):
+            text = _fit(f"{insight['title']}: {insight['detail']}", _font(14), inner - 40)
+            draw.text((MARGIN + 20, top + 14 + 22 * i), text, font=_font(14), fill=TEXT)
+        top += insight_height + GAP
+
+    chart_width = (inner - GAP * (CHART_COLUMNS - 1)) / CHART_COLUMNS
+    for i, (chart, frame) in enumerate(zip(spec["charts"], charts)):
+        row, col = divmod(i, CHART_COLUMNS)
+        left = MARGIN + col * (chart_width + GAP)
+        y = top + row * (CHART_HEIGHT + GAP)
+        _draw_chart(draw, (round(left), y, round(left + chart_width), y + CHART_HEIGHT), chart, frame)
+    return image
+
+
+def _render(directory: str, fmt: Format, size: Size) -> bytes:
+    """Draw and encode a published dashboard; runs in a worker process."""
+    path = Path(directory)
+    spec = json.loads((path / "dashboard.json").read_text())
+    charts = [pl.read_ipc(path / "charts" / f"{i}.arrow", memory_map=False) for i in range(len(spec["charts"]))]
+    image = draw_dashboard(spec, charts)
+    if size == "thumb":
+        image.thumbnail((THUMB_WIDTH, THUMB_WIDTH * image.height // image.width), Image.Resampling.LANCZOS)
+    buf = io.BytesIO()
+    image.save(buf, FORMATS[fmt][0], **({"compress_level": 3} if fmt == "png" else {"quality": 85, "method": 2}))
+    return buf.getvalue()
+
+
+@functools.cache
+def _pool() -> ProcessPoolExecutor:
+    # Spawned rather than forked: forking a process that runs Polars'
+    # thread pool can deadlock the child.
+    return ProcessPoolExecutor(RENDER_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+
+
+def render_snapshot(dashboard_id: str, fmt: Format = "png", size: Size = "full") -> Path:
+    """Path of a rendered image of a published dashboard.
+
+    Dashboards never change once published, so each image is drawn once,
+    in the render worker pool, and served from disk after that. Raises
+    ``FileNotFoundError`` if there is no such dashboard.
+    """
+    path = dashboard_render_path(dashboard_id, size, fmt)
+    if not path.is_file():
+        directory = dashboard_path(dashboard_id)
+        if not (directory / "dashboard.json").is_file():
+            raise FileNotFoundError(f"Dashboard {dashboard_id} not found")
+        save_dashboard_render(dashboard_id, size, fmt, _pool().submit(_render, str(directory), fmt, size).result())
+    return path
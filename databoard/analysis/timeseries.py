@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from ..lazy import lazy_import
+
+pl = lazy_import("polars")
+
+# Rollup levels from finest to coarsest, with their Polars durations.
+RESOLUTIONS = {"day": "1d", "week": "1w", "month": "1mo", "quarter": "1q"}
+
+_GRANULARITIES = [
+    ("second", timedelta(seconds=1)),
+    ("minute", timedelta(minutes=1)),
+    ("hour", timedelta(hours=1)),
+    ("day", timedelta(days=1)),
+    ("week", timedelta(weeks=1)),
+    ("month", timedelta(days=28)),
+    ("quarter", timedelta(days=89)),
+    ("year", timedelta(days=365)),
+]
+
+
+@dataclass
+class TimeSeriesInfo:
+    """Detected time column and the rollup levels built for it."""
+
+    column: str
+    granularity: str
+    measures: list[str] = field(default_factory=list)
+    levels: list[str] = field(default_factory=list)
+
+
+def detect_time_column(schema: pl.Schema) -> str | None:
+    """The first date or datetime column, if any."""
+    for name, dtype in schema.items():
+        if dtype == pl.Date or isinstance(dtype, pl.Datetime):
+            return name
+    return None
+
+
+def detect_granularity(values: pl.Series) -> str:
+    """Classify the typical spacing between distinct timestamps."""
+    steps = values.drop_nulls().unique().sort().diff().drop_nulls()
+    if steps.is_empty():
+        return "day"
+    step = steps.median()
+    if not isinstance(step, timedelta):
+        step = timedelta(days=float(step))
+    name = _GRANULARITIES[0][0]
+    for label, size in _GRANULARITIES:
+        if step >= size:
+            name = label
+    return name
+
+
+def rollup_levels(granularity: str) -> list[str]:
+    """Rollup levels no finer than the data itself."""
+    order = [label for label, _ in _GRANULARITIES]
+    rank = order.index(granularity)
+    levels = [level for level in RESOLUTIONS if order.index(level) >= min(rank, order.index("day"))]
+    return levels or ["quarter"]
+
+
+def _aggregates(measures: list[str]) -> list[pl.Expr]:
+    return [pl.col("rows").sum()] + [
+        expr
+        for m in measures
+        for expr in (pl.col(f"{m}:sum").sum(), pl.col(f"{m}:min").min(), pl.col(f"{m}:max").max())
+    ]
+
+
+def coarsen(daily: pl.DataFrame, measures: list[str], levels: list[str]) -> dict[str, pl.DataFrame]:
+    """Derive coarser rollups from the daily one with ``group_by_dynamic``.
+
+    Sums, counts, minima and maxima merge exactly, so every level is built
+    from the small daily frame rather than from the raw rows. The daily
+    rollup is always included as the base that appends merge into.
+    """
+    daily = daily.sort("period")
+    rollups = {"day": daily}
+    for level in levels:
+        if level != "day":
+            rollups[level] = daily.group_by_dynamic("period", every=RESOLUTIONS[level]).agg(_aggregates(measures))
+    return rollups
+
+
+class RollupBuilder:
+    """Accumulate daily aggregates batch by batch during ingestion.
+
+    Used alongside the profiler so rollups cost no extra pass over the data.
+    Pass the stored ``info`` when appending so the delta is rolled up the
+    same way as the history.
+    """
+
+    def __init__(self, info: TimeSeriesInfo | None = None):
+        self.info = info
+        self.partials: list[pl.DataFrame] = []
+
+    def update(self, batch: pl.DataFrame):
+        if self.info is None:
+            column = detect_time_column(batch.schema)
+            if column is None:
+                return
+            measures = [name for name, dtype in batch.schema.items() if dtype.is_numeric()]
+            granularity = detect_granularity(batch[column])
+            self.info = TimeSeriesInfo(column, granularity, measures, rollup_levels(granularity))
+        column, measures = self.info.column, self.info.measures
+        self.partials.append(
+            batch.filter(pl.col(column).is_not_null())
+            .group_by(pl.col(column).cast(pl.Date).alias("period"))
+            .agg(
+                [pl.len().cast(pl.Int64).alias("rows")]
+                + [
+                    expr
+                    for m in measures
+                    for expr in (
+                        pl.col(m).cast(pl.Float64).sum().alias(f"{m}:sum"),
+                        pl.col(m).cast(pl.Float64).min().alias(f"{m}:min"),
+                        pl.col(m).cast(pl.Float64).max().alias(f"{m}:max"),
+                    )
+                ]
+            )
+        )
+
+    def daily(self) -> pl.DataFrame | None:
+        """Daily aggregates of everything seen so far."""
+        if self.info is None or not self.partials:
+            return None
+        return merge_daily(self.partials, self.info.measures)
+
+
+def merge_daily(frames: list[pl.DataFrame], measures: list[str]) -> pl.DataFrame:
+    """Combine daily rollups of disjoint row sets, e.g. history and an append."""
+    return pl.concat(frames).group_by("period").agg(_aggregates(measures)).sort("period")
+
+
+def series(rollup: pl.DataFrame, measure: str | None) -> pl.DataFrame:
+    """A chart-ready ``x``/``y`` series from a rollup: row counts or measure sums."""
+    y = pl.col("rows") if measure is None else pl.col(f"{measure}:sum")
+    return rollup.select(pl.col("period").alias("x"), y.alias("y"))
@@ -0,0 +1,247 @@
+import asyncio
+import io
+from typing import Literal
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import FileResponse, Response
+from pydantic import BaseModel
+
+from .analysis.charts import chart_frame
+from .analysis.render import FORMATS, render_snapshot
+from .analysis.timeseries import series
+from .data.catalog import get_catalog
+from .data.query import QueryError, QuerySpec, run_query
+from .data.storage import QuotaExceeded, reservation_lock, reserve, touch, touch_dashboard
+from .data.store import (
+    chart_path,
+    dashboard_chart_path,
+    dashboard_path,
+    dashboard_render_path,
+    dataset_path,
+    load_profile,
+    load_rollup,
+    load_timeseries_info,
+    preview_path,
+    scan_dataset,
+)
+from .data.uploads import UploadError, complete_upload, create_upload, load_upload, write_chunk
+from .session import client_connected
+from . import profiling
+from .lazy import lazy_import
+
+pl = lazy_import("polars")
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+ARROW_FILE = "application/vnd.apache.arrow.file"
+# Published dashboards never change, so browsers and CDNs may keep them for good.
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+api = FastAPI(title="DataBoard API")
+
+
+def _require_dataset(dataset_id: str):
+    try:
+        path = dataset_path(dataset_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not (path / "profile.json").is_file():
+        raise HTTPException(status_code=404, detail=f"Dataset {dataset_id} not found")
+    touch(dataset_id)
+
+
+@api.get("/api/datasets/{dataset_id}")
+def dataset_info(dataset_id: str) -> dict:
+    """Row count and column schema of a stored dataset."""
+    _require_dataset(dataset_id)
+    profile = load_profile(dataset_id)
+    return {
+        "id": dataset_id,
+        "rows": profile.rows,
+        "columns": [{"name": col.name, "dtype": col.dtype} for col in profile.columns],
+    }
+
+
+@api.get("/api/datasets/{dataset_id}/columns")
+def dataset_columns(dataset_id: str, q: str = "", page: int = 0, page_size: int = 100) -> dict:
+    """One page of the dataset's column catalog, optionally filtered by name."""
+    _require_dataset(dataset_id)
+    result = get_catalog(dataset_id).search(q, page, min(max(page_size, 1), 1000))
+    return {"columns": result.entries, "total": result.total, "page": result.page, "pages": result.pages}
+
+
+@api.post("/api/datasets/{dataset_id}/query")
+def query_dataset(dataset_id: str, spec: QuerySpec, format: Literal["json", "arrow"] = "json") -> Response:
+    """Run a filter/group-by/aggregate query against a stored dataset.
+
+    Results are returned as row-oriented JSON or as an Arrow IPC stream.
+    """
+    _require_dataset(dataset_id)
+    try:
+        result = run_query(scan_dataset(dataset_id), spec)
+    except QueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if format == "arrow":
+        buf = io.BytesIO()
+        result.write_ipc_stream(buf)
+        return Response(buf.getvalue(), media_type=ARROW_STREAM)
+    return Response(result.write_json(), media_type="application/json")
+
+
+def _arrow_file(path) -> FileResponse:
+    if not path.is_file():
+        raise HTTPException(status_code=404, detail="Not found")
+    return FileResponse(path, media_type=ARROW_FILE)
+
+
+@api.get("/api/datasets/{dataset_id}/preview")
+def dataset_preview(dataset_id: str) -> Response:
+    """First rows of a dataset as an Arrow IPC file, sent from disk as-is."""
+    _require_dataset(dataset_id)
+    return _arrow_file(preview_path(dataset_id))
+
+
+@api.get("/api/datasets/{dataset_id}/charts/{index}")
+def chart_data(dataset_id: str, index: int) -> Response:
+    """Points of a dashboard chart as an Arrow IPC file, sent from disk as-is."""
+    _require_dataset(dataset_id)
+    return _arrow_file(chart_path(dataset_id, index))
+
+
+@api.get("/api/datasets/{dataset_id}/rollups/{level}")
+def rollup_data(dataset_id: str, level: str, measure: str | None = None) -> Response:
+    """A time series from a cached rollup as an Arrow IPC stream.
+
+    The rollup is memory-mapped and only the requested columns are written
+    out, so no per-row Python or JSON work happens on the server.
+    """
+    _require_dataset(dataset_id)
+    info = load_timeseries_info(dataset_id)
+    if info is None or level not in info.levels:
+        raise HTTPException(status_code=404, detail=f"No {level} rollup for dataset {dataset_id}")
+    if measure is not None and measure not in info.measures:
+        raise HTTPException(status_code=404, detail=f"No rollup of {measure}")
+    frame = chart_frame("line", series(load_rollup(dataset_id, level), measure))
+    buf = io.BytesIO()
+    # Arrow JS reads neither compressed buffers nor string view columns.
+    frame.write_ipc_stream(buf, compression="uncompressed", compat_level=pl.CompatLevel.oldest())
+    return Response(buf.getvalue(), media_type=ARROW_STREAM)
+
+
+def _dashboard_file(request: Request, dashboard_id: str, path, media_type: str) -> Response:
+    try:
+        path = path(dashboard_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not path.is_file():
+        raise HTTPException(status_code=404, detail=f"Dashboard {dashboard_id} not found")
+    touch_dashboard(dashboard_id)
+    # Artifacts are immutable, so their name alone identifies the content.
+    etag = f'"{dashboard_id}-{path.name}"'
+    headers = {"Cache-Control": IMMUTABLE, "ETag": etag}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, media_type=media_type, headers=headers)
+
+
+@api.get("/api/dashboards/{dashboard_id}")
+def dashboard_spec(request: Request, dashboard_id: str) -> Response:
+    """Charts and insights of a published dashboard, served from its artifact."""
+    return _dashboard_file(request, dashboard_id, lambda d: dashboard_path(d) / "dashboard.json", "application/json")
+
+
+@api.get("/api/dashboards/{dashboard_id}/charts/{index}")
+def dashboard_chart(request: Request, dashboard_id: str, index: int) -> Response:
+    """Points of a published dashboard's chart as an Arrow IPC file."""
+    return _dashboard_file(request, dashboard_id, lambda d: dashboard_chart_path(d, index), ARROW_FILE)
+
+
+@api.get("/api/dashboards/{dashboard_id}/image.{fmt}")
+def dashboard_image(
+    request: Request,
+    dashboard_id: str,
+    fmt: Literal["png", "webp"],
+    size: Literal["full", "thumb"] = "full",
+    download: bool = False,
+) -> Response:
+    """A published dashboard drawn as an image, rendered once and cached."""
+    try:
+        render_snapshot(dashboard_id, fmt, size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Dashboard {dashboard_id} not found")
+    response = _dashboard_file(request, dashboard_id, lambda d: dashboard_render_path(d, size, fmt), FORMATS[fmt][1])
+    if download:
+        response.headers["Content-Disposition"] = f'attachment; filename="dashboard-{dashboard_id[:8]}.{fmt}"'
+    return response
+
+
+class NewUpload(BaseModel):
+    name: str
+    size: int
+
+
+def _load_upload(upload_id: str):
+    try:
+        return load_upload(upload_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Upload {upload_id} not found")
+
+
+@api.post("/api/uploads")
+def start_upload(request: Request, upload: NewUpload) -> dict:
+    """Start a resumable upload; its chunks are then sent in any order.
+
+    The browser tab's client token, sent as for Reflex uploads, is charged
+    for the space.
+    """
+    client = request.headers.get("reflex-client-token", "")
+    try:
+        # Until it exists, the new upload is not counted by other reservations.
+        with reservation_lock():
+            reserve(client, upload.size, client_connected)
+            return create_upload(upload.name, upload.size, session=client).status()
+    except QuotaExceeded as e:
+        raise HTTPException(status_code=507, detail=str(e))
+    except UploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@api.get("/api/uploads/{upload_id}")
+def upload_status(upload_id: str) -> dict:
+    """Which chunks of an upload the server has, so a client can resume it."""
+    return _load_upload(upload_id).status()
+
+
+@api.put("/api/uploads/{upload_id}/chunks/{index}")
+async def upload_chunk(request: Request, upload_id: str, index: int) -> dict:
+    """Store one chunk; its CRC-32 comes in the ``X-Chunk-CRC32`` header as hex."""
+    upload = _load_upload(upload_id)
+    data = await request.body()
+    try:
+        await asyncio.to_thread(write_chunk, upload, index, data, request.headers.get("x-chunk-crc32", ""))
+    except UploadError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"index": index}
+
+
+@api.post("/api/uploads/{upload_id}/complete")
+def finish_upload(upload_id: str) -> dict:
+    """Assemble an upload once every chunk has arrived."""
+    upload = _load_upload(upload_id)
+    try:
+        complete_upload(upload)
+    except UploadError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return upload.status()
+
+
+@api.get("/api/debug/profile")
+def profile_summary() -> dict:
+    """Event handler costs recorded by this worker when ``DATABOARD_PROFILE`` is set."""
+    if not profiling.enabled():
+        raise HTTPException(status_code=404, detail="Profiling is off")
+    return profiling.summary()
@@ -0,0 +1,71 @@
+import reflex as rx
+from reflex.components.component import NoSSRComponent
+
+
+class ArrowComponent(NoSSRComponent):
+    """Client component that loads its data as Arrow IPC from the backend API.
+
+    Only the URL goes through the Reflex state; the data itself skips the
+    JSON state sync and is decoded in the browser.
+    """
+
+    library = "$/public/arrow.js"
+
+    lib_dependencies: list[str] = ["apache-arrow@21.0.0", "recharts@3.2.0"]
+
+    # API path serving an Arrow IPC file or stream.
+    src: rx.Var[str]
+
+
+class ArrowChart(ArrowComponent):
+    """Line or bar chart of an ``x``/``y`` Arrow table."""
+
+    tag = "ArrowChart"
+
+    # "line" draws a line chart; anything else a bar chart.
+    kind: rx.Var[str]
+
+    color: rx.Var[str]
+
+    height: rx.Var[int]
+
+
+class ArrowTable(ArrowComponent):
+    """Plain table of every column of an Arrow table."""
+
+    tag = "ArrowTable"
+
+
+class ArrowDashboard(ArrowComponent):
+    """A published dashboard: fetches its spec as JSON, then every chart."""
+
+    tag = "ArrowDashboard"
+
+
+class ApiLink(NoSSRComponent):
+    """Link to a backend API path, such as an image to download."""
+
+    library = "$/public/arrow.js"
+
+    tag = "ApiLink"
+
+    href: rx.Var[str]
+
+
+class ApiImage(NoSSRComponent):
+    """Image served by the backend API."""
+
+    library = "$/public/arrow.js"
+
+    tag = "ApiImage"
+
+    src: rx.Var[str]
+
+    alt: rx.Var[str]
+
+
+arrow_chart = ArrowChart.create
+arrow_dashboard = ArrowDashboard.create
+arrow_table = ArrowTable.create
+api_link = ApiLink.create
+api_image = ApiImage.create
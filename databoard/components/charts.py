@@ -0,0 +1,33 @@
+import reflex as rx
+
+from .arrow import arrow_chart
+
+
+def chart_body(chart: dict) -> rx.Component:
+    """Render a chart payload, fetching its points from the Arrow API."""
+    return arrow_chart(
+        src=chart["src"],
+        kind=chart["kind"],
+        color=rx.match(chart["kind"], ("line", "#3B82F6"), ("histogram", "#8B5CF6"), "#22c55e"),
+        height=220,
+    )
+
+
+def chart_card(chart: dict) -> rx.Component:
+    """Chart with its title in a white card."""
+    return rx.box(
+        rx.vstack(
+            rx.text(
+                chart["title"],
+                size="3",
+                weight="bold",
+                color="#111827",
+            ),
+            chart_body(chart),
+            spacing="3",
+            width="100%",
+        ),
+        padding="1.5rem",
+        class_name="card-sm",
+        width="100%",
+    )
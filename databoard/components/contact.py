@@ -83,12 +83,8 @@ def contact_info_card(icon: str, title: str, info: str, subinfo: str = "") -> rx
     return rx.vstack(
         rx.box(
             rx.icon(icon, size=32, color="#3B82F6"),
-            padding="1rem",
-            border_radius="50%",
             background="rgba(59, 130, 246, 0.1)",
-            style={
-                "animation": "float 3s ease-in-out infinite",
-            }
+            class_name="icon-bubble float",
         ),
         rx.text(
             title,
@@ -116,17 +112,7 @@ def contact_info_card(icon: str, title: str, info: str, subinfo: str = "") -> rx
         spacing="3",
         align_items="center",
         padding="2rem",
-        background="white",
-        border_radius="16px",
-        box_shadow="0 4px 20px rgba(0,0,0,0.08)",
-        style={
-            "animation": "fadeInUp 1s ease-out",
-            "_hover": {
-                "transform": "translateY(-4px)",
-                "box_shadow": "0 8px 30px rgba(0,0,0,0.12)",
-            },
-            "transition": "all 0.3s ease",
-        }
+        class_name="card-sm card-hover fade-in-up",
     )
 
 def contact() -> rx.Component:
@@ -140,13 +126,7 @@ def contact() -> rx.Component:
                         "Get In Touch",
                         size="8",
                         weight="bold",
-                        background="linear-gradient(45deg, #3B82F6, #8B5CF6, #EC4899)",
-                        background_clip="text",
-                        color="transparent",
-                        text_align="center",
-                        style={
-                            "animation": "fadeInUp 1s ease-out",
-                        }
+                        class_name="gradient-text fade-in-up",
                     ),
                     rx.text(
                         "Have questions about DataBoard? We'd love to hear from you.",
@@ -217,9 +197,7 @@ def contact() -> rx.Component:
                             border="1px solid rgba(34, 197, 94, 0.3)",
                             border_radius="12px",
                             margin_bottom="2rem",
-                            style={
-                                "animation": "slideIn 0.5s ease-out",
-                            }
+                            class_name="slide-in",
                         )
                     ),
                     
@@ -359,15 +337,10 @@ def contact() -> rx.Component:
                             size="3",
                             width="200px",
                             disabled=ContactState.is_submitting,
+                            class_name="btn-gradient",
                             style={
-                                "background": "linear-gradient(45deg, #3B82F6, #8B5CF6)",
                                 "cursor": rx.cond(ContactState.is_submitting, "not-allowed", "pointer"),
                                 "opacity": rx.cond(ContactState.is_submitting, "0.7", "1"),
-                                "transform": "translateY(0)",
-                                "_hover": {
-                                    "transform": "translateY(-2px)",
-                                    "box_shadow": "0 10px 25px rgba(59, 130, 246, 0.3)",
-                                }
                             },
                             on_click=ContactState.submit_form,
                         ),
@@ -379,9 +352,7 @@ def contact() -> rx.Component:
                     ),
                     
                     padding="3rem 2rem",
-                    background="white",
-                    border_radius="20px",
-                    box_shadow="0 10px 40px rgba(0,0,0,0.08)",
+                    class_name="card",
                     margin="2rem 0",
                     width="100%",
                     max_width="800px",
@@ -407,11 +378,7 @@ def contact() -> rx.Component:
                                 size="2",
                                 color="#3B82F6",
                                 border_color="#3B82F6",
-                                style={
-                                    "_hover": {
-                                        "background": "rgba(59, 130, 246, 0.1)",
-                                    }
-                                }
+                                class_name="btn-tint",
                             ),
                             href="#"
                         ),
@@ -426,11 +393,7 @@ def contact() -> rx.Component:
                                 size="2",
                                 color="#8B5CF6",
                                 border_color="#8B5CF6",
-                                style={
-                                    "_hover": {
-                                        "background": "rgba(139, 92, 246, 0.1)",
-                                    }
-                                }
+                                class_name="btn-tint",
                             ),
                             href="#"
                         ),
@@ -445,11 +408,7 @@ def contact() -> rx.Component:
                                 size="2",
                                 color="#EC4899",
                                 border_color="#EC4899",
-                                style={
-                                    "_hover": {
-                                        "background": "rgba(236, 72, 153, 0.1)",
-                                    }
-                                }
+                                class_name="btn-tint",
                             ),
                             href="#"
                         ),
@@ -466,47 +425,10 @@ def contact() -> rx.Component:
                 width="100%",
                 align_items="center",
             ),
-            max_width="1200px",
-            margin="0 auto",
-            width="100%",
+            class_name="section-content",
         ),
         
         # Full-width background matching header and gallery
-        background="linear-gradient(135deg, #ffffff 0%, #f8fafc 100%)",
-        width="100vw",
-        min_height="80vh",
-        
-        # Custom CSS animations
-        style={
-            "@keyframes fadeInUp": {
-                "from": {
-                    "opacity": "0",
-                    "transform": "translateY(30px)",
-                },
-                "to": {
-                    "opacity": "1",
-                    "transform": "translateY(0)",
-                },
-            },
-            "@keyframes slideIn": {
-                "from": {
-                    "opacity": "0",
-                    "transform": "scale(0.95)",
-                },
-                "to": {
-                    "opacity": "1",
-                    "transform": "scale(1)",
-                },
-            },
-            "@keyframes float": {
-                "0%, 100%": {
-                    "transform": "translateY(0px)",
-                },
-                "50%": {
-                    "transform": "translateY(-10px)",
-                },
-            },
-        },
-        
+        class_name="section",
         id="contact-section"
     )
\ No newline at end of file
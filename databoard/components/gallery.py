@@ -130,13 +130,7 @@ def gallery() -> rx.Component:
                         "Gallery",
                         size="8",
                         weight="bold",
-                        background="linear-gradient(45deg, #3B82F6, #8B5CF6, #EC4899)",
-                        background_clip="text",
-                        color="transparent",
-                        text_align="center",
-                        style={
-                            "animation": "fadeInUp 1s ease-out",
-                        }
+                        class_name="gradient-text fade-in-up",
                     ),
                     rx.text(
                         "Explore stunning data visualizations and dashboard examples",
@@ -161,9 +155,7 @@ def gallery() -> rx.Component:
                             height="400px",
                             object_fit="cover",
                             border_radius="16px",
-                            style={
-                                "animation": "slideIn 0.5s ease-out",
-                            }
+                            class_name="slide-in",
                         ),
                         
                         # Image overlay with info
@@ -205,42 +197,14 @@ def gallery() -> rx.Component:
                         # Navigation arrows
                         rx.button(
                             rx.icon("chevron-left", size=24),
-                            position="absolute",
                             left="1rem",
-                            top="50%",
-                            transform="translateY(-50%)",
-                            background="rgba(255,255,255,0.9)",
-                            color="#111827",
-                            border_radius="50%",
-                            width="48px",
-                            height="48px",
-                            cursor="pointer",
-                            style={
-                                "_hover": {
-                                    "background": "rgba(255,255,255,1)",
-                                    "transform": "translateY(-50%) scale(1.1)",
-                                }
-                            },
+                            class_name="slider-arrow",
                             on_click=GalleryState.prev_slide,
                         ),
                         rx.button(
                             rx.icon("chevron-right", size=24),
-                            position="absolute",
-                            right="1rem", 
-                            top="50%",
-                            transform="translateY(-50%)",
-                            background="rgba(255,255,255,0.9)",
-                            color="#111827",
-                            border_radius="50%",
-                            width="48px",
-                            height="48px",
-                            cursor="pointer",
-                            style={
-                                "_hover": {
-                                    "background": "rgba(255,255,255,1)",
-                                    "transform": "translateY(-50%) scale(1.1)",
-                                }
-                            },
+                            right="1rem",
+                            class_name="slider-arrow",
                             on_click=GalleryState.next_slide,
                         ),
                         
@@ -316,15 +280,7 @@ def gallery() -> rx.Component:
                         ),
                         size="3",
                         variant="solid",
-                        style={
-                            "background": "linear-gradient(45deg, #3B82F6, #8B5CF6)",
-                            "cursor": "pointer",
-                            "transform": "translateY(0)",
-                            "_hover": {
-                                "transform": "translateY(-2px)",
-                                "box_shadow": "0 10px 25px rgba(59, 130, 246, 0.3)",
-                            }
-                        }
+                        class_name="btn-gradient",
                     ),
                     rx.button(
                         rx.hstack(
@@ -336,14 +292,7 @@ def gallery() -> rx.Component:
                         variant="outline",
                         color="#8B5CF6",
                         border_color="#8B5CF6",
-                        style={
-                            "cursor": "pointer",
-                            "transform": "translateY(0)",
-                            "_hover": {
-                                "transform": "translateY(-2px)",
-                                "background": "rgba(139, 92, 246, 0.1)",
-                            }
-                        }
+                        class_name="btn-lift btn-tint",
                     ),
                     spacing="4",
                     margin_bottom="2rem",
@@ -353,39 +302,10 @@ def gallery() -> rx.Component:
                 width="100%",
                 align_items="center",
             ),
-            max_width="1200px",
-            margin="0 auto",
-            width="100%",
+            class_name="section-content",
         ),
         
         # Full-width background matching header
-        background="linear-gradient(135deg, #ffffff 0%, #f8fafc 100%)",
-        width="100vw",
-        min_height="80vh",
-        
-        # Custom CSS animations
-        style={
-            "@keyframes fadeInUp": {
-                "from": {
-                    "opacity": "0",
-                    "transform": "translateY(30px)",
-                },
-                "to": {
-                    "opacity": "1", 
-                    "transform": "translateY(0)",
-                },
-            },
-            "@keyframes slideIn": {
-                "from": {
-                    "opacity": "0",
-                    "transform": "scale(0.95)",
-                },
-                "to": {
-                    "opacity": "1",
-                    "transform": "scale(1)",
-                },
-            },
-        },
-        
+        class_name="section",
         id="gallery-section"
     )
\ No newline at end of file
@@ -33,13 +33,7 @@ def header() -> rx.Component:
                         "DataBoard",
                         size="9",
                         weight="bold",
-                        background="linear-gradient(45deg, #3B82F6, #8B5CF6, #EC4899)",
-                        background_clip="text",
-                        color="transparent",
-                        text_align="center",
-                        style={
-                            "animation": "fadeInUp 1s ease-out",
-                        }
+                        class_name="gradient-text fade-in-up",
                     ),
                     
                     # Animated subtitle
@@ -49,9 +43,8 @@ def header() -> rx.Component:
                         color="#1e293b",
                         text_align="center",
                         weight="medium",
-                        style={
-                            "animation": "fadeInUp 1s ease-out 0.2s both",
-                        }
+                        class_name="fade-in-up",
+                        animation_delay="0.2s",
                     ),
                     
                     # Animated description that cycles
@@ -62,10 +55,7 @@ def header() -> rx.Component:
                         text_align="center",
                         max_width="600px",
                         line_height="1.6",
-                        style={
-                            "animation": "textGlow 2s ease-in-out infinite alternate",
-                            "transition": "all 0.5s ease-in-out",
-                        }
+                        class_name="text-glow",
                     ),
                     
                     # Call-to-action buttons
@@ -79,16 +69,8 @@ def header() -> rx.Component:
                                 ),
                                 size="3",
                                 variant="solid",
-                                style={
-                                    "background": "linear-gradient(45deg, #3B82F6, #8B5CF6)",
-                                    "animation": "fadeInUp 1s ease-out 0.4s both, pulse 2s infinite",
-                                    "cursor": "pointer",
-                                    "transform": "translateY(0)",
-                                    "_hover": {
-                                        "transform": "translateY(-2px)",
-                                        "box_shadow": "0 10px 25px rgba(59, 130, 246, 0.3)",
-                                    }
-                                },
+                                class_name="btn-gradient",
+                                animation="fadeInUp 1s ease-out 0.4s both, pulse 2s infinite",
                             ),
                             href="/trial"
                         ),
@@ -100,20 +82,12 @@ def header() -> rx.Component:
                             ),
                             size="3",
                             variant="outline",
-                            style={
-                                "animation": "fadeInUp 1s ease-out 0.6s both",
-                                "cursor": "pointer",
-                                "transform": "translateY(0)",
-                                "_hover": {
-                                    "transform": "translateY(-2px)",
-                                    "border_color": "#8B5CF6",
-                                }
-                            }
+                            class_name="btn-lift fade-in-up",
+                            animation_delay="0.6s",
+                            _hover={"border_color": "#8B5CF6"},
                         ),
                         spacing="4",
-                        style={
-                            "margin_top": "2rem",
-                        }
+                        margin_top="2rem",
                     ),
                     
                     spacing="6",
@@ -127,12 +101,8 @@ def header() -> rx.Component:
                     rx.vstack(
                         rx.box(
                             rx.icon("bar-chart-3", size=32, color="#3B82F6"),
-                            padding="1rem",
-                            border_radius="50%",
                             background="rgba(59, 130, 246, 0.1)",
-                            style={
-                                "animation": "float 3s ease-in-out infinite",
-                            }
+                            class_name="icon-bubble float",
                         ),
                         rx.text(
                             "Smart Analytics",
@@ -148,21 +118,17 @@ def header() -> rx.Component:
                         ),
                         spacing="2",
                         align_items="center",
-                        style={
-                            "animation": "fadeInUp 1s ease-out 0.8s both",
-                        }
+                        class_name="fade-in-up",
+                        animation_delay="0.8s",
                     ),
                     
                     # Feature 2
                     rx.vstack(
                         rx.box(
                             rx.icon("zap", size=32, color="#8B5CF6"),
-                            padding="1rem",
-                            border_radius="50%",
                             background="rgba(139, 92, 246, 0.1)",
-                            style={
-                                "animation": "float 3s ease-in-out infinite 0.5s",
-                            }
+                            class_name="icon-bubble float",
+                            animation_delay="0.5s",
                         ),
                         rx.text(
                             "Lightning Fast",
@@ -178,21 +144,17 @@ def header() -> rx.Component:
                         ),
                         spacing="2",
                         align_items="center",
-                        style={
-                            "animation": "fadeInUp 1s ease-out 1s both",
-                        }
+                        class_name="fade-in-up",
+                        animation_delay="1s",
                     ),
                     
                     # Feature 3
                     rx.vstack(
                         rx.box(
                             rx.icon("shield-check", size=32, color="#EC4899"),
-                            padding="1rem",
-                            border_radius="50%",
                             background="rgba(236, 72, 153, 0.1)",
-                            style={
-                                "animation": "float 3s ease-in-out infinite 1s",
-                            }
+                            class_name="icon-bubble float",
+                            animation_delay="1s",
                         ),
                         rx.text(
                             "Secure & Reliable",
@@ -208,9 +170,8 @@ def header() -> rx.Component:
                         ),
                         spacing="2",
                         align_items="center",
-                        style={
-                            "animation": "fadeInUp 1s ease-out 1.2s both",
-                        }
+                        class_name="fade-in-up",
+                        animation_delay="1.2s",
                     ),
                     
                     spacing="8",
@@ -223,57 +184,10 @@ def header() -> rx.Component:
                 width="100%",
                 align_items="center",
             ),
-            max_width="1200px",
-            margin="0 auto",
-            width="100%",
+            class_name="section-content",
         ),
         
         # Full-width white background with gradient
-        background="linear-gradient(135deg, #ffffff 0%, #f8fafc 100%)",
-        width="100vw",  # Use viewport width to ensure full width
-        min_height="80vh",
-        
-        # Add custom CSS animations
-        style={
-            # Keyframe animations
-            "@keyframes fadeInUp": {
-                "from": {
-                    "opacity": "0",
-                    "transform": "translateY(30px)",
-                },
-                "to": {
-                    "opacity": "1",
-                    "transform": "translateY(0)",
-                },
-            },
-            "@keyframes textGlow": {
-                "0%": {
-                    "color": "rgb(107, 114, 128)",
-                },
-                "100%": {
-                    "color": "rgb(79, 70, 229)",
-                },
-            },
-            "@keyframes float": {
-                "0%, 100%": {
-                    "transform": "translateY(0px)",
-                },
-                "50%": {
-                    "transform": "translateY(-10px)",
-                },
-            },
-            "@keyframes pulse": {
-                "0%": {
-                    "box_shadow": "0 0 0 0 rgba(59, 130, 246, 0.7)",
-                },
-                "70%": {
-                    "box_shadow": "0 0 0 10px rgba(59, 130, 246, 0)",
-                },
-                "100%": {
-                    "box_shadow": "0 0 0 0 rgba(59, 130, 246, 0)",
-                },
-            },
-        },
-        
+        class_name="section",
         id="header-section"
     )
\ No newline at end of file
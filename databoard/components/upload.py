@@ -0,0 +1,25 @@
+import reflex as rx
+from reflex.components.component import NoSSRComponent
+from reflex.event import passthrough_event_spec
+
+
+class ChunkedUpload(NoSSRComponent):
+    """Drop zone sending a file to ``/api/uploads`` in resumable chunks.
+
+    Its children are shown inside the drop zone. Once every chunk is on
+    the server the upload ID is passed to ``on_upload``; an upload that
+    fails can be resumed by choosing the same file again.
+    """
+
+    library = "$/public/upload.js"
+
+    tag = "ChunkedUpload"
+
+    label: rx.Var[str]
+
+    on_upload: rx.EventHandler[passthrough_event_spec(str)]
+
+    on_error: rx.EventHandler[passthrough_event_spec(str)]
+
+
+chunked_upload = ChunkedUpload.create
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Callable
+
+import reflex as rx
+
+from ..lazy import lazy_import
+
+pl = lazy_import("polars")
+
+# Minimum seconds between liveness checks of the client behind a job.
+ALIVE_INTERVAL = 1.0
+POLL_INTERVAL = 0.05
+
+
+class Cancelled(Exception):
+    """Raised inside a job once it has been cancelled."""
+
+
+class CancelToken:
+    """Cooperative cancellation flag passed through long-running work.
+
+    Work calls ``check()`` at safe points (per batch, per stage). An
+    optional ``alive`` callback lets the token cancel itself once the
+    client that started the job has gone away or the job was cancelled
+    from another worker.
+    """
+
+    def __init__(self, alive: Callable[[], bool] | None = None):
+        self.job = ""
+        self._event = threading.Event()
+        self._alive = alive
+        self._last_alive_check = time.monotonic()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def check(self):
+        """Raise ``Cancelled`` if the job should stop."""
+        if self._alive is not None and time.monotonic() - self._last_alive_check > ALIVE_INTERVAL:
+            self._last_alive_check = time.monotonic()
+            if not self._alive():
+                self.cancel()
+        if self._event.is_set():
+            raise Cancelled()
+
+
+def check(cancel: CancelToken | None):
+    if cancel is not None:
+        cancel.check()
+
+
+def collect(lf: pl.LazyFrame, cancel: CancelToken | None = None) -> pl.DataFrame:
+    """Collect a query, aborting the Polars engine if the job is cancelled."""
+    if cancel is None:
+        return lf.collect()
+    query = lf.collect(background=True)
+    while (result := query.fetch()) is None:
+        try:
+            cancel.check()
+        except Cancelled:
+            query.cancel()
+            # Wait for the engine to wind down: dropping a running query
+            # makes Polars panic when it tries to deliver the result.
+            try:
+                query.fetch_blocking()
+            except Exception:
+                pass
+            raise
+        time.sleep(POLL_INTERVAL)
+    return result
+
+
+_jobs: dict[str, CancelToken] = {}
+_lock = threading.Lock()
+_KEY = re.compile(r"[\w-]+")
+
+
+def jobs_dir() -> Path:
+    """Markers of running jobs, shared by every worker using the upload dir."""
+    return rx.get_upload_dir() / "jobs"
+
+
+def _marker(key: str) -> Path | None:
+    return jobs_dir() / key if _KEY.fullmatch(key) else None
+
+
+def _owner(marker: Path) -> str | None:
+    try:
+        return marker.read_text()
+    except OSError:
+        return None
+
+
+def start_job(key: str, alive: Callable[[], bool] | None = None) -> CancelToken:
+    """Register a new job for ``key``, cancelling any job it replaces.
+
+    The job is recorded in a marker file as well as in this process, so a
+    ``cancel_jobs`` or a newer job handled by another worker stops it too.
+    """
+    job = uuid.uuid4().hex
+    marker = _marker(key)
+    if marker is not None:
+        marker.parent.mkdir(parents=True, exist_ok=True)
+        tmp = marker.with_name(f".{job}.tmp")
+        tmp.write_text(job)
+        os.replace(tmp, marker)
+
+    def current() -> bool:
+        if marker is not None and _owner(marker) != job:
+            return False
+        return alive is None or alive()
+
+    token = CancelToken(current)
+    token.job = job
+    with _lock:
+        previous = _jobs.get(key)
+        _jobs[key] = token
+    if previous is not None:
+        previous.cancel()
+    return token
+
+
+def finish_job(key: str, token: CancelToken):
+    with _lock:
+        if _jobs.get(key) is token:
+            del _jobs[key]
+    marker = _marker(key)
+    if marker is not None and _owner(marker) == token.job:
+        marker.unlink(missing_ok=True)
+
+
+def cancel_jobs(key: str):
+    """Cancel whatever job is running for ``key``, on any worker."""
+    with _lock:
+        token = _jobs.pop(key, None)
+    if token is not None:
+        token.cancel()
+    marker = _marker(key)
+    if marker is not None:
+        marker.unlink(missing_ok=True)
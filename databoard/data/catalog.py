@@ -0,0 +1,88 @@
+import bisect
+import functools
+from collections import defaultdict
+from dataclasses import dataclass
+
+from .profile import DatasetProfile
+from .store import dataset_path, load_profile
+
+PAGE_SIZE = 20
+
+
+@dataclass
+class CatalogPage:
+    entries: list[dict]
+    total: int
+    page: int
+    pages: int
+
+
+class ColumnCatalog:
+    """Searchable index of a dataset's columns and their statistics.
+
+    Prefix queries use a sorted list of lower-cased names; substring
+    queries use a trigram index, so lookups stay fast on tables with tens
+    of thousands of columns.
+    """
+
+    def __init__(self, profile: DatasetProfile):
+        rows = profile.rows or 1
+        self.entries = [
+            {
+                "name": col.name,
+                "dtype": col.dtype,
+                "null_pct": round(100 * col.null_count / rows, 1),
+                "distinct": col.distinct,
+            }
+            for col in profile.columns
+        ]
+        self.keys = [entry["name"].lower() for entry in self.entries]
+        self.sorted = sorted((key, i) for i, key in enumerate(self.keys))
+        self.trigrams: dict[str, set[int]] = defaultdict(set)
+        for i, key in enumerate(self.keys):
+            for j in range(len(key) - 2):
+                self.trigrams[key[j : j + 3]].add(i)
+
+    def _prefix(self, query: str) -> set[int]:
+        start = bisect.bisect_left(self.sorted, (query, -1))
+        matches = set()
+        for key, i in self.sorted[start:]:
+            if not key.startswith(query):
+                break
+            matches.add(i)
+        return matches
+
+    def _substring(self, query: str) -> set[int]:
+        if len(query) < 3:
+            return {i for i, key in enumerate(self.keys) if query in key}
+        candidates = set.intersection(*(self.trigrams.get(query[j : j + 3], set()) for j in range(len(query) - 2)))
+        return {i for i in candidates if query in self.keys[i]}
+
+    def search(self, query: str = "", page: int = 0, page_size: int = PAGE_SIZE) -> CatalogPage:
+        """One page of columns matching ``query``, prefix matches first.
+
+        Without a query columns are listed in dataset order.
+        """
+        query = query.strip().lower()
+        if query:
+            prefix = self._prefix(query)
+            others = self._substring(query) - prefix
+            order = sorted(prefix) + sorted(others)
+        else:
+            order = range(len(self.entries))
+        total = len(order)
+        pages = max(1, -(-total // page_size))
+        page = min(max(page, 0), pages - 1)
+        window = order[page * page_size : (page + 1) * page_size]
+        return CatalogPage([self.entries[i] for i in window], total, page, pages)
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_catalog(dataset_id: str, version: int) -> ColumnCatalog:
+    return ColumnCatalog(load_profile(dataset_id))
+
+
+def get_catalog(dataset_id: str) -> ColumnCatalog:
+    """The catalog of a dataset, rebuilt only when its profile changes."""
+    version = (dataset_path(dataset_id) / "profile.json").stat().st_mtime_ns
+    return _cached_catalog(dataset_id, version)
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import codecs
+import csv
+import io
+import itertools
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import BinaryIO
+
+# Bytes of a file inspected to detect its encoding and CSV dialect.
+SAMPLE_SIZE = 64 * 1024
+# Records of the sample parsed per candidate delimiter.
+SNIFF_ROWS = 200
+DELIMITERS = (",", ";", "\t", "|")
+
+_BOMS = [
+    (codecs.BOM_UTF32_LE, "utf-32-le"),
+    (codecs.BOM_UTF32_BE, "utf-32-be"),
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+]
+_NUMBER = re.compile(r"[-+]?(\d+([.,]\d*)?|[.,]\d+)([eE][-+]?\d+)?")
+_DECIMAL_COMMA = re.compile(r"[-+]?\d+,\d+")
+_DECIMAL_DOT = re.compile(r"[-+]?\d+\.\d+")
+
+
+@dataclass
+class Dialect:
+    """How a CSV file is encoded and delimited."""
+
+    encoding: str = "utf-8"
+    bom: int = 0
+    separator: str = ","
+    quote_char: str = '"'
+    has_header: bool = True
+    decimal_comma: bool = False
+
+    def read_options(self) -> dict:
+        """Keyword arguments for ``pl.read_csv`` on the UTF-8 text."""
+        return {
+            "separator": self.separator,
+            "quote_char": self.quote_char,
+            "has_header": self.has_header,
+            "decimal_comma": self.decimal_comma,
+            "encoding": "utf8-lossy",
+        }
+
+
+def detect_encoding(sample: bytes) -> tuple[str, int]:
+    """Guess the encoding of a byte sample and the length of its BOM."""
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding, len(bom)
+    if sample:
+        # Mostly ASCII text in UTF-16 has a zero in every other byte.
+        half = max(len(sample) // 2, 1)
+        if sample[1::2].count(0) > 0.3 * half:
+            return "utf-16-le", 0
+        if sample[0::2].count(0) > 0.3 * half:
+            return "utf-16-be", 0
+    try:
+        # Not final: the sample may end inside a multi-byte character.
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8", 0
+    except UnicodeDecodeError:
+        pass
+    try:
+        sample.decode("cp1252")
+        return "cp1252", 0
+    except UnicodeDecodeError:
+        return "latin-1", 0
+
+
+def _rows(text: str, separator: str, quote_char: str) -> list[list[str]]:
+    reader = csv.reader(io.StringIO(text), delimiter=separator, quotechar=quote_char)
+    try:
+        return [row for row in itertools.islice(reader, SNIFF_ROWS) if row]
+    except csv.Error:
+        return []
+
+
+def _consistency(rows: list[list[str]]) -> tuple[float, int]:
+    """Share of rows with the most common field count, and that count."""
+    if not rows:
+        return 0.0, 0
+    width, freq = Counter(len(row) for row in rows).most_common(1)[0]
+    return (freq / len(rows), width) if width > 1 else (0.0, width)
+
+
+def _is_number(value: str) -> bool:
+    return bool(_NUMBER.fullmatch(value.strip()))
+
+
+def _has_header(rows: list[list[str]]) -> bool:
+    """Whether the first row names the columns rather than holding data."""
+    if len(rows) < 2:
+        return True
+    first, rest = rows[0], rows[1:]
+    if len(set(first)) < len(first):
+        return False
+    for i, name in enumerate(first):
+        values = [row[i] for row in rest if i < len(row) and row[i].strip()]
+        if values and all(_is_number(v) for v in values):
+            return not _is_number(name)
+    # No numeric column to tell them apart; numbers in the first row mean data.
+    return not any(_is_number(name) for name in first)
+
+
+def sniff(sample: bytes) -> Dialect:
+    """Detect encoding, delimiter, quoting, header and decimal separator.
+
+    Only the given sample is inspected, so the cost does not depend on the
+    size of the file.
+    """
+    encoding, bom = detect_encoding(sample)
+    text = codecs.getincrementaldecoder(encoding)(errors="replace").decode(sample[bom:], final=False)
+    # Drop the last line, which is likely cut off by the sample boundary.
+    if "\n" in text:
+        text = text[: text.rfind("\n") + 1]
+    quote_char = '"'
+    if '"' not in text and re.search(r"(^|[,;\t|])'", text, re.MULTILINE):
+        quote_char = "'"
+
+    best, separator, rows = (0.0, 0), ",", []
+    for candidate in DELIMITERS:
+        parsed = _rows(text, candidate, quote_char)
+        score = _consistency(parsed)
+        if score > best:
+            best, separator, rows = score, candidate, parsed
+
+    has_header = _has_header(rows)
+    decimal_comma = False
+    if separator != ",":
+        values = [value.strip() for row in rows[1 if has_header else 0:] for value in row]
+        commas = sum(1 for v in values if _DECIMAL_COMMA.fullmatch(v))
+        dots = sum(1 for v in values if _DECIMAL_DOT.fullmatch(v))
+        decimal_comma = commas > dots
+    return Dialect(encoding, bom, separator, quote_char, has_header, decimal_comma)
+
+
+class Utf8Reader:
+    """Read a stream as UTF-8 bytes, transcoding as it goes when needed.
+
+    ``head`` is the sample already read from the start of the stream; it is
+    returned first, without its byte order mark. UTF-8 input is passed
+    through untouched.
+    """
+
+    def __init__(self, stream: BinaryIO, head: bytes, dialect: Dialect):
+        self.stream = stream
+        self.head = head[dialect.bom:]
+        self.decoder = None
+        if codecs.lookup(dialect.encoding).name != "utf-8":
+            self.decoder = codecs.getincrementaldecoder(dialect.encoding)(errors="replace")
+
+    def read(self, size: int = -1) -> bytes:
+        while True:
+            if self.head:
+                data, self.head = self.head, b""
+                if size < 0 or size > len(data):
+                    data += self.stream.read(size - len(data) if size > 0 else -1)
+            else:
+                data = self.stream.read(size)
+            if self.decoder is None:
+                return data
+            text = self.decoder.decode(data, final=not data)
+            # A read that ends mid-character decodes to nothing; keep going.
+            if text or not data:
+                return text.encode()
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+
+from ..lazy import lazy_import
+from .cancel import CancelToken, check, collect
+
+pl = lazy_import("polars")
+
+HASH_SEED = 0xD0B1
+# Hashes are spilled into 2**BUCKET_BITS buckets by their top bits, so
+# counting holds only one bucket in memory at a time.
+BUCKET_BITS = 5
+# Key ID of whole-row hashes; column hashes use the column's position + 1.
+ROW_KEY = 0
+# Integer and string columns of the first batch with at least this share
+# of distinct values are tracked as candidate keys.
+MIN_KEY_RATIO = 0.95
+EXAMPLES = 3
+
+
+@dataclass
+class KeyCandidate:
+    """A column that may identify rows, and how often its values repeat."""
+
+    column: str
+    duplicates: int = 0
+
+    @property
+    def unique(self) -> bool:
+        return self.duplicates == 0
+
+
+@dataclass
+class DuplicateReport:
+    """Exact duplicate rows and candidate key columns of a dataset."""
+
+    rows: int = 0
+    duplicate_rows: int = 0
+    # The most repeated rows as ``{"values": {column: text}, "count": n,
+    # "hash": row hash}``; the hash lets appends update their counts.
+    examples: list[dict] = field(default_factory=list)
+    keys: list[KeyCandidate] = field(default_factory=list)
+
+    @property
+    def key_columns(self) -> list[str]:
+        return [key.column for key in self.keys]
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DuplicateReport":
+        data = dict(data)
+        data["keys"] = [KeyCandidate(**key) for key in data["keys"]]
+        return cls(**data)
+
+
+def row_hash() -> pl.Expr:
+    """64-bit hash of every column of a row."""
+    return pl.struct(pl.all()).hash(HASH_SEED)
+
+
+def candidate_keys(batch: pl.DataFrame) -> list[str]:
+    """Columns of a batch that are complete and (nearly) unique."""
+    names = [name for name, dtype in batch.schema.items() if dtype.is_integer() or dtype == pl.String]
+    if batch.height < 2 or not names:
+        return []
+    stats = batch.select(
+        [pl.col(name).null_count().alias(f"{name}:nulls") for name in names]
+        + [pl.col(name).n_unique().alias(f"{name}:distinct") for name in names]
+    ).row(0, named=True)
+    return [
+        name for name in names
+        if not stats[f"{name}:nulls"] and stats[f"{name}:distinct"] >= MIN_KEY_RATIO * batch.height
+    ]
+
+
+class KeyHasher:
+    """Hash the rows and candidate key columns of each batch.
+
+    Candidate keys are picked from the first batch and dropped as soon as
+    a later batch has nulls in them. ``update`` returns the hashes as
+    ``key``/``hash`` frames split into buckets, ready to be spilled to disk.
+    """
+
+    def __init__(self, keys: list[str] | None = None):
+        self.keys = keys
+
+    def update(self, batch: pl.DataFrame) -> dict[int, pl.DataFrame]:
+        if self.keys is None:
+            self.keys = candidate_keys(batch)
+        elif self.keys:
+            nulls = batch.select(pl.col(self.keys).null_count()).row(0)
+            self.keys = [key for key, n in zip(self.keys, nulls) if not n]
+
+        hashes = [(ROW_KEY, row_hash())]
+        hashes += [(batch.columns.index(key) + 1, pl.col(key).hash(HASH_SEED)) for key in self.keys]
+        long = pl.concat([
+            batch.select(pl.lit(key, dtype=pl.UInt16).alias("key"), expr.alias("hash"))
+            for key, expr in hashes
+        ])
+        top_bits = pl.col("hash") // pl.lit(1 << (64 - BUCKET_BITS), dtype=pl.UInt64)
+        buckets = long.with_columns(top_bits.cast(pl.UInt8).alias("bucket"))
+        return {b: frame for (b,), frame in buckets.partition_by("bucket", as_dict=True, include_key=False).items()}
+
+
+def _examples(found: pl.DataFrame) -> list[dict]:
+    """Report examples from rows with their ``__hash`` and ``__count``."""
+    examples = []
+    for row in found.iter_rows(named=True):
+        count, row_hash = row.pop("__count"), row.pop("__hash")
+        values = {name: "" if value is None else str(value) for name, value in row.items()}
+        examples.append({"values": values, "count": count, "hash": row_hash})
+    return examples
+
+
+def find_duplicates(
+    buckets: list[pl.LazyFrame],
+    lf: pl.LazyFrame,
+    keys: list[str],
+    rows: int,
+    cancel: CancelToken | None = None,
+) -> DuplicateReport:
+    """Count repeated rows and key values from spilled hash buckets.
+
+    Each bucket is grouped on its own, so memory is bounded by the largest
+    bucket rather than the dataset. Only when duplicates exist is the
+    dataset scanned again, to fetch the rows behind the most common ones.
+    """
+    columns = lf.collect_schema().names()
+    ids = {ROW_KEY: None} | {columns.index(key) + 1: key for key in keys}
+    extra = dict.fromkeys(ids, 0)
+    top = []
+    for bucket in buckets:
+        check(cancel)
+        counts = collect(
+            bucket.filter(pl.col("key").is_in(list(ids)))
+            .group_by("key", "hash")
+            .len()
+            .filter(pl.col("len") > 1),
+            cancel,
+        )
+        for key, n in counts.group_by("key").agg((pl.col("len") - 1).sum()).iter_rows():
+            extra[key] += n
+        top.append(counts.filter(pl.col("key") == ROW_KEY).top_k(EXAMPLES, by="len").select("hash", pl.col("len").alias("__count")))
+
+    examples = []
+    top = pl.concat(top).top_k(EXAMPLES, by="__count") if top else pl.DataFrame()
+    if top.height:
+        found = collect(
+            lf.with_columns(row_hash().alias("__hash"))
+            .filter(pl.col("__hash").is_in(top["hash"].implode()))
+            .unique("__hash", keep="any"),
+            cancel,
+        )
+        found = found.join(top, left_on="__hash", right_on="hash").sort("__count", descending=True)
+        examples = _examples(found)
+
+    return DuplicateReport(
+        rows=rows,
+        duplicate_rows=extra[ROW_KEY],
+        examples=examples,
+        keys=[KeyCandidate(ids[key], extra[key]) for key in ids if key != ROW_KEY],
+    )
+
+
+def update_duplicates(
+    report: DuplicateReport,
+    old: dict[int, pl.LazyFrame],
+    new: dict[int, pl.LazyFrame],
+    appended: pl.LazyFrame,
+    keys: list[str],
+    rows: int,
+    cancel: CancelToken | None = None,
+) -> DuplicateReport:
+    """Fold the spilled hashes of appended rows into a dataset's report.
+
+    ``old`` and ``new`` hold the stored and the appended hashes by bucket.
+    Only the buckets the new hashes land in are read, and only the stored
+    hashes matching a new one are counted, so the cost follows the append
+    rather than the whole dataset. Every row that repeats more often now
+    has a copy among the ``appended`` rows, which is where examples are
+    fetched from.
+    """
+    columns = appended.collect_schema().names()
+    ids = {ROW_KEY: None} | {columns.index(key) + 1: key for key in keys}
+    extra = {ROW_KEY: report.duplicate_rows} | {columns.index(k.column) + 1: k.duplicates for k in report.keys if k.column in keys}
+    known = pl.Series([example["hash"] for example in report.examples], dtype=pl.UInt64)
+    top = []
+    for bucket, frame in new.items():
+        check(cancel)
+        added = collect(frame.filter(pl.col("key").is_in(list(ids))).group_by("key", "hash").len("added"), cancel)
+        counts = added.with_columns(before=pl.lit(0, dtype=pl.UInt32))
+        if bucket in old:
+            before = collect(
+                old[bucket].join(added.lazy().select("key", "hash"), on=["key", "hash"], how="semi").group_by("key", "hash").len("before"),
+                cancel,
+            )
+            counts = added.join(before, on=["key", "hash"], how="left").with_columns(pl.col("before").fill_null(0))
+        # Each new copy of a value seen before is a repeat; a new value
+        # repeats with every copy but its first.
+        repeats = counts.group_by("key").agg((pl.col("added").cast(pl.Int64) - (pl.col("before") == 0).cast(pl.Int64)).sum())
+        for key, n in repeats.iter_rows():
+            extra[key] = extra.get(key, 0) + n
+        rows_repeated = counts.filter(pl.col("key") == ROW_KEY).select(
+            "hash", (pl.col("added") + pl.col("before")).cast(pl.Int64).alias("__count")
+        )
+        top.append(rows_repeated.filter(pl.col("__count") > 1).top_k(EXAMPLES, by="__count"))
+        top.append(rows_repeated.filter(pl.col("hash").is_in(known.implode())))
+
+    counts = {example["hash"]: example["count"] for example in report.examples}
+    if top:
+        counts |= dict(pl.concat(top).iter_rows())
+    best = sorted(counts.items(), key=lambda item: item[1], reverse=True)[:EXAMPLES]
+    examples = {example["hash"]: example for example in report.examples}
+    missing = [row_hash for row_hash, _ in best if row_hash not in examples]
+    if missing:
+        found = collect(
+            appended.with_columns(row_hash().alias("__hash"))
+            .filter(pl.col("__hash").is_in(pl.Series(missing, dtype=pl.UInt64).implode()))
+            .unique("__hash", keep="any")
+            .with_columns(__count=pl.lit(0, dtype=pl.Int64)),
+            cancel,
+        )
+        examples |= {example["hash"]: example for example in _examples(found)}
+
+    return DuplicateReport(
+        rows=rows,
+        duplicate_rows=extra[ROW_KEY],
+        examples=[{**examples[row_hash], "count": count} for row_hash, count in best],
+        keys=[KeyCandidate(ids[key], extra.get(key, 0)) for key in ids if key != ROW_KEY],
+    )
@@ -0,0 +1,363 @@
+from __future__ import annotations
+
+import bz2
+import contextlib
+import gzip
+import io
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+from ..analysis.timeseries import RollupBuilder, coarsen, merge_daily
+from ..lazy import lazy_import
+from .cancel import CancelToken, Cancelled, check
+from .dialect import SAMPLE_SIZE, Utf8Reader, sniff
+from .duplicates import DuplicateReport, KeyHasher, find_duplicates, update_duplicates
+from .profile import DatasetProfile, Profiler
+from .quality import ParseCounts
+from .store import (
+    DatasetWriter,
+    dataset_lock,
+    dataset_schema,
+    delete_dataset,
+    hash_bucket_files,
+    hash_buckets,
+    load_duplicates,
+    load_profile,
+    load_quality,
+    load_rollup,
+    load_timeseries_info,
+    new_dataset_id,
+    save_duplicates,
+    save_preview,
+    save_profile,
+    save_quality,
+    save_rollups,
+    scan_dataset,
+)
+
+pl = lazy_import("polars")
+
+# Decompressed bytes parsed per batch; bounds peak memory for large uploads.
+CHUNK_SIZE = 64 * 1024 * 1024
+
+COMPRESSED_SUFFIXES = {".gz": "gzip", ".gzip": "gzip", ".bz2": "bz2", ".zst": "zstd", ".zstd": "zstd", ".zip": "zip"}
+EXCEL_SUFFIXES = {".xlsx", ".xls"}
+
+_MAGIC = [
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+    (b"PK\x03\x04", "zip"),
+]
+
+
+class IngestError(Exception):
+    """Raised when an uploaded file cannot be read."""
+
+
+def detect_compression(head: bytes) -> str | None:
+    """Detect the compression format from the first bytes of a file."""
+    for magic, kind in _MAGIC:
+        if head.startswith(magic):
+            return kind
+    return None
+
+
+def logical_name(file_name: str) -> str:
+    """Strip compression suffixes, e.g. ``sales.csv.gz`` -> ``sales.csv``."""
+    path = Path(file_name)
+    while path.suffix.lower() in COMPRESSED_SUFFIXES:
+        path = path.with_suffix("")
+    return path.name
+
+
+@contextlib.contextmanager
+def open_decompressed(path: Path) -> Iterator[tuple[BinaryIO, str]]:
+    """Open a file as a decompressed byte stream.
+
+    Yields the stream and the logical name of its contents. Nothing is
+    written to disk; data is decompressed as it is read.
+    """
+    with open(path, "rb") as raw:
+        kind = detect_compression(raw.read(4))
+        raw.seek(0)
+        if Path(path.name).suffix.lower() in EXCEL_SUFFIXES:
+            # Workbooks are zip containers themselves; hand them over as-is.
+            kind = None
+        if kind is None:
+            yield raw, logical_name(path.name)
+        elif kind == "gzip":
+            with gzip.GzipFile(fileobj=raw) as stream:
+                yield stream, logical_name(path.name)
+        elif kind == "bz2":
+            with bz2.BZ2File(raw) as stream:
+                yield stream, logical_name(path.name)
+        elif kind == "zstd":
+            try:
+                import zstandard
+            except ImportError as e:
+                raise IngestError("Reading .zst files requires the 'zstandard' package") from e
+            with zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True) as stream:
+                yield stream, logical_name(path.name)
+        else:
+            with zipfile.ZipFile(raw) as archive:
+                members = [info for info in archive.infolist() if not info.is_dir()]
+                if not members:
+                    raise IngestError("Zip archive is empty")
+                with archive.open(members[0]) as stream:
+                    yield stream, members[0].filename.rsplit("/", 1)[-1]
+
+
+def _split_point(buf: bytes, quote: bytes = b'"') -> int:
+    """Return the offset just past the last newline that is outside quotes."""
+    end = buf.rfind(b"\n")
+    if end == -1:
+        return -1
+    quotes = buf.count(quote, 0, end)
+    while quotes % 2:
+        prev = buf.rfind(b"\n", 0, end)
+        if prev == -1:
+            return -1
+        quotes -= buf.count(quote, prev, end)
+        end = prev
+    return end + 1
+
+
+def _header_end(buf: bytes, quote: bytes = b'"') -> int:
+    """Return the offset just past the first record, which may span lines."""
+    end = buf.find(b"\n")
+    while end != -1 and buf.count(quote, 0, end) % 2:
+        end = buf.find(b"\n", end + 1)
+    return len(buf) if end == -1 else end + 1
+
+
+def _read_records(stream: BinaryIO, chunk_size: int, quote: bytes = b'"') -> Iterator[bytes]:
+    """Yield blocks of whole CSV records from a byte stream."""
+    carry = b""
+    while True:
+        data = stream.read(chunk_size)
+        if not data:
+            break
+        buf = carry + data
+        cut = _split_point(buf, quote)
+        if cut == -1:
+            carry = buf
+            continue
+        yield buf[:cut]
+        carry = buf[cut:]
+    if carry.strip():
+        yield carry if carry.endswith(b"\n") else carry + b"\n"
+
+
+def parse_counts(data: bytes, batch: pl.DataFrame, options: dict) -> ParseCounts:
+    """Count the blank and unparseable values behind the nulls of a typed batch.
+
+    Only typed columns that came out with nulls are read again, as text, so
+    clean batches cost nothing extra. ``options`` are the reader options
+    the batch was parsed with.
+    """
+    nulls = batch.select(pl.all().null_count()).row(0, named=True)
+    columns = [name for name, dtype in batch.schema.items() if dtype != pl.String and nulls[name]]
+    if not columns:
+        return {}
+    positions = [batch.columns.index(name) for name in columns]
+    # Blank fields read as "" so only fields missing from short rows are null.
+    raw = pl.read_csv(
+        data,
+        columns=positions,
+        new_columns=columns,
+        infer_schema=False,
+        ignore_errors=True,
+        missing_utf8_is_empty_string=True,
+        **options,
+    )
+    counts = raw.select(
+        [pl.col(name).null_count().alias(f"{name}:missing") for name in columns]
+        + [(pl.col(name).str.strip_chars() == "").sum().alias(f"{name}:empty") for name in columns]
+    ).row(0, named=True)
+    parsed = {}
+    for name in columns:
+        empty = counts[f"{name}:empty"]
+        parsed[name] = (empty, nulls[name] - counts[f"{name}:missing"] - empty)
+    return parsed
+
+
+def iter_csv_batches(stream: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[tuple[pl.DataFrame, ParseCounts]]:
+    """Parse a CSV byte stream into DataFrames of roughly ``chunk_size`` bytes.
+
+    The encoding and dialect are sniffed from the first ``SAMPLE_SIZE``
+    bytes; other encodings are transcoded to UTF-8 as the stream is read.
+    The schema is inferred from the first batch and reused for the rest, so
+    every batch has the same columns and dtypes. Values of later batches
+    that do not fit the schema become nulls and are counted as such.
+    """
+    sample = stream.read(SAMPLE_SIZE)
+    dialect = sniff(sample)
+    options = dialect.read_options()
+    quote = dialect.quote_char.encode()
+    records = _read_records(Utf8Reader(stream, sample, dialect), chunk_size, quote)
+    first = next(records, b"")
+    if not first:
+        return
+    header = first[: _header_end(first, quote)] if dialect.has_header else b""
+    batch = pl.read_csv(first, infer_schema_length=10000, try_parse_dates=True, **options)
+    schema = batch.schema
+    yield batch, parse_counts(first, batch, options)
+    for block in records:
+        data = header + block
+        batch = pl.read_csv(data, schema=schema, ignore_errors=True, **options)
+        yield batch, parse_counts(data, batch, options)
+
+
+def iter_batches(stream: BinaryIO, name: str) -> Iterator[tuple[pl.DataFrame, ParseCounts]]:
+    """Yield DataFrames from a decompressed stream based on its logical name.
+
+    Each batch comes with the counts of values that failed to parse.
+    """
+    if Path(name).suffix.lower() in EXCEL_SUFFIXES:
+        # Excel workbooks are not line-oriented and are read in one piece.
+        yield pl.read_excel(io.BytesIO(stream.read())), {}
+        return
+    yield from iter_csv_batches(stream)
+
+
+def _conform(batch: pl.DataFrame, schema: pl.Schema, parsed: ParseCounts) -> tuple[pl.DataFrame, ParseCounts]:
+    """Cast a batch to an existing dataset schema, checking the columns match.
+
+    Values the cast cannot convert are added to the batch's invalid counts.
+    """
+    if batch.columns != schema.names():
+        raise IngestError("Columns do not match the existing dataset")
+    cast = batch.cast(dict(schema), strict=False)
+    changed = [name for name in schema.names() if batch.schema[name] != schema[name]]
+    if not changed:
+        return cast, parsed
+    before = batch.select(pl.col(changed).null_count()).row(0)
+    after = cast.select(pl.col(changed).null_count()).row(0)
+    parsed = dict(parsed)
+    for name, old, new in zip(changed, before, after):
+        empty, invalid = parsed.get(name, (0, 0))
+        parsed[name] = (empty, invalid + new - old)
+    return cast, parsed
+
+
+def _save_duplicates(dataset_id: str, hasher: KeyHasher, profile: DatasetProfile, cancel: CancelToken | None):
+    lf = scan_dataset(dataset_id)
+    report = find_duplicates(hash_buckets(dataset_id), lf, hasher.keys or [], profile.rows, cancel)
+    save_duplicates(dataset_id, report)
+
+
+def _append_duplicates(
+    dataset_id: str,
+    hasher: KeyHasher,
+    report: DuplicateReport,
+    profile: DatasetProfile,
+    written: list[Path],
+):
+    """Update the duplicate report with the files an append just wrote."""
+    if not all("hash" in example for example in report.examples):
+        # Reports saved before examples kept their hashes are recounted once.
+        _save_duplicates(dataset_id, hasher, profile, None)
+        return
+    new_files = set(written)
+    old, new = {}, {}
+    for bucket, files in hash_bucket_files(dataset_id).items():
+        stored = [path for path in files if path not in new_files]
+        appended = [path for path in files if path in new_files]
+        if appended:
+            new[bucket] = pl.scan_ipc(appended, memory_map=True)
+            if stored:
+                old[bucket] = pl.scan_ipc(stored, memory_map=True)
+    parts = [path for path in written if path.suffix == ".parquet"]
+    appended = pl.scan_parquet(parts, hive_partitioning=False)
+    report = update_duplicates(report, old, new, appended, hasher.keys or [], profile.rows)
+    save_duplicates(dataset_id, report)
+
+
+def ingest_upload(path: Path, cancel: CancelToken | None = None) -> tuple[str, DatasetProfile]:
+    """Stream an uploaded file into a new columnar dataset and profile it.
+
+    Returns the new dataset ID and the profile of its contents. If the job
+    is cancelled or fails the partial dataset is removed.
+    """
+    dataset_id = new_dataset_id()
+    profiler = Profiler()
+    rollups = RollupBuilder()
+    hasher = KeyHasher()
+    try:
+        with open_decompressed(path) as (stream, name), DatasetWriter(dataset_id) as writer:
+            for i, (batch, parsed) in enumerate(iter_batches(stream, name)):
+                check(cancel)
+                profiler.update(batch, parsed)
+                rollups.update(batch)
+                writer.write(batch)
+                writer.write_hashes(hasher.update(batch))
+                if i == 0:
+                    save_preview(dataset_id, batch)
+    except (OSError, EOFError, zipfile.BadZipFile, pl.exceptions.PolarsError) as e:
+        raise IngestError(f"Could not read {path.name}: {e}") from e
+    try:
+        if not profiler.rows:
+            raise IngestError("The file has no data rows")
+        profile = profiler.result(size_bytes=path.stat().st_size)
+        save_profile(dataset_id, profile)
+        save_quality(dataset_id, profiler.quality)
+        daily = rollups.daily()
+        if daily is not None:
+            save_rollups(dataset_id, rollups.info, coarsen(daily, rollups.info.measures, rollups.info.levels))
+        _save_duplicates(dataset_id, hasher, profile, cancel)
+    except BaseException:
+        # Nobody owns the dataset yet, so a half-written one would only
+        # count against the disk quota until the next sweep.
+        delete_dataset(dataset_id)
+        raise
+    return dataset_id, profile
+
+
+def append_upload(path: Path, dataset_id: str, cancel: CancelToken | None = None) -> tuple[DatasetProfile, DatasetProfile]:
+    """Stream an uploaded file onto the end of an existing dataset.
+
+    Only the new file is read. Its profile is merged into the stored one,
+    so the cost scales with the size of the delta rather than the dataset.
+    Returns the merged profile and the profile of the appended rows.
+    """
+    # Appends to one dataset may arrive on different workers at once.
+    with dataset_lock(dataset_id):
+        quality = load_quality(dataset_id)
+        profiler = Profiler(quality)
+        try:
+            schema = dataset_schema(dataset_id)
+            profile = load_profile(dataset_id, sketches=True)
+            info = load_timeseries_info(dataset_id)
+            rollups = RollupBuilder(info)
+            report = load_duplicates(dataset_id)
+            hasher = KeyHasher(report.key_columns) if report is not None else None
+            writer = DatasetWriter(dataset_id, append=True)
+            with open_decompressed(path) as (stream, name), writer:
+                for batch, parsed in iter_batches(stream, name):
+                    check(cancel)
+                    batch, parsed = _conform(batch, schema, parsed)
+                    profiler.update(batch, parsed)
+                    if info is not None:
+                        rollups.update(batch)
+                    writer.write(batch)
+                    if hasher is not None:
+                        writer.write_hashes(hasher.update(batch))
+        except (OSError, EOFError, zipfile.BadZipFile, pl.exceptions.PolarsError) as e:
+            raise IngestError(f"Could not read {path.name}: {e}") from e
+        delta = profiler.result(size_bytes=path.stat().st_size)
+        if delta.rows:
+            profile.merge(delta)
+            save_profile(dataset_id, profile)
+            if quality is not None:
+                save_quality(dataset_id, profiler.quality)
+        daily = rollups.daily()
+        if daily is not None:
+            # Only the delta's days are new; fold them into the cached rollups.
+            daily = merge_daily([load_rollup(dataset_id, "day"), daily], info.measures)
+            save_rollups(dataset_id, info, coarsen(daily, info.measures, info.levels))
+        if hasher is not None and delta.rows:
+            # The rows are already stored; finish rather than leave a stale report.
+            _append_duplicates(dataset_id, hasher, report, profile, writer.written)
+    return profile, delta
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field, fields
+from datetime import date, datetime, time, timedelta
+from typing import Any
+
+from ..lazy import lazy_import
+from .quality import ColumnQuality, DataQuality, ParseCounts, numeric_text_exprs
+from .sketch import HyperLogLog
+
+pl = lazy_import("polars")
+
+
+@dataclass
+class ColumnProfile:
+    """Summary statistics for a single column."""
+
+    name: str
+    dtype: str
+    count: int = 0
+    null_count: int = 0
+    min: Any = None
+    max: Any = None
+    sum: float | None = None
+    sum_sq: float | None = None
+    # Only loaded when the profile is to be merged; see ``load_profile``.
+    sketch: HyperLogLog | None = field(default_factory=HyperLogLog, repr=False)
+    # Estimate from the sketch when the profile was saved.
+    distinct_estimate: int = 0
+
+    @property
+    def mean(self) -> float | None:
+        if self.sum is None or not self.count:
+            return None
+        return self.sum / self.count
+
+    @property
+    def std(self) -> float | None:
+        if self.sum is None or self.sum_sq is None or self.count < 2:
+            return None
+        variance = (self.sum_sq - self.sum * self.sum / self.count) / (self.count - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    @property
+    def distinct(self) -> int:
+        """Approximate number of distinct non-null values."""
+        return self.sketch.estimate() if self.sketch is not None else self.distinct_estimate
+
+    def merge(self, other: "ColumnProfile"):
+        """Fold the statistics of another batch of the same column into this one."""
+        if self.sketch is None or other.sketch is None:
+            raise ValueError(f"Cannot merge profiles of {self.name} loaded without their sketches")
+        self.count += other.count
+        self.null_count += other.null_count
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+        if other.sum is not None:
+            self.sum = (self.sum or 0.0) + other.sum
+        if other.sum_sq is not None:
+            self.sum_sq = (self.sum_sq or 0.0) + other.sum_sq
+        self.sketch.merge(other.sketch)
+
+    def to_dict(self) -> dict:
+        data = {f.name: getattr(self, f.name) for f in fields(self) if f.name != "sketch"}
+        data["min"] = _encode(self.min)
+        data["max"] = _encode(self.max)
+        data["distinct_estimate"] = self.distinct
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ColumnProfile":
+        data = dict(data)
+        data["min"] = _decode(data["min"], data["dtype"])
+        data["max"] = _decode(data["max"], data["dtype"])
+        # Profiles saved before sketches moved to their own file carry them inline.
+        data["sketch"] = HyperLogLog.from_str(data["sketch"]) if "sketch" in data else None
+        return cls(**data)
+
+
+@dataclass
+class DatasetProfile:
+    """Summary statistics for a whole dataset."""
+
+    rows: int = 0
+    size_bytes: int = 0
+    columns: list[ColumnProfile] = field(default_factory=list)
+
+    @property
+    def column_names(self) -> list[str]:
+        return [col.name for col in self.columns]
+
+    def merge(self, other: "DatasetProfile"):
+        """Fold the profile of newly appended rows into this one."""
+        if other.column_names != self.column_names:
+            raise ValueError("Cannot merge profiles with different columns")
+        self.rows += other.rows
+        self.size_bytes += other.size_bytes
+        for col, new in zip(self.columns, other.columns):
+            col.merge(new)
+
+    def to_dict(self) -> dict:
+        return {
+            "rows": self.rows,
+            "size_bytes": self.size_bytes,
+            "columns": [col.to_dict() for col in self.columns],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DatasetProfile":
+        return cls(
+            rows=data["rows"],
+            size_bytes=data["size_bytes"],
+            columns=[ColumnProfile.from_dict(col) for col in data["columns"]],
+        )
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    if isinstance(value, timedelta):
+        # Whole microseconds, the finest unit Python keeps.
+        return value // timedelta(microseconds=1)
+    return value
+
+
+def _decode(value: Any, dtype: str) -> Any:
+    if value is None:
+        return None
+    if dtype.startswith("Datetime"):
+        return datetime.fromisoformat(value)
+    if dtype == "Date":
+        return date.fromisoformat(value)
+    if dtype == "Time":
+        return time.fromisoformat(value)
+    if dtype.startswith("Duration"):
+        return timedelta(microseconds=value)
+    return value
+
+
+def _has_order(dtype: pl.DataType) -> bool:
+    return dtype.is_numeric() or dtype.is_temporal() or dtype == pl.String or dtype == pl.Boolean
+
+
+class Profiler:
+    """Incrementally profile a dataset one batch at a time.
+
+    Each batch is reduced with a single ``select`` so every column is
+    summarised in one pass over the batch. The data quality report is built
+    in the same pass; pass the stored report as ``quality`` to extend it
+    when appending.
+    """
+
+    def __init__(self, quality: DataQuality | None = None):
+        self.rows = 0
+        self.columns: dict[str, ColumnProfile] = {}
+        self.quality = quality or DataQuality()
+
+    def update(self, batch: pl.DataFrame, parsed: ParseCounts | None = None):
+        """Fold a batch of rows into the running profile.
+
+        ``parsed`` holds the blank and unparseable values the reader turned
+        into nulls, which the batch itself can no longer tell apart.
+        """
+        if not self.columns:
+            self.columns = {name: ColumnProfile(name, str(dtype)) for name, dtype in batch.schema.items()}
+        if not self.quality.columns:
+            self.quality.columns = [ColumnQuality(name) for name in batch.columns]
+        self.rows += batch.height
+        parsed = parsed or {}
+
+        exprs = numeric_text_exprs(batch.schema)
+        for name, dtype in batch.schema.items():
+            col = pl.col(name)
+            exprs.append(col.null_count().alias(f"{name}:nulls"))
+            if _has_order(dtype):
+                exprs.append(col.min().alias(f"{name}:min"))
+                exprs.append(col.max().alias(f"{name}:max"))
+            if dtype.is_numeric():
+                as_float = col.cast(pl.Float64)
+                exprs.append(as_float.sum().alias(f"{name}:sum"))
+                exprs.append((as_float * as_float).sum().alias(f"{name}:sum_sq"))
+        stats = batch.select(exprs).row(0, named=True)
+
+        for name, profile in self.columns.items():
+            nulls = stats[f"{name}:nulls"]
+            delta = ColumnProfile(
+                name,
+                profile.dtype,
+                count=batch.height - nulls,
+                null_count=nulls,
+                min=stats.get(f"{name}:min"),
+                max=stats.get(f"{name}:max"),
+                sum=stats.get(f"{name}:sum"),
+                sum_sq=stats.get(f"{name}:sum_sq"),
+            )
+            delta.sketch.update(batch[name])
+            profile.merge(delta)
+
+        missing = self.quality.add_blocks(batch)
+        for quality in self.quality.columns:
+            name = quality.name
+            nulls = stats[f"{name}:nulls"]
+            if f"{name}:numeric_text" in stats:
+                # Text columns: blanks are values, the reader dropped nothing.
+                delta = ColumnQuality(
+                    name,
+                    nulls=nulls,
+                    empty=missing[name] - nulls,
+                    text=batch.height - missing[name],
+                    numeric_text=stats[f"{name}:numeric_text"],
+                )
+            else:
+                empty, invalid = parsed.get(name, (0, 0))
+                delta = ColumnQuality(name, nulls=nulls - empty - invalid, empty=empty, invalid=invalid)
+            quality.merge(delta)
+
+    def result(self, size_bytes: int = 0) -> DatasetProfile:
+        """Return the profile of everything seen so far."""
+        return DatasetProfile(rows=self.rows, size_bytes=size_bytes, columns=list(self.columns.values()))
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field, fields
+
+from ..lazy import lazy_import
+
+pl = lazy_import("polars")
+
+# Rows per block of the missingness matrix; doubled whenever the matrix
+# grows past MAX_BLOCKS, so it stays small however long the dataset gets.
+BLOCK_ROWS = 1024
+MAX_BLOCKS = 64
+# A text column is treated as numeric with stray text once this share of
+# its values parse as numbers.
+NUMERIC_SHARE = 0.8
+
+# Parser counts per column: (whitespace-only values, unparseable values).
+ParseCounts = dict[str, tuple[int, int]]
+
+
+@dataclass
+class ColumnQuality:
+    """Problem value counts for a single column."""
+
+    name: str
+    nulls: int = 0
+    empty: int = 0
+    invalid: int = 0
+    # Non-empty values of a text column, and how many of them are numbers.
+    text: int = 0
+    numeric_text: int = 0
+
+    @property
+    def mismatched(self) -> int:
+        """Values of the minority type in a mostly numeric text column."""
+        if self.text and self.numeric_text >= NUMERIC_SHARE * self.text:
+            return self.text - self.numeric_text
+        return 0
+
+    def merge(self, other: "ColumnQuality"):
+        for f in fields(self)[1:]:
+            setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+
+
+@dataclass
+class DataQuality:
+    """Data quality report of a whole dataset.
+
+    ``blocks`` is the missingness matrix: one ``[rows, missing per column...]``
+    list per block of ``block_rows`` consecutive rows.
+    """
+
+    columns: list[ColumnQuality] = field(default_factory=list)
+    block_rows: int = BLOCK_ROWS
+    blocks: list[list[int]] = field(default_factory=list)
+
+    @property
+    def rows(self) -> int:
+        return sum(block[0] for block in self.blocks)
+
+    def add_blocks(self, batch: pl.DataFrame) -> dict[str, int]:
+        """Fold the missing values of a batch into the block matrix.
+
+        Returns the number of missing values of each column in the batch.
+        """
+        last = self.blocks[-1] if self.blocks else None
+        offset = last[0] if last is not None and last[0] < self.block_rows else 0
+        counts = (
+            batch.with_row_index("__row")
+            .group_by((pl.col("__row") + offset) // self.block_rows)
+            .agg(pl.len().alias("__rows"), *missing_counts(batch.schema))
+            .sort("__row")
+            .drop("__row")
+        )
+        totals = counts.drop("__rows").sum().row(0, named=True)
+        rows = [list(row) for row in counts.iter_rows()]
+        if offset and rows:
+            first = rows.pop(0)
+            self.blocks[-1] = [a + b for a, b in zip(last, first)]
+        self.blocks.extend(rows)
+        while len(self.blocks) > MAX_BLOCKS:
+            self.block_rows *= 2
+            pairs = zip(self.blocks[::2], self.blocks[1::2] + [None])
+            self.blocks = [a if b is None else [x + y for x, y in zip(a, b)] for a, b in pairs]
+        return totals
+
+    def to_dict(self) -> dict:
+        return {
+            "columns": [vars(col) for col in self.columns],
+            "block_rows": self.block_rows,
+            "blocks": self.blocks,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DataQuality":
+        return cls(
+            columns=[ColumnQuality(**col) for col in data["columns"]],
+            block_rows=data["block_rows"],
+            blocks=data["blocks"],
+        )
+
+
+def missing_counts(schema: pl.Schema) -> list[pl.Expr]:
+    """Null values of each column, plus blank ones for text."""
+    exprs = []
+    for name, dtype in schema.items():
+        missing = pl.col(name).is_null()
+        if dtype == pl.String:
+            missing = missing | (pl.col(name).str.strip_chars() == "")
+        exprs.append(missing.sum().alias(name))
+    return exprs
+
+
+def numeric_text_exprs(schema: pl.Schema) -> list[pl.Expr]:
+    """Values of each text column that parse as numbers."""
+    return [
+        pl.col(name).cast(pl.Float64, strict=False).is_not_null().sum().alias(f"{name}:numeric_text")
+        for name, dtype in schema.items()
+        if dtype == pl.String
+    ]
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field
+
+from ..lazy import lazy_import
+
+pl = lazy_import("polars")
+
+MAX_ROWS = 100_000
+
+logger = logging.getLogger(__name__)
+
+
+class QueryError(Exception):
+    """Raised when a query spec does not fit the dataset."""
+
+
+class Filter(BaseModel):
+    column: str
+    op: Literal["==", "!=", "<", "<=", ">", ">=", "in", "not_in", "is_null", "not_null"]
+    value: Any = None
+
+
+class Aggregate(BaseModel):
+    column: str
+    func: Literal["sum", "mean", "min", "max", "count", "n_unique", "median", "std"]
+    alias: str | None = None
+
+
+class QuerySpec(BaseModel):
+    """Filter, group-by and aggregate request against a stored dataset."""
+
+    select: list[str] | None = None
+    filters: list[Filter] = []
+    group_by: list[str] = []
+    aggregates: list[Aggregate] = []
+    sort_by: list[str] = []
+    descending: bool = False
+    limit: int = Field(MAX_ROWS, ge=0)
+
+
+def _literal(value: Any, dtype: pl.DataType) -> pl.Expr:
+    # Cast to the column type so e.g. ISO date strings compare against dates.
+    return pl.lit(value).cast(dtype)
+
+
+def _predicate(spec: Filter, dtype: pl.DataType) -> pl.Expr:
+    col = pl.col(spec.column)
+    if spec.op == "is_null":
+        return col.is_null()
+    if spec.op == "not_null":
+        return col.is_not_null()
+    if spec.op in ("in", "not_in"):
+        if not isinstance(spec.value, list):
+            raise QueryError(f"'{spec.op}' filter on {spec.column} needs a list value")
+        try:
+            values = pl.Series(spec.value).cast(dtype)
+        except (TypeError, ValueError, OverflowError, pl.exceptions.PolarsError) as e:
+            raise QueryError(f"Invalid values for '{spec.op}' filter on {spec.column}: {e}") from e
+        return col.is_in(values) if spec.op == "in" else ~col.is_in(values)
+    try:
+        value = _literal(spec.value, dtype)
+    except (TypeError, ValueError, OverflowError) as e:
+        raise QueryError(f"Invalid value for filter on {spec.column}: {e}") from e
+    return {
+        "==": col == value,
+        "!=": col != value,
+        "<": col < value,
+        "<=": col <= value,
+        ">": col > value,
+        ">=": col >= value,
+    }[spec.op]
+
+
+def _check_aggregate(spec: Aggregate, dtype: pl.DataType):
+    """Reject aggregates the column's type has no meaning for.
+
+    Polars returns nulls for some of these and panics on others.
+    """
+    numeric = dtype.is_numeric() or dtype == pl.Boolean
+    if spec.func in ("count", "n_unique"):
+        ok = True
+    elif spec.func == "std":
+        ok = numeric
+    elif spec.func == "sum":
+        ok = numeric or isinstance(dtype, pl.Duration)
+    elif spec.func in ("mean", "median"):
+        ok = numeric or dtype.is_temporal()
+    else:
+        ok = not dtype.is_nested()
+    if not ok:
+        raise QueryError(f"Cannot take the {spec.func} of {spec.column}, a {dtype} column")
+
+
+def _aggregate(spec: Aggregate) -> pl.Expr:
+    col = pl.col(spec.column)
+    expr = col.len() if spec.func == "count" else getattr(col, spec.func)()
+    return expr.alias(spec.alias or f"{spec.column}_{spec.func}")
+
+
+def build_query(lf: pl.LazyFrame, spec: QuerySpec) -> pl.LazyFrame:
+    """Translate a query spec into a lazy plan.
+
+    Filters come first and only referenced columns are selected, so Polars
+    pushes both the predicate and the projection down into the Parquet scan.
+    """
+    schema = lf.collect_schema()
+    referenced = (
+        [f.column for f in spec.filters]
+        + spec.group_by
+        + [a.column for a in spec.aggregates]
+        + (spec.select or [])
+    )
+    unknown = sorted({name for name in referenced if name not in schema})
+    if unknown:
+        raise QueryError(f"Unknown columns: {', '.join(unknown)}")
+
+    for f in spec.filters:
+        lf = lf.filter(_predicate(f, schema[f.column]))
+
+    if spec.aggregates:
+        for a in spec.aggregates:
+            _check_aggregate(a, schema[a.column])
+        aggs = [_aggregate(a) for a in spec.aggregates]
+        lf = lf.group_by(spec.group_by).agg(aggs) if spec.group_by else lf.select(aggs)
+    elif spec.group_by:
+        lf = lf.group_by(spec.group_by).agg(pl.len().alias("count"))
+    elif spec.select:
+        lf = lf.select(spec.select)
+
+    if spec.sort_by:
+        lf = lf.sort(spec.sort_by, descending=spec.descending)
+    return lf.limit(min(spec.limit, MAX_ROWS))
+
+
+def run_query(lf: pl.LazyFrame, spec: QuerySpec) -> pl.DataFrame:
+    try:
+        return build_query(lf, spec).collect(engine="streaming")
+    except pl.exceptions.PolarsError as e:
+        # The full message holds the query plan, storage paths included.
+        logger.warning("Query failed: %s", e)
+        raise QueryError(f"Query failed: {str(e).splitlines()[0]}") from e
@@ -0,0 +1,423 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import re
+import shutil
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+import reflex as rx
+
+from .store import dashboard_path, dashboards_dir, dataset_lock, dataset_path, datasets_dir, delete_dataset
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-worker only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Environment variables overriding the defaults below. Sizes are in bytes
+# and may end in K, M or G; the time to live is in seconds.
+DISK_QUOTA_ENV = "DATABOARD_DISK_QUOTA"
+SESSION_QUOTA_ENV = "DATABOARD_SESSION_QUOTA"
+TTL_ENV = "DATABOARD_STORAGE_TTL"
+DASHBOARD_TTL_ENV = "DATABOARD_DASHBOARD_TTL"
+DISK_QUOTA = 20 * 1024**3
+SESSION_QUOTA = 2 * 1024**3
+# Datasets idle for this long are evicted unless a connected tab shows them.
+TTL = 24 * 3600
+# Published dashboards are shared links, so they are kept for longer.
+DASHBOARD_TTL = 30 * 24 * 3600
+SWEEP_INTERVAL = 10 * 60
+
+_KEY = re.compile(r"[\w-]+")
+_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3}
+
+
+class QuotaExceeded(Exception):
+    """Raised when an upload would take a session or the server over quota."""
+
+
+def _size(value: str) -> int:
+    value = value.strip().upper().removesuffix("B")
+    unit = value[-1:] if value[-1:] in _UNITS else ""
+    return int(float(value.removesuffix(unit)) * _UNITS[unit])
+
+
+@dataclass
+class Limits:
+    """Storage limits of the upload directory."""
+
+    disk_quota: int = DISK_QUOTA
+    session_quota: int = SESSION_QUOTA
+    ttl: float = TTL
+    dashboard_ttl: float = DASHBOARD_TTL
+
+    @classmethod
+    def from_env(cls) -> "Limits":
+        return cls(
+            disk_quota=_size(os.environ.get(DISK_QUOTA_ENV, str(DISK_QUOTA))),
+            session_quota=_size(os.environ.get(SESSION_QUOTA_ENV, str(SESSION_QUOTA))),
+            ttl=float(os.environ.get(TTL_ENV, TTL)),
+            dashboard_ttl=float(os.environ.get(DASHBOARD_TTL_ENV, DASHBOARD_TTL)),
+        )
+
+
+@dataclass
+class StoredDataset:
+    """Disk usage and ownership of one dataset directory."""
+
+    id: str
+    size: int
+    last_access: float
+    owner: str | None
+    # False while the dataset is still being ingested, or if ingest died.
+    complete: bool
+
+
+@dataclass
+class StoredRender:
+    """A cached image of a published dashboard, which can be drawn again."""
+
+    path: Path
+    size: int
+    last_access: float
+
+
+@dataclass
+class StoredDashboard:
+    """Disk usage of one published dashboard.
+
+    Dashboards outlive the tab that published them, so they count towards
+    the disk quota only. ``size`` leaves out the cached renders, which are
+    accounted and evicted on their own.
+    """
+
+    id: str
+    size: int
+    last_access: float
+    renders: list[StoredRender]
+
+
+def incoming_dir() -> Path:
+    """Raw uploads waiting to be ingested."""
+    return rx.get_upload_dir() / "incoming"
+
+
+def sessions_dir() -> Path:
+    """Markers of the dataset each browser tab currently shows."""
+    return rx.get_upload_dir() / "sessions"
+
+
+def _disk_usage(path: Path) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            with contextlib.suppress(OSError):
+                total += os.lstat(os.path.join(root, name)).st_size
+    return total
+
+
+def _mtime(path: Path) -> float | None:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
+
+
+def touch(dataset_id: str):
+    """Record that a dataset was just used, for least-recently-used eviction."""
+    with contextlib.suppress(OSError):
+        (dataset_path(dataset_id) / ".access").touch()
+
+
+def touch_dashboard(dashboard_id: str):
+    """Record that a published dashboard was just viewed."""
+    with contextlib.suppress(OSError, ValueError):
+        (dashboard_path(dashboard_id) / ".access").touch()
+
+
+def claim(dataset_id: str, session: str):
+    """Charge a dataset to a session's quota."""
+    path = dataset_path(dataset_id)
+    with contextlib.suppress(OSError):
+        (path / ".owner").write_text(session)
+    touch(dataset_id)
+
+
+def open_session(session: str, dataset_id: str):
+    """Mark a dataset as the one a tab shows, so it is never evicted under it.
+
+    The marker lives in the shared upload dir, so sweeps on every worker
+    see it.
+    """
+    if not _KEY.fullmatch(session):
+        return
+    marker = sessions_dir() / session
+    marker.parent.mkdir(parents=True, exist_ok=True)
+    tmp = marker.with_name(f".{session}.tmp")
+    tmp.write_text(dataset_id)
+    os.replace(tmp, marker)
+    touch(dataset_id)
+
+
+def close_session(session: str):
+    if _KEY.fullmatch(session):
+        (sessions_dir() / session).unlink(missing_ok=True)
+
+
+def stored_datasets() -> list[StoredDataset]:
+    """Every dataset in the store with its size, owner and last access time."""
+    datasets = []
+    root = datasets_dir()
+    if not root.is_dir():
+        return datasets
+    for path in root.iterdir():
+        if not path.is_dir() or not path.name.isalnum():
+            continue
+        try:
+            owner = (path / ".owner").read_text() or None
+        except OSError:
+            owner = None
+        last_access = _mtime(path / ".access") or _mtime(path / "profile.json") or _mtime(path) or 0.0
+        complete = (path / "profile.json").is_file()
+        datasets.append(StoredDataset(path.name, _disk_usage(path), last_access, owner, complete))
+    return datasets
+
+
+def stored_dashboards() -> list[StoredDashboard]:
+    """Every published dashboard with its size, cached renders and last view time."""
+    dashboards = []
+    root = dashboards_dir()
+    if not root.is_dir():
+        return dashboards
+    for path in root.iterdir():
+        if not path.is_dir() or not path.name.isalnum():
+            continue
+        last_access = _mtime(path / ".access") or _mtime(path / "dashboard.json") or _mtime(path) or 0.0
+        renders = []
+        if (path / "renders").is_dir():
+            for render in (path / "renders").iterdir():
+                with contextlib.suppress(OSError):
+                    stat = render.stat()
+                    # Views of a dashboard fetch its images, so a render is
+                    # as recent as its dashboard's last view.
+                    renders.append(StoredRender(render, stat.st_size, max(stat.st_mtime, last_access)))
+        size = _disk_usage(path) - sum(r.size for r in renders)
+        dashboards.append(StoredDashboard(path.name, size, last_access, renders))
+    return dashboards
+
+
+def live_datasets(alive: Callable[[str], bool] | None = None, limits: Limits | None = None) -> set[str]:
+    """Datasets shown by a tab that is connected or may still reconnect.
+
+    Markers of connected tabs are refreshed on every call; those of tabs
+    gone for longer than the time to live are removed.
+    """
+    limits = limits or Limits.from_env()
+    live = set()
+    root = sessions_dir()
+    if not root.is_dir():
+        return live
+    for marker in root.iterdir():
+        if marker.name.startswith("."):
+            continue
+        try:
+            dataset_id = marker.read_text()
+        except OSError:
+            continue
+        if alive is not None and alive(marker.name):
+            with contextlib.suppress(OSError):
+                marker.touch()
+        elif time.time() - (_mtime(marker) or 0.0) > limits.ttl:
+            marker.unlink(missing_ok=True)
+            continue
+        live.add(dataset_id)
+    return live
+
+
+def evict(dataset_id: str):
+    """Delete a dataset once no append to it is running."""
+    with dataset_lock(dataset_id):
+        delete_dataset(dataset_id)
+
+
+def evict_dashboard(dashboard_id: str):
+    """Delete a published dashboard; its link stops working."""
+    shutil.rmtree(dashboard_path(dashboard_id), ignore_errors=True)
+
+
+def _renders(dashboards: list[StoredDashboard]) -> list[StoredRender]:
+    return [render for dashboard in dashboards for render in dashboard.renders]
+
+
+def _evict_lru(stored: list, excess: int, live: set[str]) -> list:
+    """Evict idle datasets, dashboards and renders, least recently used first, until ``excess`` bytes are freed.
+
+    Datasets still being ingested are skipped.
+    """
+    evicted = []
+    for item in sorted(stored, key=lambda d: d.last_access):
+        if excess <= 0:
+            break
+        if isinstance(item, StoredRender):
+            item.path.unlink(missing_ok=True)
+        elif isinstance(item, StoredDashboard):
+            evict_dashboard(item.id)
+        elif item.id in live or not item.complete:
+            continue
+        else:
+            evict(item.id)
+        evicted.append(item)
+        excess -= item.size
+    return evicted
+
+
+def pending_uploads(session: str) -> int:
+    """Bytes of the session's uploads that are not ingested yet.
+
+    An upload's space is taken when it starts, before its chunks arrive,
+    and is held until processing removes it or the sweep expires it.
+    """
+    total = 0
+    incoming = incoming_dir()
+    if not incoming.is_dir():
+        return total
+    for manifest in incoming.glob("*/.upload.json"):
+        with contextlib.suppress(OSError, ValueError, KeyError, TypeError):
+            upload = json.loads(manifest.read_text())
+            if upload.get("session") == session:
+                total += upload["size"]
+    return total
+
+
+@contextlib.contextmanager
+def reservation_lock():
+    """Serialise reservations across every worker process.
+
+    Hold it from ``reserve`` until the upload is created, so concurrent
+    uploads cannot each pass a quota they exceed together.
+    """
+    incoming = incoming_dir()
+    incoming.mkdir(parents=True, exist_ok=True)
+    if fcntl is None:
+        yield
+        return
+    with open(incoming / ".reserve.lock", "w") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def reserve(session: str, size: int, alive: Callable[[str], bool] | None = None, limits: Limits | None = None):
+    """Make room for an upload of ``size`` bytes, or raise ``QuotaExceeded``.
+
+    The session's unfinished uploads count against its quota. Its own idle
+    datasets are evicted first when it is over the quota. When the disk
+    is, cached renders go first, as they can be drawn again, then any idle
+    datasets or published dashboards.
+    """
+    limits = limits or Limits.from_env()
+    datasets = stored_datasets()
+    live = live_datasets(alive, limits)
+
+    owned = [d for d in datasets if d.owner == session]
+    excess = sum(d.size for d in owned) + pending_uploads(session) + size - limits.session_quota
+    if excess > 0:
+        evicted = _evict_lru(owned, excess, live)
+        if sum(d.size for d in evicted) < excess:
+            raise QuotaExceeded("This upload would exceed your storage quota; start over to free space")
+        datasets = [d for d in datasets if d not in evicted]
+
+    dashboards = stored_dashboards()
+    renders = _renders(dashboards)
+    stored = datasets + dashboards
+    excess = sum(d.size for d in stored + renders) + _disk_usage(incoming_dir()) + size - limits.disk_quota
+    if excess > 0:
+        excess -= sum(r.size for r in _evict_lru(renders, excess, live))
+    if excess > 0 and sum(d.size for d in _evict_lru(stored, excess, live)) < excess:
+        raise QuotaExceeded("The server is out of storage space; please try again later")
+
+
+def sweep(alive: Callable[[str], bool] | None = None, limits: Limits | None = None) -> list[str]:
+    """Evict expired datasets, dashboards and renders and bring every quota back under its limit.
+
+    Datasets shown by a connected tab are never evicted. Returns the IDs
+    of the evicted datasets and dashboards.
+    """
+    limits = limits or Limits.from_env()
+    now = time.time()
+    live = live_datasets(alive, limits)
+    datasets = stored_datasets()
+
+    evicted = []
+    for dataset in datasets:
+        if dataset.id not in live and now - dataset.last_access > limits.ttl:
+            evict(dataset.id)
+            evicted.append(dataset)
+    datasets = [d for d in datasets if d not in evicted]
+
+    by_owner: dict[str | None, list[StoredDataset]] = {}
+    for dataset in datasets:
+        by_owner.setdefault(dataset.owner, []).append(dataset)
+    for owner, owned in by_owner.items():
+        excess = sum(d.size for d in owned) - limits.session_quota
+        if owner is not None and excess > 0:
+            evicted += _evict_lru(owned, excess, live)
+    datasets = [d for d in datasets if d not in evicted]
+
+    # Uploads are removed once ingested; what is left was abandoned.
+    incoming = incoming_dir()
+    if incoming.is_dir():
+        for path in incoming.iterdir():
+            if now - (_mtime(path) or now) > limits.ttl:
+                shutil.rmtree(path, ignore_errors=True)
+
+    dashboards = []
+    for dashboard in stored_dashboards():
+        if now - dashboard.last_access > limits.dashboard_ttl:
+            evict_dashboard(dashboard.id)
+            evicted.append(dashboard)
+        else:
+            dashboards.append(dashboard)
+    # Artifacts are assembled under a temporary name; these were never renamed.
+    root = dashboards_dir()
+    if root.is_dir():
+        for path in root.glob(".*.tmp"):
+            if now - (_mtime(path) or now) > limits.ttl:
+                shutil.rmtree(path, ignore_errors=True)
+
+    # Renders are cheap to draw again, so they expire on the shorter dataset TTL.
+    renders = []
+    for render in _renders(dashboards):
+        if now - render.last_access > limits.ttl:
+            render.path.unlink(missing_ok=True)
+        else:
+            renders.append(render)
+
+    stored = datasets + dashboards
+    excess = sum(d.size for d in stored + renders) + _disk_usage(incoming) - limits.disk_quota
+    if excess > 0:
+        excess -= sum(r.size for r in _evict_lru(renders, excess, live))
+    if excess > 0:
+        evicted += _evict_lru(stored, excess, live)
+    return [d.id for d in evicted]
+
+
+async def evict_periodically(alive: Callable[[str], bool] | None = None, interval: float = SWEEP_INTERVAL):
+    """Sweep the upload directory for as long as the app runs."""
+    while True:
+        try:
+            await asyncio.to_thread(sweep, alive)
+        except Exception:
+            logger.exception("Storage sweep failed")
+        await asyncio.sleep(interval)
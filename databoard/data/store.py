@@ -0,0 +1,408 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import re
+import shutil
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Literal
+
+import reflex as rx
+
+from ..analysis.timeseries import TimeSeriesInfo
+from ..lazy import lazy_import
+from .duplicates import DuplicateReport
+from .profile import DatasetProfile
+from .quality import DataQuality
+from .sketch import read_sketches, write_sketches
+
+pl = lazy_import("polars")
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-worker only
+    fcntl = None
+
+
+def datasets_dir() -> Path:
+    """Root directory holding every stored dataset."""
+    return rx.get_upload_dir() / "datasets"
+
+
+def dataset_path(dataset_id: str) -> Path:
+    """Directory holding the columnar files and metadata of a dataset."""
+    if not dataset_id.isalnum():
+        raise ValueError(f"Invalid dataset ID: {dataset_id!r}")
+    return datasets_dir() / dataset_id
+
+
+def new_dataset_id() -> str:
+    return uuid.uuid4().hex
+
+
+def _replace(path: Path, write):
+    """Write a file through a temporary sibling and rename it into place.
+
+    Workers sharing the dataset store never see a half-written file, and
+    readers that memory-mapped the old version keep a consistent copy.
+    """
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _write_json(path: Path, data):
+    _replace(path, lambda tmp: tmp.write_text(json.dumps(data)))
+
+
+@contextlib.contextmanager
+def dataset_lock(dataset_id: str):
+    """Hold an exclusive lock on a dataset across every worker process.
+
+    Uses an advisory lock file in the dataset directory, so it also holds
+    between nodes that share the store over a network filesystem.
+    """
+    path = dataset_path(dataset_id)
+    if fcntl is None or not path.is_dir():
+        yield
+        return
+    with open(path / ".lock", "w") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+# Rows per Parquet row group; large enough for fast scans, small enough
+# that min/max statistics let filtered reads skip most groups.
+ROW_GROUP_SIZE = 128 * 1024
+# Datasets whose first batch is smaller than this are not worth partitioning.
+MIN_PARTITION_ROWS = 100_000
+MAX_PARTITIONS = 64
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+@dataclass
+class Layout:
+    """How a dataset is split into partition directories."""
+
+    column: str | None = None
+    kind: Literal["month", "value"] | None = None
+    next_part: int = 0
+
+    def key(self) -> pl.Expr:
+        col = pl.col(self.column)
+        if self.kind == "month":
+            return col.dt.strftime("%Y-%m")
+        return col.cast(pl.String)
+
+
+def choose_layout(batch: pl.DataFrame) -> Layout:
+    """Pick a partition column from the first batch of a dataset.
+
+    The first date column wins and is split by month; otherwise the
+    lowest-cardinality string column with a handful of values is used.
+    """
+    if batch.height < MIN_PARTITION_ROWS:
+        return Layout()
+    for name, dtype in batch.schema.items():
+        if dtype == pl.Date or isinstance(dtype, pl.Datetime):
+            return Layout(name, "month")
+    candidates = [name for name, dtype in batch.schema.items() if dtype == pl.String]
+    if candidates:
+        counts = batch.select(pl.col(candidates).n_unique()).row(0)
+        best = min(zip(counts, candidates))
+        if 2 <= best[0] <= MAX_PARTITIONS:
+            return Layout(best[1], "value")
+    return Layout()
+
+
+def _partition_dir(column: str, value: str | None) -> str:
+    value = "__null__" if value is None else _UNSAFE.sub("_", value)[:64]
+    return f"{_UNSAFE.sub('_', column)}={value}"
+
+
+def load_layout(dataset_id: str) -> Layout:
+    path = dataset_path(dataset_id) / "layout.json"
+    return Layout(**json.loads(path.read_text())) if path.is_file() else Layout()
+
+
+def save_layout(dataset_id: str, layout: Layout):
+    _write_json(dataset_path(dataset_id) / "layout.json", asdict(layout))
+
+
+class DatasetWriter:
+    """Write batches of a dataset as partitioned Parquet files.
+
+    The partition layout is chosen from the first batch and stored with the
+    dataset. Each file holds one partition value and is sorted by the
+    partition column, so file and row-group statistics let filtered scans
+    skip irrelevant data.
+
+    With ``append=True`` the stored layout is reused. If an error escapes
+    the ``with`` block only the files written by this writer are removed,
+    so a failed append leaves the dataset untouched.
+    """
+
+    def __init__(self, dataset_id: str, append: bool = False):
+        self.dataset_id = dataset_id
+        self.path = dataset_path(dataset_id)
+        self.append = append
+        self.layout: Layout | None = None
+        self.written: list[Path] = []
+
+    def __enter__(self) -> "DatasetWriter":
+        if self.append:
+            if not self.path.is_dir():
+                raise FileNotFoundError(f"Dataset {self.dataset_id} does not exist")
+            self.layout = load_layout(self.dataset_id)
+        else:
+            self.path.mkdir(parents=True, exist_ok=True)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            if self.layout is not None:
+                save_layout(self.dataset_id, self.layout)
+            return
+        if self.append:
+            for part in self.written:
+                part.unlink(missing_ok=True)
+        else:
+            shutil.rmtree(self.path, ignore_errors=True)
+
+    def _write_file(self, directory: Path, batch: pl.DataFrame):
+        directory.mkdir(parents=True, exist_ok=True)
+        part = directory / f"part-{self.layout.next_part:05d}.parquet"
+        _replace(part, lambda tmp: batch.write_parquet(tmp, statistics=True, row_group_size=ROW_GROUP_SIZE))
+        self.written.append(part)
+
+    def write(self, batch: pl.DataFrame):
+        if self.layout is None:
+            self.layout = choose_layout(batch)
+        if self.layout.column is None:
+            self._write_file(self.path, batch)
+        else:
+            keyed = batch.with_columns(self.layout.key().alias("__partition__"))
+            for (value,), part in keyed.partition_by("__partition__", as_dict=True).items():
+                part = part.drop("__partition__").sort(self.layout.column)
+                self._write_file(self.path / _partition_dir(self.layout.column, value), part)
+        self.layout.next_part += 1
+
+    def write_hashes(self, buckets: dict[int, pl.DataFrame]):
+        """Spill the key hashes of the last written batch, one file per bucket."""
+        part = self.layout.next_part - 1
+        for bucket, frame in buckets.items():
+            directory = hashes_path(self.dataset_id) / f"{bucket:02d}"
+            directory.mkdir(parents=True, exist_ok=True)
+            path = directory / f"part-{part:05d}.arrow"
+            _replace(path, frame.write_ipc)
+            self.written.append(path)
+
+
+def scan_dataset(dataset_id: str) -> pl.LazyFrame:
+    """Lazily scan every Parquet file of a dataset across its partitions."""
+    # Partition directories are for locality only; the partition column is
+    # stored in the files, so hive path parsing stays off.
+    return pl.scan_parquet(dataset_path(dataset_id) / "**" / "*.parquet", hive_partitioning=False)
+
+
+def dataset_files(dataset_id: str) -> list[Path]:
+    return sorted(dataset_path(dataset_id).glob("**/part-*.parquet"))
+
+
+def stratified_sample(dataset_id: str, rows: int, weight: str = "__w") -> pl.DataFrame:
+    """Sample about ``rows`` rows spread evenly over the dataset's files.
+
+    Every file holds a single partition value (or one ingest batch), so
+    taking the leading rows of each file stratifies by partition while only
+    reading the first row groups. A ``weight`` column holds how many rows
+    each sampled row stands for, so sums and counts can be scaled up.
+    """
+    files = dataset_files(dataset_id)
+    if not files:
+        return pl.DataFrame()
+    per_file = max(1, -(-rows // len(files)))
+    sizes = pl.collect_all([pl.scan_parquet(f).select(pl.len()) for f in files])
+    frames = []
+    for f, size in zip(files, sizes):
+        total = size.item()
+        taken = min(per_file, total)
+        if taken:
+            frames.append(pl.scan_parquet(f).head(taken).with_columns(pl.lit(total / taken).alias(weight)))
+    return pl.concat(pl.collect_all(frames)) if frames else pl.DataFrame()
+
+
+def dataset_schema(dataset_id: str) -> pl.Schema:
+    return scan_dataset(dataset_id).collect_schema()
+
+
+def save_profile(dataset_id: str, profile: DatasetProfile):
+    path = dataset_path(dataset_id)
+    # Sketches first: the profile marks the dataset as complete.
+    sketches = [col.sketch for col in profile.columns]
+    if all(sketch is not None for sketch in sketches):
+        _replace(path / "sketches.npz", lambda tmp: write_sketches(tmp, sketches))
+    _write_json(path / "profile.json", profile.to_dict())
+
+
+def load_profile(dataset_id: str, sketches: bool = False) -> DatasetProfile:
+    """Read a dataset's profile.
+
+    Pass ``sketches=True`` to also load the distinct-count sketches, which
+    only merging needs; without them ``distinct`` is the saved estimate.
+    """
+    path = dataset_path(dataset_id)
+    profile = DatasetProfile.from_dict(json.loads((path / "profile.json").read_text()))
+    if sketches and (path / "sketches.npz").is_file():
+        for col, sketch in zip(profile.columns, read_sketches(path / "sketches.npz")):
+            col.sketch = sketch
+    return profile
+
+
+def save_quality(dataset_id: str, quality: DataQuality):
+    _write_json(dataset_path(dataset_id) / "quality.json", quality.to_dict())
+
+
+def load_quality(dataset_id: str) -> DataQuality | None:
+    path = dataset_path(dataset_id) / "quality.json"
+    return DataQuality.from_dict(json.loads(path.read_text())) if path.is_file() else None
+
+
+def save_rollups(dataset_id: str, info: TimeSeriesInfo, rollups: dict[str, pl.DataFrame]):
+    """Cache time rollups next to the dataset as Arrow IPC files."""
+    directory = dataset_path(dataset_id) / "rollups"
+    directory.mkdir(exist_ok=True)
+    for level, frame in rollups.items():
+        _replace(directory / f"{level}.arrow", frame.write_ipc)
+    _write_json(dataset_path(dataset_id) / "timeseries.json", asdict(info))
+
+
+def load_timeseries_info(dataset_id: str) -> TimeSeriesInfo | None:
+    path = dataset_path(dataset_id) / "timeseries.json"
+    return TimeSeriesInfo(**json.loads(path.read_text())) if path.is_file() else None
+
+
+def load_rollup(dataset_id: str, level: str) -> pl.DataFrame:
+    return pl.read_ipc(dataset_path(dataset_id) / "rollups" / f"{level}.arrow", memory_map=True)
+
+
+# Rows of each dataset kept for the upload preview.
+PREVIEW_ROWS = 100
+
+
+def _write_browser_ipc(frame: pl.DataFrame, path: Path):
+    # Arrow JS reads neither compressed buffers nor string view columns.
+    frame.write_ipc(path, compression="uncompressed", compat_level=pl.CompatLevel.oldest())
+
+
+def preview_path(dataset_id: str) -> Path:
+    return dataset_path(dataset_id) / "preview.arrow"
+
+
+def save_preview(dataset_id: str, batch: pl.DataFrame):
+    """Store the first rows of a dataset as an uncompressed Arrow file.
+
+    Date and time columns are stored as text so the browser can show them
+    without handling Arrow temporal types.
+    """
+    preview = batch.head(PREVIEW_ROWS).with_columns(pl.selectors.temporal().cast(pl.String))
+    _replace(preview_path(dataset_id), lambda tmp: _write_browser_ipc(preview, tmp))
+
+
+def chart_path(dataset_id: str, index: int) -> Path:
+    return dataset_path(dataset_id) / "charts" / f"{index}.arrow"
+
+
+def save_chart(dataset_id: str, index: int, frame: pl.DataFrame):
+    """Store the points of one dashboard chart as an uncompressed Arrow file."""
+    path = chart_path(dataset_id, index)
+    path.parent.mkdir(exist_ok=True)
+    _replace(path, lambda tmp: _write_browser_ipc(frame, tmp))
+
+
+def hashes_path(dataset_id: str) -> Path:
+    return dataset_path(dataset_id) / "hashes"
+
+
+def hash_buckets(dataset_id: str) -> list[pl.LazyFrame]:
+    """Lazily scan the spilled key hashes of a dataset, one frame per bucket."""
+    return [
+        pl.scan_ipc(directory / "*.arrow", memory_map=True)
+        for directory in sorted(hashes_path(dataset_id).glob("*"))
+        if directory.is_dir()
+    ]
+
+
+def hash_bucket_files(dataset_id: str) -> dict[int, list[Path]]:
+    """The spilled key hash files of a dataset, by bucket."""
+    return {
+        int(directory.name): sorted(directory.glob("*.arrow"))
+        for directory in sorted(hashes_path(dataset_id).glob("*"))
+        if directory.is_dir()
+    }
+
+
+def save_duplicates(dataset_id: str, report: DuplicateReport):
+    _write_json(dataset_path(dataset_id) / "duplicates.json", report.to_dict())
+
+
+def load_duplicates(dataset_id: str) -> DuplicateReport | None:
+    path = dataset_path(dataset_id) / "duplicates.json"
+    return DuplicateReport.from_dict(json.loads(path.read_text())) if path.is_file() else None
+
+
+def dashboards_dir() -> Path:
+    """Root directory holding every published dashboard."""
+    return rx.get_upload_dir() / "dashboards"
+
+
+def dashboard_path(dashboard_id: str) -> Path:
+    if not dashboard_id.isalnum():
+        raise ValueError(f"Invalid dashboard ID: {dashboard_id!r}")
+    return dashboards_dir() / dashboard_id
+
+
+def dashboard_chart_path(dashboard_id: str, index: int) -> Path:
+    return dashboard_path(dashboard_id) / "charts" / f"{index}.arrow"
+
+
+def save_dashboard_artifact(dashboard_id: str, spec: dict, charts: list[pl.DataFrame]):
+    """Write a published dashboard: its spec and the points of every chart.
+
+    Artifacts never change once written. They are assembled in a temporary
+    directory and renamed into place, so they appear complete or not at all.
+    """
+    path = dashboard_path(dashboard_id)
+    tmp = path.with_name(f".{dashboard_id}.{uuid.uuid4().hex}.tmp")
+    try:
+        (tmp / "charts").mkdir(parents=True)
+        for i, frame in enumerate(charts):
+            _write_browser_ipc(frame, tmp / "charts" / f"{i}.arrow")
+        (tmp / "dashboard.json").write_text(json.dumps(spec))
+        os.rename(tmp, path)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def dashboard_render_path(dashboard_id: str, size: str, fmt: str) -> Path:
+    return dashboard_path(dashboard_id) / "renders" / f"{size}.{fmt}"
+
+
+def save_dashboard_render(dashboard_id: str, size: str, fmt: str, data: bytes):
+    """Cache a rendered image of a published dashboard next to its artifact."""
+    path = dashboard_render_path(dashboard_id, size, fmt)
+    path.parent.mkdir(exist_ok=True)
+    _replace(path, lambda tmp: tmp.write_bytes(data))
+
+
+def delete_dataset(dataset_id: str):
+    shutil.rmtree(dataset_path(dataset_id), ignore_errors=True)
@@ -0,0 +1,141 @@
+import json
+import math
+import os
+import shutil
+import uuid
+import zlib
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from .storage import incoming_dir
+
+# Chunks are small enough that a dropped connection costs seconds, and
+# large enough that a multi-GB file takes a few hundred requests.
+CHUNK_SIZE = 8 * 1024**2
+
+
+class UploadError(Exception):
+    """Raised for a chunk or upload the server cannot accept."""
+
+
+@dataclass
+class ChunkedUpload:
+    """A file sent in fixed-size chunks, in any order and over any worker.
+
+    Each chunk is written straight to its offset in a file of the final
+    size, and a marker file records it as received, so nothing is copied
+    when the upload completes and a dropped connection only loses the
+    chunks in flight.
+    """
+
+    id: str
+    name: str
+    size: int
+    chunk_size: int
+    # Client token charged for the space until the upload is processed.
+    session: str = ""
+
+    @property
+    def chunks(self) -> int:
+        return math.ceil(self.size / self.chunk_size)
+
+    @property
+    def directory(self) -> Path:
+        return incoming_dir() / self.id
+
+    @property
+    def path(self) -> Path:
+        """The assembled file, once every chunk has arrived."""
+        return self.directory / self.name
+
+    def received(self) -> list[int]:
+        """Indexes of the chunks written so far."""
+        markers = self.directory / ".chunks"
+        if not markers.is_dir():
+            return []
+        return sorted(int(marker.name) for marker in markers.iterdir() if marker.name.isdigit())
+
+    def status(self) -> dict:
+        status = {key: value for key, value in asdict(self).items() if key != "session"}
+        return {**status, "chunks": self.chunks, "received": self.received(), "complete": self.path.is_file()}
+
+
+def _upload_dir(upload_id: str) -> Path:
+    if not upload_id.isalnum():
+        raise ValueError(f"Invalid upload ID: {upload_id!r}")
+    return incoming_dir() / upload_id
+
+
+def create_upload(name: str, size: int, chunk_size: int = CHUNK_SIZE, session: str = "") -> ChunkedUpload:
+    """Start a chunked upload of a ``size``-byte file for a client session.
+
+    The file is allocated at its final size up front. Like a dashboard
+    artifact, the upload directory is assembled under a temporary name and
+    renamed into place, so other workers never see it half created.
+    """
+    if size < 0 or chunk_size <= 0:
+        raise UploadError("Invalid upload size")
+    upload = ChunkedUpload(uuid.uuid4().hex, Path(name).name.lstrip(".") or "upload.csv", size, chunk_size, session)
+    tmp = incoming_dir() / f".{upload.id}.tmp"
+    (tmp / ".chunks").mkdir(parents=True)
+    try:
+        (tmp / ".upload.json").write_text(json.dumps(asdict(upload)))
+        with (tmp / f".{upload.name}.part").open("wb") as out:
+            out.truncate(size)
+        os.rename(tmp, upload.directory)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return upload
+
+
+def load_upload(upload_id: str) -> ChunkedUpload:
+    """Raises ``FileNotFoundError`` if there is no such upload."""
+    manifest = _upload_dir(upload_id) / ".upload.json"
+    return ChunkedUpload(**json.loads(manifest.read_text()))
+
+
+def write_chunk(upload: ChunkedUpload, index: int, data: bytes, crc32: str):
+    """Write one chunk in place, after checking its length and CRC-32.
+
+    Chunks may arrive in any order, twice, or at the same time on several
+    workers: each goes to its own byte range of the file.
+    """
+    if not 0 <= index < upload.chunks:
+        raise UploadError(f"No chunk {index} in an upload of {upload.chunks} chunks")
+    expected = min(upload.chunk_size, upload.size - index * upload.chunk_size)
+    if len(data) != expected:
+        raise UploadError(f"Chunk {index} has {len(data)} bytes, expected {expected}")
+    if f"{zlib.crc32(data):08x}" != crc32.lower():
+        raise UploadError(f"Chunk {index} is corrupt: checksum mismatch")
+    try:
+        fd = os.open(upload.directory / f".{upload.name}.part", os.O_WRONLY)
+    except FileNotFoundError:
+        # Already assembled; a retried request for a chunk that made it.
+        if upload.path.is_file():
+            return
+        raise
+    try:
+        os.pwrite(fd, data, index * upload.chunk_size)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    (upload.directory / ".chunks" / str(index)).touch()
+    # The storage sweep removes uploads whose directory has been idle too long.
+    os.utime(upload.directory)
+
+
+def complete_upload(upload: ChunkedUpload) -> Path:
+    """Check that every chunk arrived and give the file its real name."""
+    if upload.path.is_file():
+        return upload.path
+    missing = upload.chunks - len(upload.received())
+    if missing:
+        raise UploadError(f"{missing} of {upload.chunks} chunks are still missing")
+    try:
+        os.rename(upload.directory / f".{upload.name}.part", upload.path)
+    except FileNotFoundError:
+        # Completed by a concurrent request.
+        if not upload.path.is_file():
+            raise
+    shutil.rmtree(upload.directory / ".chunks", ignore_errors=True)
+    return upload.path
@@ -1,6 +1,14 @@
 import reflex as rx
+from . import profiling
+from .api import api
+from .components.contact import ContactState
+from .components.gallery import GalleryState
+from .components.header import HeaderState
+from .data.storage import evict_periodically
+from .pages.dashboard import dashboard_view # type: ignore
 from .pages.index import index # type: ignore
-from .pages.trial import trial # type: ignore
+from .pages.trial import TrialState, trial # type: ignore
+from .session import client_connected
 
 app = rx.App(
     theme=rx.theme(
@@ -11,6 +19,12 @@ app = rx.App(
         accent_color="orange",
         gray_color="sand",
         panel_background="solid",
-    )
+    ),
+    stylesheets=["/styles.css"],
+    api_transformer=api,
 )
+# Evict idle datasets and enforce disk quotas while the backend runs.
+app.register_lifespan_task(evict_periodically, alive=client_connected)
+if profiling.enabled():
+    profiling.install(app, TrialState, ContactState, GalleryState, HeaderState)
 # app.add_page(index)
\ No newline at end of file
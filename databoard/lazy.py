@@ -0,0 +1,22 @@
+import importlib
+from types import ModuleType
+
+
+class LazyModule(ModuleType):
+    """Stand-in for a module that is only imported on first attribute access."""
+
+    def __getattr__(self, attr: str):
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Defer importing a heavy library until the code actually uses it.
+
+    The data pipeline is imported by the pages and the API at startup, but
+    only needs Polars and NumPy once a dataset is processed. Modules using
+    this must enable ``from __future__ import annotations`` so type hints
+    do not trigger the import.
+    """
+    return LazyModule(name)
@@ -0,0 +1,25 @@
+import reflex as rx
+from ..components.navbar import navbar
+from ..components.arrow import arrow_dashboard
+
+
+@rx.page(route="/dashboard/[dashboard_id]", title="DataBoard - Shared Dashboard")
+def dashboard_view() -> rx.Component:
+    """Read-only view of a published dashboard.
+
+    Everything is fetched by the browser from the dashboard's cached
+    artifact; viewers hold no page state and trigger no computation.
+    """
+    return rx.vstack(
+        navbar("dashboard"),
+        rx.box(
+            rx.box(
+                arrow_dashboard(src=f"/api/dashboards/{rx.State.dashboard_id}"),
+                class_name="section-content",
+            ),
+            class_name="section",
+            padding="0 2rem",
+        ),
+        width="100%",
+        spacing="0",
+    )
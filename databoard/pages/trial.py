@@ -1,5 +1,39 @@
+import asyncio
+import logging
+import shutil
+
 import reflex as rx
 from ..components.navbar import navbar
+from ..components.arrow import api_image, api_link, arrow_table
+from ..components.charts import chart_card
+from ..components.upload import chunked_upload
+from ..analysis.dashboard import Dashboard, build_dashboard, dashboard_url, image_src, publish_dashboard, rollup_src
+from ..analysis.render import render_snapshot
+from ..data.cancel import Cancelled, cancel_jobs, finish_job, start_job
+from ..data.catalog import get_catalog
+from ..data.ingest import IngestError, append_upload, ingest_upload
+from ..data.storage import claim, close_session, open_session, touch
+from ..data.store import load_duplicates, load_quality
+from ..data.uploads import load_upload
+from ..session import client_connected
+
+COLUMN_PAGE_SIZE = 12
+# Columns listed in the data quality report and rows of its heatmap.
+QUALITY_COLUMNS = 8
+# Sample sizes for progressive dashboards; the first pass answers in about
+# a second and each refinement replaces it until the exact pass.
+REFINE_SAMPLE_ROWS = (20_000, 200_000, 2_000_000)
+
+logger = logging.getLogger(__name__)
+
+def format_size(size: int) -> str:
+    """Format a byte count for display, e.g. ``2.3 MB``."""
+    value = float(size)
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1024 or unit == "GB":
+            break
+        value /= 1024
+    return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
 
 class TrialState(rx.State):
     """State for trial page and file upload functionality."""
@@ -8,9 +42,14 @@ class TrialState(rx.State):
     uploaded_files: list[str] = []
     is_uploading: bool = False
     upload_progress: int = 0
+    upload_error: str = ""
+    pending_file: str = ""
     
     # File analysis
     file_analyzed: bool = False
+    dataset_id: str = ""
+    append_mode: bool = False
+    appended_rows: int = 0
     file_name: str = ""
     file_size: str = ""
     row_count: int = 0
@@ -20,60 +59,309 @@ class TrialState(rx.State):
     dashboard_generated: bool = False
     is_generating: bool = False
     generation_progress: int = 0
+    generation_step: str = ""
+    generation_error: str = ""
+    insights: list[dict] = []
+    charts: list[dict] = []
+    is_approximate: bool = False
+    is_refining: bool = False
+    sample_percent: float = 100.0
+    # Shareable page of the exact dashboard, once it is published, and
+    # API paths of its rendered snapshot and thumbnail.
+    dashboard_url: str = ""
+    snapshot_src: str = ""
+    thumbnail_src: str = ""
+    time_column: str = ""
+    resolutions: list[str] = []
+    time_resolution: str = ""
     
-    # Sample data preview
-    sample_columns: list[str] = []
+    # Column catalog; only the visible page is held in state
+    column_query: str = ""
+    column_page: list[dict] = []
+    column_page_index: int = 0
+    column_pages: int = 1
+    column_matches: int = 0
     
-    async def handle_upload(self, files: list[str]):
-        """Handle file upload and processing."""
+    # Duplicate rows and candidate keys
+    duplicate_rows: int = 0
+    duplicate_pct: float = 0.0
+    duplicate_examples: list[dict] = []
+    key_columns: list[dict] = []
+    
+    # Data quality; problem columns and their missingness over row blocks
+    quality_columns: list[dict] = []
+    missing_names: list[str] = []
+    missing_matrix: list[list[float]] = []
+    missing_block_rows: int = 0
+    
+    def finish_chunked_upload(self, upload_id: str):
+        """Hand a resumable upload over for processing once the browser assembled it."""
+        try:
+            path = load_upload(upload_id).path
+        except (ValueError, FileNotFoundError):
+            path = None
+        if path is None or not path.is_file():
+            self.upload_error = "The upload did not complete; choose the file again to resume it"
+            return
         self.is_uploading = True
-        self.upload_progress = 0
+        self.upload_error = ""
+        self.upload_progress = 50
+        self.pending_file = str(path.relative_to(rx.get_upload_dir()))
+        return TrialState.process_upload
+
+    def upload_failed(self, message: str):
+        self.upload_error = message
+
+    @rx.event(background=True)
+    async def process_upload(self):
+        """Decompress, profile and convert the saved upload in one streaming pass.
         
-        # Simulate upload progress
-        for i in range(1, 101, 10):
-            self.upload_progress = i
-            await rx.sleep(0.1)
+        Runs as a background task so ``reset_trial`` can cancel it.
+        """
+        async with self:
+            client = self.router.session.client_token
+            pending = self.pending_file
+            target = self.dataset_id if self.append_mode else ""
+        path = rx.get_upload_dir() / pending
+        name = path.name
+        cancel = start_job(client, alive=lambda: client_connected(client))
         
-        # Process the uploaded file
-        if files:
-            self.uploaded_files = files
-            self.file_name = files[0].split("/")[-1] if "/" in files[0] else files[0]
-            self.file_size = "2.3 MB"  # Mock file size
-            self.row_count = 15420  # Mock row count
-            self.column_count = 12  # Mock column count
-            self.sample_columns = [
-                "Customer_ID", "Product_Name", "Sales_Amount", 
-                "Date", "Region", "Category", "Quantity", 
-                "Discount", "Profit", "Customer_Segment"
-            ]
-            self.file_analyzed = True
+        try:
+            if target:
+                profile, delta = await asyncio.to_thread(append_upload, path, target, cancel)
+            else:
+                dataset_id, profile = await asyncio.to_thread(ingest_upload, path, cancel)
+        except Cancelled:
+            return
+        except Exception as e:
+            if isinstance(e, IngestError):
+                message = str(e)
+            else:
+                logger.exception("Processing upload %s failed", pending)
+                message = f"Something went wrong while processing {name}; please try again"
+            async with self:
+                if not cancel.cancelled:
+                    self.upload_error = message
+                    self.is_uploading = False
+                    self.upload_progress = 0
+            return
+        finally:
+            finish_job(client, cancel)
+            # Only the converted dataset is kept, whether or not ingest succeeded;
+            # removing the upload also hands back the space reserved for it.
+            shutil.rmtree(path.parent, ignore_errors=True)
+        if not target:
+            claim(dataset_id, client)
         
-        self.is_uploading = False
-        self.upload_progress = 100
+        async with self:
+            if cancel.cancelled:
+                return
+            open_session(client, target or dataset_id)
+            if target:
+                self.appended_rows = delta.rows
+                self.uploaded_files = self.uploaded_files + [name]
+            else:
+                self.dataset_id = dataset_id
+                self.appended_rows = 0
+                self.uploaded_files = [name]
+                self.file_name = name
+            self.append_mode = False
+            self.file_size = format_size(profile.size_bytes)
+            self.row_count = profile.rows
+            self.column_count = len(profile.columns)
+            self.column_query = ""
+            self.column_page_index = 0
+            self._load_column_page()
+            self._load_duplicates()
+            self._load_quality()
+            self.file_analyzed = True
+            self.is_uploading = False
+            self.upload_progress = 100
     
-    async def generate_dashboard(self):
-        """Generate dashboard from uploaded data."""
-        self.is_generating = True
-        self.generation_progress = 0
+    def _load_column_page(self):
+        page = get_catalog(self.dataset_id).search(self.column_query, self.column_page_index, COLUMN_PAGE_SIZE)
+        self.column_page = page.entries
+        self.column_page_index = page.page
+        self.column_pages = page.pages
+        self.column_matches = page.total
+    
+    def _load_duplicates(self):
+        report = load_duplicates(self.dataset_id)
+        if report is None:
+            self.duplicate_rows = 0
+            self.duplicate_pct = 0.0
+            self.duplicate_examples = []
+            self.key_columns = []
+            return
+        self.duplicate_rows = report.duplicate_rows
+        self.duplicate_pct = round(100 * report.duplicate_rows / (report.rows or 1), 2)
+        self.duplicate_examples = [
+            {"values": " · ".join(example["values"].values()), "count": example["count"]}
+            for example in report.examples
+        ]
+        self.key_columns = [
+            {
+                "name": key.column,
+                "unique": key.unique,
+                "detail": "Unique key" if key.unique else f"{key.duplicates:,} repeated values",
+            }
+            for key in report.keys
+        ]
+    
+    def _load_quality(self):
+        quality = load_quality(self.dataset_id)
+        if quality is None or not quality.blocks:
+            self.quality_columns = []
+            self.missing_names = []
+            self.missing_matrix = []
+            self.missing_block_rows = 0
+            return
+        rows = quality.rows or 1
+        problems = []
+        for col in quality.columns:
+            counts = (col.nulls, col.empty, col.invalid, col.mismatched)
+            if any(counts):
+                problems.append((sum(counts), {
+                    "name": col.name,
+                    "null_pct": round(100 * col.nulls / rows, 2),
+                    "empty_pct": round(100 * col.empty / rows, 2),
+                    "invalid_pct": round(100 * col.invalid / rows, 2),
+                    "mismatched": col.mismatched,
+                }))
+        problems.sort(key=lambda item: item[0], reverse=True)
+        self.quality_columns = [entry for _, entry in problems[:QUALITY_COLUMNS]]
         
-        # Simulate dashboard generation progress
-        steps = [
-            ("Analyzing data structure...", 20),
-            ("Creating visualizations...", 40), 
-            ("Generating insights...", 60),
-            ("Building interactive charts...", 80),
-            ("Finalizing dashboard...", 100)
+        # Heatmap rows for the columns with the most missing values
+        missing = [(sum(block[i + 1] for block in quality.blocks), i) for i in range(len(quality.columns))]
+        top = [i for total, i in sorted(missing, reverse=True)[:QUALITY_COLUMNS] if total]
+        self.missing_names = [quality.columns[i].name for i in top]
+        # Cell opacity; any missing value shows, full red means all missing.
+        self.missing_matrix = [
+            [round(0.15 + 0.85 * block[i + 1] / block[0], 3) if block[i + 1] else 0.0 for block in quality.blocks]
+            for i in top
         ]
+        self.missing_block_rows = quality.block_rows
+    
+    def search_columns(self, query: str):
+        """Filter the column catalog by name."""
+        self.column_query = query
+        self.column_page_index = 0
+        self._load_column_page()
+    
+    def next_column_page(self):
+        self.column_page_index += 1
+        self._load_column_page()
+    
+    def prev_column_page(self):
+        self.column_page_index -= 1
+        self._load_column_page()
+    
+    def start_append(self):
+        """Return to the uploader to add new rows to the current dataset."""
+        self.append_mode = True
+        self.file_analyzed = False
+        self.dashboard_generated = False
+        self.upload_error = ""
+    
+    def cancel_append(self):
+        """Leave append mode and return to the current dataset."""
+        self.append_mode = False
+        self.file_analyzed = True
+        self.upload_error = ""
+    
+    def _apply_dashboard(self, dashboard: Dashboard):
+        self.charts = dashboard.charts
+        self.insights = dashboard.insights
+        self.time_column = dashboard.time_column
+        self.resolutions = dashboard.resolutions
+        self.time_resolution = dashboard.time_resolution
+        self.is_approximate = dashboard.approximate
+        self.sample_percent = round(dashboard.sample_fraction * 100, 1)
+    
+    @rx.event(background=True)
+    async def generate_dashboard(self):
+        """Generate dashboard from uploaded data.
         
-        for step, progress in steps:
-            self.generation_progress = progress
-            await rx.sleep(1)
+        Large datasets get an approximate dashboard from a small stratified
+        sample first, which is then replaced by refinements on growing
+        samples until the exact pass. Runs as a background task so
+        ``reset_trial`` can cancel it.
+        """
+        async with self:
+            client = self.router.session.client_token
+            dataset_id = self.dataset_id
+            title = self.file_name
+            self.dashboard_url = ""
+            self.snapshot_src = ""
+            self.thumbnail_src = ""
+            self.generation_error = ""
+            self.is_generating = True
+            self.generation_progress = 60
+            self.generation_step = "Creating visualizations..."
+        cancel = start_job(client, alive=lambda: client_connected(client))
+        touch(dataset_id)
         
-        self.dashboard_generated = True
-        self.is_generating = False
+        try:
+            for i, rows in enumerate(REFINE_SAMPLE_ROWS + (None,)):
+                dashboard = await asyncio.to_thread(build_dashboard, dataset_id, rows, cancel)
+                async with self:
+                    if cancel.cancelled:
+                        return
+                    self._apply_dashboard(dashboard)
+                    self.is_refining = dashboard.approximate
+                    if i == 0:
+                        self.generation_progress = 100
+                        self.generation_step = "Finalizing dashboard..."
+                        self.dashboard_generated = True
+                        self.is_generating = False
+                if not dashboard.approximate:
+                    break
+            # Viewers of the shared page get this artifact as-is, so the
+            # pipeline runs once however many people open the link.
+            dashboard_id = await asyncio.to_thread(publish_dashboard, dataset_id, dashboard, title)
+            async with self:
+                if cancel.cancelled:
+                    return
+                self.dashboard_url = dashboard_url(dashboard_id)
+                self.snapshot_src = image_src(dashboard_id, download=True)
+            await asyncio.to_thread(render_snapshot, dashboard_id, "webp", "thumb")
+            async with self:
+                if not cancel.cancelled:
+                    self.thumbnail_src = image_src(dashboard_id, "thumb", "webp")
+        except Cancelled:
+            return
+        except Exception:
+            logger.exception("Dashboard generation failed for dataset %s", dataset_id)
+            async with self:
+                if not cancel.cancelled:
+                    self.is_generating = False
+                    self.is_refining = False
+                    self.generation_progress = 0
+                    self.generation_step = ""
+                    self.generation_error = "Something went wrong while building the dashboard; please try again"
+        finally:
+            finish_job(client, cancel)
+    
+    def cancel_jobs(self):
+        """Stop any upload processing or dashboard generation for this tab."""
+        cancel_jobs(self.router.session.client_token)
+    
+    def set_resolution(self, level: str | list[str]):
+        """Switch time series charts to another cached rollup level."""
+        if level not in self.resolutions:
+            return
+        charts = []
+        for chart in self.charts:
+            if chart["kind"] == "line" and chart["x"] == self.time_column:
+                chart = {**chart, "every": level, "src": rollup_src(self.dataset_id, level, chart["y"])}
+            charts.append(chart)
+        self.charts = charts
+        self.time_resolution = level
     
     def reset_trial(self):
-        """Reset trial to initial state."""
+        """Reset trial to initial state, cancelling any running work."""
+        self.cancel_jobs()
+        close_session(self.router.session.client_token)
         self.uploaded_files = []
         self.file_analyzed = False
         self.dashboard_generated = False
@@ -81,7 +369,41 @@ class TrialState(rx.State):
         self.is_generating = False
         self.upload_progress = 0
         self.generation_progress = 0
+        self.generation_step = ""
+        self.generation_error = ""
+        self.insights = []
+        self.charts = []
+        self.is_approximate = False
+        self.is_refining = False
+        self.sample_percent = 100.0
+        self.dashboard_url = ""
+        self.snapshot_src = ""
+        self.thumbnail_src = ""
+        self.time_column = ""
+        self.resolutions = []
+        self.time_resolution = ""
+        self.column_query = ""
+        self.column_page = []
+        self.column_page_index = 0
+        self.column_pages = 1
+        self.column_matches = 0
+        self.duplicate_rows = 0
+        self.duplicate_pct = 0.0
+        self.duplicate_examples = []
+        self.key_columns = []
+        self.quality_columns = []
+        self.missing_names = []
+        self.missing_matrix = []
+        self.missing_block_rows = 0
+        self.pending_file = ""
         self.file_name = ""
+        self.file_size = ""
+        self.row_count = 0
+        self.column_count = 0
+        self.dataset_id = ""
+        self.append_mode = False
+        self.appended_rows = 0
+        self.upload_error = ""
 
 def upload_section() -> rx.Component:
     """File upload section component."""
@@ -93,9 +415,7 @@ def upload_section() -> rx.Component:
                     "cloud-upload", 
                     size=48, 
                     color="#3B82F6",
-                    style={
-                        "animation": "float 3s ease-in-out infinite",
-                    }
+                    class_name="float",
                 ),
                 rx.heading(
                     "Upload Your Data",
@@ -104,11 +424,20 @@ def upload_section() -> rx.Component:
                     color="#111827",
                     text_align="center",
                 ),
-                rx.text(
-                    "Drop your CSV or Excel files here to get started",
-                    size="3",
-                    color="#374151",
-                    text_align="center",
+                rx.cond(
+                    TrialState.append_mode,
+                    rx.text(
+                        f"Drop a file with new rows to append to {TrialState.file_name}",
+                        size="3",
+                        color="#374151",
+                        text_align="center",
+                    ),
+                    rx.text(
+                        "Drop your CSV or Excel files here to get started",
+                        size="3",
+                        color="#374151",
+                        text_align="center",
+                    ),
                 ),
                 spacing="3",
                 align_items="center",
@@ -137,7 +466,7 @@ def upload_section() -> rx.Component:
                     ),
                     # Upload interface
                     rx.vstack(
-                        rx.upload(
+                        chunked_upload(
                             rx.vstack(
                                 rx.icon("file-plus", size=32, color="#6b7280"),
                                 rx.text(
@@ -151,36 +480,34 @@ def upload_section() -> rx.Component:
                                     size="2",
                                     color="#9ca3af",
                                 ),
+                                rx.text(
+                                    "Compressed .gz, .zst, .bz2 and .zip files are unpacked automatically",
+                                    size="1",
+                                    color="#9ca3af",
+                                ),
                                 spacing="3",
                                 align_items="center",
                             ),
-                            id="upload1",
-                            border="2px dashed #d1d5db",
-                            padding="3rem 2rem",
-                            border_radius="16px",
-                            width="100%",
-                            max_width="500px",
-                            style={
-                                "_hover": {
-                                    "border_color": "#3B82F6",
-                                    "background": "rgba(59, 130, 246, 0.05)",
-                                },
-                                "transition": "all 0.3s ease",
-                                "cursor": "pointer",
-                            }
+                            on_upload=TrialState.finish_chunked_upload,
+                            on_error=TrialState.upload_failed,
                         ),
-                        rx.button(
-                            "Process Upload",
-                            on_click=lambda: TrialState.handle_upload(rx.upload_files(upload_id="upload1")),
-                            size="3",
-                            style={
-                                "background": "linear-gradient(45deg, #3B82F6, #8B5CF6)",
-                                "cursor": "pointer",
-                                "_hover": {
-                                    "transform": "translateY(-2px)",
-                                    "box_shadow": "0 8px 20px rgba(59, 130, 246, 0.3)",
-                                }
-                            }
+                        rx.cond(
+                            TrialState.upload_error != "",
+                            rx.text(
+                                TrialState.upload_error,
+                                size="2",
+                                color="#ef4444",
+                            ),
+                        ),
+                        rx.cond(
+                            TrialState.append_mode,
+                            rx.button(
+                                "Cancel",
+                                on_click=TrialState.cancel_append,
+                                variant="ghost",
+                                size="2",
+                                color="#6b7280",
+                            ),
                         ),
                         spacing="4",
                         align_items="center",
@@ -194,9 +521,7 @@ def upload_section() -> rx.Component:
             align_items="center",
             padding="3rem 2rem",
         ),
-        background="white",
-        border_radius="20px",
-        box_shadow="0 10px 40px rgba(0,0,0,0.08)",
+        class_name="card",
         width="100%",
         max_width="600px",
     )
@@ -298,7 +623,7 @@ def analysis_section() -> rx.Component:
                 wrap="wrap",
             ),
             
-            # Sample columns preview
+            # Column catalog
             rx.vstack(
                 rx.text(
                     "Detected Columns",
@@ -306,63 +631,302 @@ def analysis_section() -> rx.Component:
                     weight="bold",
                     color="#111827",
                 ),
+                rx.cond(
+                    TrialState.column_count > COLUMN_PAGE_SIZE,
+                    rx.input(
+                        placeholder="Search columns...",
+                        value=TrialState.column_query,
+                        on_change=TrialState.search_columns,
+                        width="100%",
+                        max_width="320px",
+                    ),
+                ),
                 rx.hstack(
                     rx.foreach(
-                        TrialState.sample_columns[:5],  # Show first 5 columns
-                        lambda col: rx.badge(
-                            col,
-                            variant="soft",
-                            color_scheme="blue",
-                            size="2",
-                        )
-                    ),
-                    rx.cond(
-                        TrialState.sample_columns.length() > 5,
-                        rx.badge(
-                            f"+{TrialState.sample_columns.length() - 5} more",
-                            variant="outline",
-                            size="2",
+                        TrialState.column_page,
+                        lambda col: rx.tooltip(
+                            rx.badge(
+                                col["name"],
+                                variant="soft",
+                                color_scheme="blue",
+                                size="2",
+                            ),
+                            content=f"{col['dtype']} · {col['distinct']} distinct · {col['null_pct']}% missing",
                         )
                     ),
                     spacing="2",
                     wrap="wrap",
                     justify="center",
                 ),
+                rx.cond(
+                    TrialState.column_pages > 1,
+                    rx.hstack(
+                        rx.icon_button(
+                            rx.icon("chevron-left", size=16),
+                            on_click=TrialState.prev_column_page,
+                            disabled=TrialState.column_page_index == 0,
+                            variant="ghost",
+                            size="1",
+                        ),
+                        rx.text(
+                            f"Page {TrialState.column_page_index + 1} of {TrialState.column_pages} · {TrialState.column_matches} columns",
+                            size="1",
+                            color="#6b7280",
+                        ),
+                        rx.icon_button(
+                            rx.icon("chevron-right", size=16),
+                            on_click=TrialState.next_column_page,
+                            disabled=TrialState.column_page_index + 1 >= TrialState.column_pages,
+                            variant="ghost",
+                            size="1",
+                        ),
+                        spacing="2",
+                        align_items="center",
+                    ),
+                ),
                 spacing="3",
                 align_items="center",
+                width="100%",
             ),
             
-            # Generate dashboard button
-            rx.button(
-                rx.hstack(
-                    rx.icon("zap", size=18),
-                    rx.text("Generate Dashboard"),
-                    spacing="2"
+            # Duplicate rows and candidate keys
+            rx.vstack(
+                rx.text(
+                    "Duplicates & Keys",
+                    size="3",
+                    weight="bold",
+                    color="#111827",
                 ),
-                size="3",
-                on_click=TrialState.generate_dashboard,
-                style={
-                    "background": "linear-gradient(45deg, #22c55e, #3B82F6)",
-                    "cursor": "pointer",
-                    "_hover": {
-                        "transform": "translateY(-2px)",
-                        "box_shadow": "0 8px 20px rgba(34, 197, 94, 0.3)",
-                    }
-                }
+                rx.cond(
+                    TrialState.duplicate_rows > 0,
+                    rx.vstack(
+                        rx.hstack(
+                            rx.icon("copy", size=16, color="#f59e0b"),
+                            rx.text(
+                                f"{TrialState.duplicate_rows:,} duplicate rows ({TrialState.duplicate_pct}%)",
+                                size="2",
+                                weight="medium",
+                                color="#111827",
+                            ),
+                            spacing="2",
+                            align_items="center",
+                        ),
+                        rx.foreach(
+                            TrialState.duplicate_examples,
+                            lambda example: rx.text(
+                                f"{example['count']}× {example['values']}",
+                                size="1",
+                                color="#6b7280",
+                                trim="both",
+                                max_width="100%",
+                                overflow="hidden",
+                                text_overflow="ellipsis",
+                                white_space="nowrap",
+                            ),
+                        ),
+                        spacing="1",
+                        align_items="center",
+                        width="100%",
+                    ),
+                    rx.hstack(
+                        rx.icon("circle-check", size=16, color="#22c55e"),
+                        rx.text(
+                            "No duplicate rows",
+                            size="2",
+                            color="#6b7280",
+                        ),
+                        spacing="2",
+                        align_items="center",
+                    ),
+                ),
+                rx.cond(
+                    TrialState.key_columns.length() > 0,
+                    rx.hstack(
+                        rx.foreach(
+                            TrialState.key_columns,
+                            lambda key: rx.tooltip(
+                                rx.badge(
+                                    rx.icon("key-round", size=12),
+                                    key["name"],
+                                    variant="soft",
+                                    color_scheme=rx.cond(key["unique"], "green", "orange"),
+                                    size="2",
+                                ),
+                                content=key["detail"],
+                            )
+                        ),
+                        spacing="2",
+                        wrap="wrap",
+                        justify="center",
+                    ),
+                ),
+                spacing="3",
+                align_items="center",
+                width="100%",
+            ),
+            
+            # Data quality
+            rx.vstack(
+                rx.text(
+                    "Data Quality",
+                    size="3",
+                    weight="bold",
+                    color="#111827",
+                ),
+                rx.cond(
+                    TrialState.quality_columns.length() > 0,
+                    rx.vstack(
+                        rx.foreach(
+                            TrialState.quality_columns,
+                            lambda col: rx.hstack(
+                                rx.text(
+                                    col["name"],
+                                    size="2",
+                                    weight="medium",
+                                    color="#111827",
+                                ),
+                                rx.text(
+                                    f"{col['null_pct']}% null · {col['empty_pct']}% empty · {col['invalid_pct']}% invalid · {col['mismatched']} mismatched",
+                                    size="1",
+                                    color="#6b7280",
+                                ),
+                                spacing="3",
+                                align_items="center",
+                            ),
+                        ),
+                        spacing="1",
+                        align_items="center",
+                    ),
+                    rx.hstack(
+                        rx.icon("circle-check", size=16, color="#22c55e"),
+                        rx.text(
+                            "No missing or invalid values",
+                            size="2",
+                            color="#6b7280",
+                        ),
+                        spacing="2",
+                        align_items="center",
+                    ),
+                ),
+                # Missingness heatmap: one row per column, one cell per row block
+                rx.cond(
+                    TrialState.missing_matrix.length() > 0,
+                    rx.vstack(
+                        rx.foreach(
+                            TrialState.missing_matrix,
+                            lambda cells, i: rx.hstack(
+                                rx.text(
+                                    TrialState.missing_names[i],
+                                    size="1",
+                                    color="#6b7280",
+                                    width="100px",
+                                    trim="both",
+                                    overflow="hidden",
+                                    text_overflow="ellipsis",
+                                    white_space="nowrap",
+                                ),
+                                rx.hstack(
+                                    rx.foreach(
+                                        cells,
+                                        lambda share: rx.box(
+                                            flex="1",
+                                            height="12px",
+                                            background=f"rgba(239, 68, 68, {share})",
+                                        ),
+                                    ),
+                                    spacing="0",
+                                    flex="1",
+                                    background="#f3f4f6",
+                                ),
+                                spacing="2",
+                                align_items="center",
+                                width="100%",
+                            ),
+                        ),
+                        rx.text(
+                            f"Missing values per block of {TrialState.missing_block_rows:,} rows",
+                            size="1",
+                            color="#9ca3af",
+                        ),
+                        spacing="1",
+                        width="100%",
+                    ),
+                ),
+                spacing="3",
+                align_items="center",
+                width="100%",
+            ),
+            
+            # First rows, fetched as Arrow from the API
+            rx.vstack(
+                rx.text(
+                    "Preview",
+                    size="3",
+                    weight="bold",
+                    color="#111827",
+                ),
+                arrow_table(src=f"/api/datasets/{TrialState.dataset_id}/preview"),
+                spacing="3",
+                align_items="center",
+                width="100%",
+            ),
+            
+            rx.cond(
+                TrialState.appended_rows > 0,
+                rx.text(
+                    f"+{TrialState.appended_rows:,} rows appended",
+                    size="2",
+                    color="#22c55e",
+                    weight="medium",
+                ),
+            ),
+            
+            rx.cond(
+                TrialState.generation_error != "",
+                rx.text(
+                    TrialState.generation_error,
+                    size="2",
+                    color="#ef4444",
+                ),
+            ),
+            
+            # Generate dashboard / append buttons
+            rx.hstack(
+                rx.button(
+                    rx.hstack(
+                        rx.icon("zap", size=18),
+                        rx.text("Generate Dashboard"),
+                        spacing="2"
+                    ),
+                    size="3",
+                    on_click=TrialState.generate_dashboard,
+                    class_name="btn-gradient-green",
+                ),
+                rx.button(
+                    rx.hstack(
+                        rx.icon("file-plus", size=18),
+                        rx.text("Append Data"),
+                        spacing="2"
+                    ),
+                    size="3",
+                    variant="outline",
+                    color="#3B82F6",
+                    border_color="#3B82F6",
+                    on_click=TrialState.start_append,
+                    class_name="btn-lift btn-tint",
+                ),
+                spacing="4",
+                wrap="wrap",
+                justify="center",
             ),
             
             spacing="6",
             align_items="center",
             padding="2rem",
         ),
-        background="white",
-        border_radius="20px",
-        box_shadow="0 10px 40px rgba(0,0,0,0.08)",
+        class_name="card slide-in",
         width="100%",
         max_width="600px",
-        style={
-            "animation": "slideIn 0.5s ease-out",
-        }
     )
 
 def dashboard_generation() -> rx.Component:
@@ -373,9 +937,7 @@ def dashboard_generation() -> rx.Component:
                 "settings",
                 size=48,
                 color="#3B82F6",
-                style={
-                    "animation": "spin 2s linear infinite",
-                }
+                class_name="spin",
             ),
             rx.heading(
                 "Generating Your Dashboard",
@@ -401,13 +963,16 @@ def dashboard_generation() -> rx.Component:
                 color="#3B82F6",
                 weight="medium",
             ),
+            rx.text(
+                TrialState.generation_step,
+                size="2",
+                color="#6b7280",
+            ),
             spacing="4",
             align_items="center",
             padding="3rem 2rem",
         ),
-        background="white",
-        border_radius="20px",
-        box_shadow="0 10px 40px rgba(0,0,0,0.08)",
+        class_name="card",
         width="100%",
         max_width="500px",
     )
@@ -420,9 +985,7 @@ def dashboard_ready() -> rx.Component:
                 "check-circle",
                 size=64,
                 color="#22c55e",
-                style={
-                    "animation": "bounce 1s ease-in-out",
-                }
+                class_name="bounce",
             ),
             rx.heading(
                 "Dashboard Ready!",
@@ -438,41 +1001,99 @@ def dashboard_ready() -> rx.Component:
                 text_align="center",
             ),
             
+            # Key insights
+            rx.cond(
+                TrialState.insights.length() > 0,
+                rx.vstack(
+                    rx.text(
+                        "Key Insights",
+                        size="3",
+                        weight="bold",
+                        color="#111827",
+                    ),
+                    rx.foreach(
+                        TrialState.insights,
+                        lambda insight: rx.hstack(
+                            rx.icon("lightbulb", size=16, color="#F59E0B"),
+                            rx.vstack(
+                                rx.text(insight["title"], size="2", weight="medium", color="#111827"),
+                                rx.text(insight["detail"], size="1", color="#6b7280"),
+                                spacing="0",
+                                align_items="flex-start",
+                            ),
+                            spacing="2",
+                            align_items="flex-start",
+                            width="100%",
+                        )
+                    ),
+                    spacing="2",
+                    width="100%",
+                    padding="1rem",
+                    background="rgba(245, 158, 11, 0.05)",
+                    border_radius="12px",
+                ),
+            ),
+            
+            # Snapshot of the published dashboard
+            rx.cond(
+                TrialState.thumbnail_src != "",
+                rx.link(
+                    api_image(
+                        src=TrialState.thumbnail_src,
+                        alt="Dashboard snapshot",
+                        class_name="card-sm card-hover",
+                        width="100%",
+                    ),
+                    href=TrialState.dashboard_url,
+                    is_external=True,
+                    width="100%",
+                ),
+            ),
+            
+            rx.cond(
+                TrialState.generation_error != "",
+                rx.text(
+                    TrialState.generation_error,
+                    size="2",
+                    color="#ef4444",
+                ),
+            ),
+            
             # Action buttons
             rx.hstack(
-                rx.button(
-                    rx.hstack(
-                        rx.icon("external-link", size=18),
-                        rx.text("View Dashboard"),
-                        spacing="2"
+                rx.link(
+                    rx.button(
+                        rx.hstack(
+                            rx.cond(
+                                (TrialState.dashboard_url == "") & (TrialState.generation_error == ""),
+                                rx.spinner(size="2"),
+                                rx.icon("external-link", size=18),
+                            ),
+                            rx.text("View Dashboard"),
+                            spacing="2"
+                        ),
+                        size="3",
+                        disabled=TrialState.dashboard_url == "",
+                        class_name="btn-gradient-green",
                     ),
-                    size="3",
-                    style={
-                        "background": "linear-gradient(45deg, #22c55e, #3B82F6)",
-                        "cursor": "pointer",
-                        "_hover": {
-                            "transform": "translateY(-2px)",
-                            "box_shadow": "0 8px 20px rgba(34, 197, 94, 0.3)",
-                        }
-                    }
+                    href=TrialState.dashboard_url,
+                    is_external=True,
                 ),
-                rx.button(
-                    rx.hstack(
-                        rx.icon("download", size=18),
-                        rx.text("Export"),
-                        spacing="2"
+                api_link(
+                    rx.button(
+                        rx.hstack(
+                            rx.icon("download", size=18),
+                            rx.text("Export"),
+                            spacing="2"
+                        ),
+                        size="3",
+                        variant="outline",
+                        color="#8B5CF6",
+                        border_color="#8B5CF6",
+                        disabled=TrialState.snapshot_src == "",
+                        class_name="btn-lift btn-tint",
                     ),
-                    size="3",
-                    variant="outline",
-                    color="#8B5CF6",
-                    border_color="#8B5CF6",
-                    style={
-                        "cursor": "pointer",
-                        "_hover": {
-                            "transform": "translateY(-2px)",
-                            "background": "rgba(139, 92, 246, 0.1)",
-                        }
-                    }
+                    href=TrialState.snapshot_src,
                 ),
                 spacing="4",
             ),
@@ -496,14 +1117,51 @@ def dashboard_ready() -> rx.Component:
             align_items="center",
             padding="3rem 2rem",
         ),
-        background="white",
-        border_radius="20px",
-        box_shadow="0 10px 40px rgba(0,0,0,0.08)",
+        class_name="card slide-in",
         width="100%",
         max_width="500px",
-        style={
-            "animation": "slideIn 0.5s ease-out",
-        }
+    )
+
+def dashboard_charts() -> rx.Component:
+    """Grid of generated charts with a time resolution switcher."""
+    return rx.vstack(
+        rx.cond(
+            TrialState.is_approximate,
+            rx.badge(
+                rx.hstack(
+                    rx.cond(TrialState.is_refining, rx.spinner(size="1")),
+                    rx.text(f"Approximate · based on a {TrialState.sample_percent}% sample"),
+                    rx.cond(TrialState.is_refining, rx.text("· refining...")),
+                    spacing="2",
+                    align_items="center",
+                ),
+                variant="soft",
+                color_scheme="amber",
+                size="2",
+            ),
+        ),
+        rx.cond(
+            TrialState.resolutions.length() > 1,
+            rx.segmented_control.root(
+                rx.foreach(
+                    TrialState.resolutions,
+                    lambda level: rx.segmented_control.item(level.capitalize(), value=level),
+                ),
+                value=TrialState.time_resolution,
+                on_change=TrialState.set_resolution,
+            ),
+        ),
+        rx.grid(
+            rx.foreach(TrialState.charts, chart_card),
+            columns=rx.breakpoints(initial="1", md="2"),
+            spacing="4",
+            width="100%",
+        ),
+        spacing="4",
+        align_items="center",
+        width="100%",
+        max_width="1000px",
+        class_name="slide-in",
     )
 
 @rx.page(route="/trial", title="Try DataBoard - Free Trial")
@@ -521,13 +1179,7 @@ def trial() -> rx.Component:
                             "Try DataBoard Free",
                             size="8",
                             weight="bold",
-                            background="linear-gradient(45deg, #3B82F6, #8B5CF6, #EC4899)",
-                            background_clip="text",
-                            color="transparent",
-                            text_align="center",
-                            style={
-                                "animation": "fadeInUp 1s ease-out",
-                            }
+                            class_name="gradient-text fade-in-up",
                         ),
                         rx.text(
                             "Upload your data and see the magic happen in real-time",
@@ -551,7 +1203,14 @@ def trial() -> rx.Component:
                     # Dynamic content based on state
                     rx.cond(
                         TrialState.dashboard_generated,
-                        dashboard_ready(),
+                        rx.vstack(
+                            dashboard_ready(),
+                            dashboard_charts(),
+                            spacing="6",
+                            align_items="center",
+                            width="100%",
+                            padding_bottom="3rem",
+                        ),
                         rx.cond(
                             TrialState.is_generating,
                             dashboard_generation(),
@@ -567,69 +1226,16 @@ def trial() -> rx.Component:
                     align_items="center",
                     width="100%",
                 ),
-                max_width="1200px",
-                margin="0 auto",
-                width="100%",
+                class_name="section-content",
             ),
             
             # Full-width background matching other sections
-            background="linear-gradient(135deg, #ffffff 0%, #f8fafc 100%)",
-            width="100vw",
-            min_height="80vh",
+            class_name="section",
             padding="0 2rem",
-            
-            # Custom CSS animations
-            style={
-                "@keyframes fadeInUp": {
-                    "from": {
-                        "opacity": "0",
-                        "transform": "translateY(30px)",
-                    },
-                    "to": {
-                        "opacity": "1",
-                        "transform": "translateY(0)",
-                    },
-                },
-                "@keyframes slideIn": {
-                    "from": {
-                        "opacity": "0",
-                        "transform": "scale(0.95)",
-                    },
-                    "to": {
-                        "opacity": "1",
-                        "transform": "scale(1)",
-                    },
-                },
-                "@keyframes float": {
-                    "0%, 100%": {
-                        "transform": "translateY(0px)",
-                    },
-                    "50%": {
-                        "transform": "translateY(-10px)",
-                    },
-                },
-                "@keyframes spin": {
-                    "from": {
-                        "transform": "rotate(0deg)",
-                    },
-                    "to": {
-                        "transform": "rotate(360deg)",
-                    },
-                },
-                "@keyframes bounce": {
-                    "0%, 20%, 53%, 80%, 100%": {
-                        "transform": "translateY(0)",
-                    },
-                    "40%, 43%": {
-                        "transform": "translateY(-10px)",
-                    },
-                    "70%": {
-                        "transform": "translateY(-5px)",
-                    },
-                },
-            },
         ),
         
         width="100%",
         spacing="0",
+        # Leaving the page stops any work still running for this tab
+        on_unmount=TrialState.cancel_jobs,
     )
\ No newline at end of file
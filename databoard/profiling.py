@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import cProfile
+import dataclasses
+import functools
+import inspect
+import json
+import logging
+import logging.handlers
+import os
+import pstats
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+import reflex as rx
+from reflex.state import BaseState
+from reflex.utils.format import json_dumps
+
+logger = logging.getLogger(__name__)
+
+# "1" records the timings and delta sizes of every event; "cprofile" also
+# profiles each handler and keeps the top frames of slow events.
+PROFILE_ENV = "DATABOARD_PROFILE"
+# Events taking longer than this many milliseconds count as slow.
+SLOW_ENV = "DATABOARD_PROFILE_SLOW"
+# Records are appended to this file, one JSON object per line.
+LOG_ENV = "DATABOARD_PROFILE_LOG"
+SLOW_MS = 250.0
+LOG_FILE = "profile.jsonl"
+LOG_BYTES = 10 * 1024**2
+LOG_BACKUPS = 3
+TOP_FRAMES = 15
+RECENT_EVENTS = 200
+
+_current: contextvars.ContextVar[EventRecord | None] = contextvars.ContextVar("profiled_event", default=None)
+_recent: deque[dict] = deque(maxlen=RECENT_EVENTS)
+_handlers: dict[str, HandlerStats] = {}
+_fields: dict[str, int] = {}
+_state_names: dict[str, str] = {}
+
+
+def enabled() -> bool:
+    return os.environ.get(PROFILE_ENV, "") not in ("", "0")
+
+
+@dataclass
+class HandlerStats:
+    """Totals over every profiled run of one event handler."""
+
+    count: int = 0
+    errors: int = 0
+    wall: float = 0.0
+    cpu: float = 0.0
+    max_wall: float = 0.0
+    delta_bytes: int = 0
+
+
+@dataclass
+class EventRecord:
+    """Cost of one event, from the handler being called to its last update."""
+
+    handler: str
+    token: str
+    started: float = field(default_factory=time.time)
+    wall_start: float = field(default_factory=time.perf_counter)
+    wall: float = 0.0
+    # CPU time of the event loop thread while the handler itself ran; work
+    # handed to other threads (``asyncio.to_thread``) only shows in ``wall``.
+    cpu: float = 0.0
+    delta_bytes: int = 0
+    fields: dict[str, int] = field(default_factory=dict)
+    error: str | None = None
+    done: bool = False
+    profiler: cProfile.Profile | None = None
+
+    @contextlib.contextmanager
+    def step(self):
+        """Time one uninterrupted stretch of the handler, between two awaits."""
+        cpu = time.thread_time()
+        if self.profiler is not None:
+            self.profiler.enable()
+        try:
+            yield
+        finally:
+            if self.profiler is not None:
+                self.profiler.disable()
+            self.cpu += time.thread_time() - cpu
+
+    def add_delta(self, delta: dict):
+        for state, values in delta.items():
+            name = _state_names.get(state, state.rpartition(".")[2])
+            for var, value in values.items():
+                size = len(json_dumps(value))
+                key = f"{name}.{var.removesuffix('_rx_state_')}"
+                self.fields[key] = self.fields.get(key, 0) + size
+                self.delta_bytes += size
+
+    def finish_handler(self, error: BaseException | None = None):
+        self.wall = time.perf_counter() - self.wall_start
+        if error is not None:
+            self.error = type(error).__name__
+        self.done = True
+
+
+def _top_frames(profiler: cProfile.Profile) -> list[dict]:
+    stats = pstats.Stats(profiler).stats  # type: ignore[attr-defined]
+    rows = [item for item in stats.items() if not item[0][0].endswith("profiling.py")]
+    rows.sort(key=lambda item: item[1][3], reverse=True)
+    return [
+        {
+            "function": f"{path}:{line}({name})",
+            "calls": calls,
+            "tottime_ms": round(tottime * 1000, 3),
+            "cumtime_ms": round(cumtime * 1000, 3),
+        }
+        for (path, line, name), (_, calls, tottime, cumtime, _) in rows[:TOP_FRAMES]
+    ]
+
+
+def _finish(record: EventRecord):
+    """Fold a finished event into the totals and write it to the log."""
+    stats = _handlers.setdefault(record.handler, HandlerStats())
+    stats.count += 1
+    stats.errors += record.error is not None
+    stats.wall += record.wall
+    stats.cpu += record.cpu
+    stats.max_wall = max(stats.max_wall, record.wall)
+    stats.delta_bytes += record.delta_bytes
+    for key, size in record.fields.items():
+        _fields[key] = _fields.get(key, 0) + size
+
+    entry = {
+        "time": record.started,
+        "handler": record.handler,
+        "token": record.token,
+        "wall_ms": round(record.wall * 1000, 3),
+        "cpu_ms": round(record.cpu * 1000, 3),
+        "delta_bytes": record.delta_bytes,
+        "fields": dict(sorted(record.fields.items(), key=lambda item: item[1], reverse=True)),
+        "error": record.error,
+    }
+    slow = float(os.environ.get(SLOW_ENV, SLOW_MS))
+    if record.profiler is not None and record.wall * 1000 >= slow:
+        entry["frames"] = _top_frames(record.profiler)
+    _recent.append(entry)
+    logger.info(json.dumps(entry))
+
+
+def _begin(handler: str, state) -> EventRecord | None:
+    """Start recording an event, unless the handler runs inside another one."""
+    current = _current.get()
+    if current is not None and not current.done:
+        return None
+    token = state.router.session.client_token
+    record = EventRecord(handler, token)
+    if os.environ.get(PROFILE_ENV) == "cprofile":
+        record.profiler = cProfile.Profile()
+    _current.set(record)
+    return record
+
+
+class _Timed:
+    """Await a coroutine, timing each step it runs on the event loop."""
+
+    def __init__(self, coro, record: EventRecord):
+        self.coro = coro
+        self.record = record
+
+    def __await__(self):
+        value, error = None, None
+        while True:
+            with self.record.step():
+                try:
+                    future = self.coro.send(value) if error is None else self.coro.throw(error)
+                except StopIteration as stop:
+                    return stop.value
+            value, error = None, None
+            try:
+                value = yield future
+            except BaseException as e:
+                error = e
+
+
+def _profiled(fn, name: str):
+    """Wrap an event handler function to record each call as an event."""
+    if inspect.isasyncgenfunction(fn):
+
+        @functools.wraps(fn)
+        async def wrapper(self, *args, **kwargs):
+            record = _begin(name, self)
+            if record is None:
+                async for event in fn(self, *args, **kwargs):
+                    yield event
+                return
+            error = None
+            try:
+                events = fn(self, *args, **kwargs)
+                while True:
+                    try:
+                        event = await _Timed(events.__anext__(), record)
+                    except StopAsyncIteration:
+                        break
+                    yield event
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                record.finish_handler(error)
+
+    elif inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def wrapper(self, *args, **kwargs):
+            record = _begin(name, self)
+            if record is None:
+                return await fn(self, *args, **kwargs)
+            error = None
+            try:
+                return await _Timed(fn(self, *args, **kwargs), record)
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                record.finish_handler(error)
+
+    elif inspect.isgeneratorfunction(fn):
+
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            record = _begin(name, self)
+            if record is None:
+                return (yield from fn(self, *args, **kwargs))
+            error = None
+            try:
+                events = fn(self, *args, **kwargs)
+                while True:
+                    with record.step():
+                        try:
+                            event = next(events)
+                        except StopIteration as stop:
+                            return stop.value
+                    yield event
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                record.finish_handler(error)
+
+    else:
+
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            record = _begin(name, self)
+            if record is None:
+                return fn(self, *args, **kwargs)
+            error = None
+            try:
+                with record.step():
+                    return fn(self, *args, **kwargs)
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                record.finish_handler(error)
+
+    return wrapper
+
+
+class ProfileMiddleware(rx.Middleware):
+    """Closes each event's record once its final update is on its way out."""
+
+    async def preprocess(self, app, state, event):
+        return None
+
+    async def postprocess(self, app, state, event, update):
+        record = _current.get()
+        # Background tasks send every update as final, so wait for the
+        # handler to return as well.
+        if record is not None and record.done and update.final:
+            _current.set(None)
+            _finish(record)
+        return update
+
+
+def _count_delta(get_resolved_delta):
+    @functools.wraps(get_resolved_delta)
+    async def wrapper(self):
+        delta = await get_resolved_delta(self)
+        record = _current.get()
+        if record is not None:
+            record.add_delta(delta)
+        return delta
+
+    return wrapper
+
+
+def install(app: rx.App, *states: type[BaseState]):
+    """Profile every event handler of ``states`` for as long as the app runs.
+
+    Each event records its wall time, the CPU time its handler spent on
+    the event loop and the serialized size of every state delta sent to
+    the client while it ran, broken down by state field. Records go to a
+    rotating JSON lines log and to ``summary()``.
+    """
+    _state_names[rx.State.get_full_name()] = rx.State.__name__
+    for state in states:
+        _state_names[state.get_full_name()] = state.__name__
+        for name, handler in list(state.event_handlers.items()):
+            if name == "setvar" or handler.fn is None:
+                continue
+            profiled = _profiled(handler.fn, f"{state.__name__}.{name}")
+            state.event_handlers[name] = dataclasses.replace(handler, fn=profiled)
+    # Every delta, whether returned by a handler or sent from an
+    # ``async with self`` block of a background task, is computed here.
+    # It is private to Reflex, so check it is still there before patching.
+    resolve = getattr(BaseState, "_get_resolved_delta", None)
+    if inspect.iscoroutinefunction(resolve):
+        BaseState._get_resolved_delta = _count_delta(resolve)
+    else:
+        logger.warning(
+            "BaseState._get_resolved_delta is missing or no longer a coroutine in this Reflex "
+            "version; profiling records timings without state delta sizes"
+        )
+    app.add_middleware(ProfileMiddleware())
+
+    log = logging.handlers.RotatingFileHandler(
+        os.environ.get(LOG_ENV, LOG_FILE), maxBytes=LOG_BYTES, backupCount=LOG_BACKUPS
+    )
+    log.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(log)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def summary() -> dict:
+    """Per-handler and per-field totals of this worker, costliest first."""
+    handlers = sorted(_handlers.items(), key=lambda item: item[1].wall, reverse=True)
+    return {
+        "handlers": [
+            {
+                "handler": name,
+                "count": stats.count,
+                "errors": stats.errors,
+                "wall_ms": round(stats.wall * 1000, 3),
+                "mean_wall_ms": round(stats.wall / stats.count * 1000, 3),
+                "max_wall_ms": round(stats.max_wall * 1000, 3),
+                "cpu_ms": round(stats.cpu * 1000, 3),
+                "delta_bytes": stats.delta_bytes,
+            }
+            for name, stats in handlers
+        ],
+        "fields": [
+            {"field": key, "bytes": size}
+            for key, size in sorted(_fields.items(), key=lambda item: item[1], reverse=True)
+        ],
+        "recent": list(_recent),
+    }
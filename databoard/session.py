@@ -0,0 +1,16 @@
+def client_connected(token: str) -> bool:
+    """Whether the browser tab behind a client token still has a live websocket.
+
+    With several workers the tab may have reconnected to another one; the
+    Redis token registry shared by all workers is consulted in that case.
+    """
+    try:
+        from reflex.utils.prerequisites import get_and_validate_app, get_redis_sync
+
+        namespace = get_and_validate_app().app.event_namespace
+        if namespace is None or token in namespace.token_to_sid:
+            return True
+        redis = get_redis_sync()
+        return redis is not None and bool(redis.exists(f"{token}_sid"))
+    except Exception:
+        return True
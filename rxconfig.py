@@ -2,6 +2,9 @@ import reflex as rx
 
 config = rx.Config(
     app_name="databoard",
+    # Several backend workers can serve the app when REFLEX_REDIS_URL points
+    # at a shared Redis and REFLEX_UPLOADED_FILES_DIR at a filesystem that
+    # every worker mounts; see README.md.
     plugins=[
         rx.plugins.SitemapPlugin(),
         rx.plugins.TailwindV4Plugin(),
@@ -0,0 +1,29 @@
+import polars as pl
+import pytest
+
+from databoard.analysis.backend import BACKENDS, Backend
+from databoard.analysis.charts import ChartSpec
+
+
+@pytest.mark.parametrize("name", sorted(BACKENDS))
+def test_histogram_keeps_empty_bins(name):
+    lf = pl.LazyFrame({"quantity": list(range(1, 10)) * 3 + [None]})
+    spec = ChartSpec("hist-quantity", "histogram", "Quantity", "quantity", agg="count", bins=20, low=1.0, high=9.0)
+
+    (frame,) = BACKENDS[name]().chart_data(lf, [spec])
+
+    assert frame.height == 20
+    assert frame["x"].to_list() == pytest.approx([1 + i * 0.4 for i in range(20)])
+    counts = frame["y"].to_list()
+    assert sum(counts) == 27
+    assert counts[1] == 0
+    assert [i for i, count in enumerate(counts) if count] == [0, 2, 5, 7, 10, 12, 15, 17, 19]
+
+
+def test_incomplete_backend_fails_at_construction():
+    class ChartsOnly(Backend):
+        def chart_data(self, lf, specs, weight=None, cancel=None):
+            return []
+
+    with pytest.raises(TypeError, match="abstract"):
+        ChartsOnly()
@@ -0,0 +1,32 @@
+from databoard.data import ingest
+from databoard.data.duplicates import find_duplicates
+from databoard.data.store import hash_buckets, load_duplicates, scan_dataset
+
+
+def write(path, rows):
+    path.parent.mkdir(exist_ok=True)
+    path.write_text("id,city,amount\n" + "".join(f"{i},{city},{amount}\n" for i, city, amount in rows))
+    return path
+
+
+def test_append_updates_duplicates_incrementally(tmp_path, monkeypatch):
+    first = [(i, f"c{i % 7}", i % 5) for i in range(400)] + [(1, "c1", 1)] * 2
+    dataset_id, _ = ingest.ingest_upload(write(tmp_path / "up" / "a.csv", first))
+    before = load_duplicates(dataset_id)
+    assert before.duplicate_rows == 2
+    assert before.key_columns == ["id"]
+
+    def recount(*args):
+        raise AssertionError("append rescanned every bucket")
+
+    monkeypatch.setattr(ingest, "_save_duplicates", recount)
+    # Repeats of stored rows, a row repeated only among the new ones, and new ids.
+    second = [(1, "c1", 1), (2, "c2", 2), (9000, "c0", 0), (9000, "c0", 0), (9000, "c0", 0)]
+    second += [(i, "c3", 3) for i in range(1000, 1100)]
+    ingest.append_upload(write(tmp_path / "up" / "b.csv", second), dataset_id)
+
+    report = load_duplicates(dataset_id)
+    full = find_duplicates(hash_buckets(dataset_id), scan_dataset(dataset_id), ["id"], report.rows)
+    assert (report.rows, report.duplicate_rows) == (full.rows, full.duplicate_rows) == (507, 6)
+    assert report.keys == full.keys
+    assert [(e["values"], e["count"]) for e in report.examples] == [(e["values"], e["count"]) for e in full.examples]
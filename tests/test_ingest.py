@@ -0,0 +1,43 @@
+import pytest
+
+from databoard.data import ingest
+from databoard.data.store import datasets_dir, load_quality
+
+
+def test_failed_ingest_removes_partial_dataset(tmp_path, monkeypatch):
+    path = tmp_path / "upload" / "sales.csv"
+    path.parent.mkdir()
+    path.write_text("a,b\n1,x\n2,y\n")
+
+    def fail(dataset_id, profile):
+        raise TypeError("not serializable")
+
+    monkeypatch.setattr(ingest, "save_profile", fail)
+    with pytest.raises(TypeError):
+        ingest.ingest_upload(path)
+
+    assert not any(datasets_dir().iterdir())
+
+
+def test_first_batch_counts_blank_values(tmp_path):
+    path = tmp_path / "upload" / "orders.csv"
+    path.parent.mkdir()
+    path.write_text("id,quantity,day\n1,3,2024-01-01\n2,,2024-01-02\n3,5,\n")
+
+    dataset_id, _ = ingest.ingest_upload(path)
+
+    quality = {col.name: col for col in load_quality(dataset_id).columns}
+    assert (quality["quantity"].empty, quality["quantity"].nulls) == (1, 0)
+    assert (quality["day"].empty, quality["day"].nulls) == (1, 0)
+
+
+@pytest.mark.parametrize("content", ["", "id,quantity\n"])
+def test_file_without_rows_is_an_ingest_error(tmp_path, content):
+    path = tmp_path / "upload" / "empty.csv"
+    path.parent.mkdir()
+    path.write_text(content)
+
+    with pytest.raises(ingest.IngestError, match="no data rows"):
+        ingest.ingest_upload(path)
+
+    assert not any(datasets_dir().iterdir())
@@ -0,0 +1,35 @@
+from datetime import date, time, timedelta
+
+import polars as pl
+
+from databoard.analysis.charts import plan_charts
+from databoard.analysis.insights import column_roles
+from databoard.data.profile import Profiler
+
+
+def test_time_column_is_a_calendar_column():
+    frame = pl.DataFrame(
+        {
+            "clock": [time(9), time(17)],
+            "wait": [timedelta(seconds=1), timedelta(seconds=2)],
+            "day": [date(2024, 1, 1), date(2024, 1, 2)],
+            "amount": [1.5, 2.5],
+        }
+    )
+    profiler = Profiler()
+    profiler.update(frame)
+
+    measures, _, time_column = column_roles(frame.schema, profiler.result())
+
+    assert measures == ["amount"]
+    assert time_column == "day"
+
+
+def test_plan_charts_skips_time_of_day():
+    frame = pl.DataFrame({"clock": [time(9), time(17), time(12)], "amount": [1.5, 2.5, 3.0]})
+    profiler = Profiler()
+    profiler.update(frame)
+
+    charts = plan_charts(frame.schema, profiler.result())
+
+    assert all(chart.x != "clock" for chart in charts)
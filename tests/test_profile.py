@@ -0,0 +1,51 @@
+import json
+from datetime import date, time, timedelta
+
+import polars as pl
+
+from databoard.data.ingest import append_upload, ingest_upload
+from databoard.data.profile import DatasetProfile, Profiler
+from databoard.data.store import dataset_path, load_profile
+
+
+def test_time_of_day_column_round_trips(tmp_path):
+    path = tmp_path / "upload" / "times.csv"
+    path.parent.mkdir()
+    path.write_text("a,t,d\n1,12:30:00,2024-01-01\n2,08:15:00,2024-01-02\n")
+
+    dataset_id, _ = ingest_upload(path)
+
+    columns = {col.name: col for col in load_profile(dataset_id).columns}
+    assert columns["t"].dtype == "Time"
+    assert (columns["t"].min, columns["t"].max) == (time(8, 15), time(12, 30))
+    assert columns["d"].min == date(2024, 1, 1)
+
+
+def test_duration_bounds_round_trip():
+    frame = pl.DataFrame({"wait": [timedelta(seconds=5), timedelta(minutes=2, microseconds=7)]})
+    profiler = Profiler()
+    profiler.update(frame)
+
+    data = json.loads(json.dumps(profiler.result().to_dict()))
+    (wait,) = DatasetProfile.from_dict(data).columns
+    assert (wait.min, wait.max) == (timedelta(seconds=5), timedelta(minutes=2, microseconds=7))
+
+
+def test_sketches_are_kept_out_of_the_profile(tmp_path):
+    path = tmp_path / "upload" / "ids.csv"
+    path.parent.mkdir()
+    path.write_text("id\n" + "\n".join(str(i) for i in range(500)) + "\n")
+    dataset_id, profile = ingest_upload(path)
+
+    stored = json.loads((dataset_path(dataset_id) / "profile.json").read_text())
+    assert "sketch" not in stored["columns"][0]
+    (col,) = load_profile(dataset_id).columns
+    assert col.sketch is None
+    assert col.distinct == profile.columns[0].distinct
+
+    more = tmp_path / "upload" / "more.csv"
+    more.write_text("id\n" + "\n".join(str(i) for i in range(250, 1000)) + "\n")
+    append_upload(more, dataset_id)
+
+    (col,) = load_profile(dataset_id).columns
+    assert abs(col.distinct - 1000) < 50
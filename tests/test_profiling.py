@@ -0,0 +1,69 @@
+import asyncio
+import logging
+
+import pytest
+import reflex as rx
+from fastapi.testclient import TestClient
+from reflex.app import process
+from reflex.event import Event, get_hydrate_event
+from reflex.state import BaseState, State
+
+from databoard import profiling
+from databoard.api import api
+
+
+class CounterState(rx.State):
+    count: int = 0
+
+    def increment(self):
+        self.count += 1
+
+
+@pytest.fixture
+def profiled(tmp_path, monkeypatch):
+    """Profiling switched on, with everything ``install`` patches restored afterwards."""
+    # The state manager keeps its pickles in the working directory.
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv(profiling.PROFILE_ENV, "1")
+    monkeypatch.setenv(profiling.LOG_ENV, str(tmp_path / "profile.jsonl"))
+    monkeypatch.setattr(BaseState, "_get_resolved_delta", BaseState._get_resolved_delta)
+    monkeypatch.setattr(CounterState, "event_handlers", dict(CounterState.event_handlers))
+    monkeypatch.setattr(profiling, "_handlers", {})
+    monkeypatch.setattr(profiling, "_fields", {})
+    handlers, level = list(profiling.logger.handlers), profiling.logger.level
+    yield
+    for handler in profiling.logger.handlers[len(handlers):]:
+        handler.close()
+    profiling.logger.handlers[:] = handlers
+    profiling.logger.setLevel(level)
+    profiling.logger.propagate = True
+
+
+async def send(app: rx.App, name: str):
+    event = Event(token="profiled-tab", name=name, payload={}, router_data={"pathname": "/", "query": {}})
+    return [update async for update in process(app, event, "sid", {}, "127.0.0.1")]
+
+
+def test_debug_endpoint_reports_handlers(profiled):
+    app = rx.App()
+    profiling.install(app, CounterState)
+    app._setup_state()
+    asyncio.run(send(app, get_hydrate_event(State)))
+    asyncio.run(send(app, f"{CounterState.get_full_name()}.increment"))
+
+    summary = TestClient(api).get("/api/debug/profile").json()
+
+    (handler,) = [h for h in summary["handlers"] if h["handler"] == "CounterState.increment"]
+    assert handler["count"] == 1
+    assert handler["delta_bytes"] > 0
+    assert {"field": "CounterState.count", "bytes": 1} in summary["fields"]
+
+
+def test_install_warns_without_the_delta_hook(profiled, monkeypatch, caplog):
+    monkeypatch.delattr(BaseState, "_get_resolved_delta")
+
+    with caplog.at_level(logging.WARNING, logger=profiling.logger.name):
+        profiling.install(rx.App(), CounterState)
+
+    assert "_get_resolved_delta" in caplog.text
+    assert not hasattr(BaseState, "_get_resolved_delta")
@@ -0,0 +1,51 @@
+import polars as pl
+import pytest
+from pydantic import ValidationError
+
+from databoard.data.query import QueryError, QuerySpec, run_query
+
+LF = pl.LazyFrame({"region": ["north", "south"], "quantity": [3, 5]})
+
+
+@pytest.mark.parametrize(
+    "filter",
+    [
+        {"column": "quantity", "op": "in", "value": [1, "two", {"three": 3}]},
+        {"column": "quantity", "op": "in", "value": [1, "x"]},
+        {"column": "quantity", "op": "<", "value": "many"},
+    ],
+)
+def test_bad_filter_values_are_query_errors(filter):
+    with pytest.raises(QueryError):
+        run_query(LF, QuerySpec(filters=[filter]))
+
+
+def test_negative_limit_is_rejected():
+    with pytest.raises(ValidationError):
+        QuerySpec(limit=-1)
+
+
+@pytest.mark.parametrize(
+    "column, func",
+    [("region", "std"), ("region", "sum"), ("region", "mean"), ("region", "median"), ("day", "sum"), ("day", "std")],
+)
+def test_aggregates_must_fit_the_column_type(column, func):
+    lf = LF.with_columns(day=pl.date(2024, 1, pl.col("quantity")))
+    with pytest.raises(QueryError, match=column):
+        run_query(lf, QuerySpec(aggregates=[{"column": column, "func": func}]))
+
+
+@pytest.mark.parametrize("column, func", [("region", "min"), ("region", "n_unique"), ("day", "mean"), ("quantity", "std")])
+def test_aggregates_that_fit_the_column_type(column, func):
+    lf = LF.with_columns(day=pl.date(2024, 1, pl.col("quantity")))
+    result = run_query(lf, QuerySpec(aggregates=[{"column": column, "func": func}]))
+    assert result.height == 1
+
+
+def test_errors_leave_out_the_query_plan(tmp_path):
+    path = tmp_path / "data.parquet"
+    LF.collect().write_parquet(path)
+    spec = QuerySpec(filters=[{"column": "quantity", "op": "<", "value": "many"}])
+    with pytest.raises(QueryError) as error:
+        run_query(pl.scan_parquet(path), spec)
+    assert str(tmp_path) not in str(error.value)
@@ -0,0 +1,66 @@
+import os
+import time
+
+import pytest
+
+from databoard.data.storage import Limits, QuotaExceeded, reserve, stored_dashboards, sweep
+from databoard.data.store import dashboard_path
+
+
+def publish(dashboard_id: str, size: int, age: float = 0.0):
+    path = dashboard_path(dashboard_id)
+    path.mkdir(parents=True)
+    (path / "dashboard.json").write_bytes(b"x" * size)
+    when = time.time() - age
+    os.utime(path / "dashboard.json", (when, when))
+
+
+def test_dashboards_count_towards_disk_quota():
+    publish("old", 600, age=60)
+    publish("new", 600)
+
+    reserve("tab", 500, limits=Limits(disk_quota=1500))
+
+    assert [d.id for d in stored_dashboards()] == ["new"]
+    with pytest.raises(QuotaExceeded):
+        reserve("tab", 2000, limits=Limits(disk_quota=1500))
+
+
+def test_sweep_evicts_expired_dashboards():
+    publish("stale", 10, age=3600)
+    publish("fresh", 10)
+
+    evicted = sweep(limits=Limits(dashboard_ttl=600))
+
+    assert evicted == ["stale"]
+    assert [d.id for d in stored_dashboards()] == ["fresh"]
+
+
+def render(dashboard_id: str, name: str, size: int, age: float = 0.0):
+    path = dashboard_path(dashboard_id) / "renders" / name
+    path.parent.mkdir(exist_ok=True)
+    path.write_bytes(b"x" * size)
+    when = time.time() - age
+    os.utime(path, (when, when))
+    return path
+
+
+def test_renders_are_evicted_before_dashboards():
+    publish("shared", 600, age=60)
+    png = render("shared", "full.png", 600, age=60)
+
+    reserve("tab", 500, limits=Limits(disk_quota=1500))
+
+    assert not png.exists()
+    (dashboard,) = stored_dashboards()
+    assert (dashboard.id, dashboard.size, dashboard.renders) == ("shared", 600, [])
+
+
+def test_sweep_expires_renders_of_idle_dashboards():
+    publish("shared", 10, age=3600)
+    thumb = render("shared", "thumb.webp", 10, age=3600)
+
+    sweep(limits=Limits(ttl=600))
+
+    assert not thumb.exists()
+    assert [d.id for d in stored_dashboards()] == ["shared"]
@@ -0,0 +1,33 @@
+import shutil
+
+import pytest
+from fastapi.testclient import TestClient
+
+from databoard.api import api
+from databoard.data.storage import SESSION_QUOTA_ENV
+from databoard.data.uploads import load_upload
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv(SESSION_QUOTA_ENV, "1000")
+    return TestClient(api)
+
+
+def start(client, size: int, token: str = "tab"):
+    return client.post("/api/uploads", json={"name": "sales.csv", "size": size}, headers={"Reflex-Client-Token": token})
+
+
+def test_unfinished_uploads_count_towards_the_session_quota(client):
+    first = start(client, 600)
+    assert first.status_code == 200
+    assert "session" not in first.json()
+
+    second = start(client, 600)
+    assert second.status_code == 507
+    assert "quota" in second.json()["detail"]
+    assert start(client, 600, token="other").status_code == 200
+
+    # Processing removes the upload, which hands its space back.
+    shutil.rmtree(load_upload(first.json()["id"]).directory)
+    assert start(client, 600).status_code == 200